@@ -0,0 +1,95 @@
+""" Time of attribute access for simple fields.
+
+Documents are created with `__hydrate__` from the same raw data
+for each field type before timing, then field is read in each document
+once (first read) and `--reads` times more (next reads).
+Generic descriptor convert value with `from_mongo` and save it
+to `__cache__` on first read, identity descriptor read it
+from `__raw__` each time. Database is not needed.
+
+Identity descriptor wins on first read and does not hold a copy
+of value in `__cache__`; next reads cost about the same as reads
+from `__cache__`.
+
+    PYTHONPATH=. python benchmarks/attribute_access.py [--count 10000] [--reads 3]
+"""
+import argparse
+import timeit
+
+from bson import ObjectId
+
+from yadm import Document, fields
+from yadm.fields.base import FieldDescriptor
+
+FIELDS = {
+    'objectid': (fields.ObjectIdField, ObjectId()),
+    'boolean': (fields.BooleanField, True),
+    'integer': (fields.IntegerField, 13),
+    'float': (fields.FloatField, 1.5),
+    'string': (fields.StringField, 'string'),
+}
+
+
+class Identity(Document):
+    __collection__ = 'docs'
+
+
+class Generic(Document):
+    __collection__ = 'docs'
+
+
+for name, (field_class, _) in FIELDS.items():
+    field_class().contribute_to_class(Identity, name)
+    field = field_class()
+    field.contribute_to_class(Generic, name)
+    setattr(Generic, name, FieldDescriptor(name, field))
+
+
+RAW = {name: value for name, (_, value) in FIELDS.items()}
+
+
+def make_documents(document_class, count):
+    return [document_class.__hydrate__(dict(RAW)) for _ in range(count)]
+
+
+def read(documents, name, reads):
+    for document in documents:
+        for _ in range(reads):
+            getattr(document, name)
+
+
+def measure(document_class, name, count, reads):
+    """ Return time in ns of first read and next reads.
+    """
+    first = next_ = float('inf')
+
+    for _ in range(5):
+        documents = make_documents(document_class, count)
+        first = min(first, timeit.timeit(
+            lambda: read(documents, name, 1), number=1))
+        next_ = min(next_, timeit.timeit(
+            lambda: read(documents, name, reads), number=1))
+
+    return first * 1e9 / count, next_ * 1e9 / count / reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--reads', type=int, default=3)
+    args = parser.parse_args()
+
+    print("{} documents, time of field read in ns:".format(args.count))
+    print("  {:<9} {:>15} {:>15}".format('', 'first read', 'next reads'))
+    print("  {:<9} {:>7} {:>7} {:>7} {:>7}".format(
+        'field', 'generic', 'ident', 'generic', 'ident'))
+
+    for name in FIELDS:
+        generic = measure(Generic, name, args.count, args.reads)
+        identity = measure(Identity, name, args.count, args.reads)
+        print("  {:<9} {:>7.1f} {:>7.1f} {:>7.1f} {:>7.1f}".format(
+            name, generic[0], identity[0], generic[1], identity[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+""" Memory usage of documents with default and compact layouts.
+
+Documents are created from raw data with `from_mongo`, as queryset do it.
+Database is not needed.
+
+    PYTHONPATH=. python benchmarks/compact_memory.py [--count 1000000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from bson import ObjectId
+
+from yadm import Document, fields
+from yadm.serialize import from_mongo
+
+
+class Ticket(Document):
+    __collection__ = 'tickets'
+
+    number = fields.IntegerField()
+    status = fields.StringField()
+    price = fields.IntegerField()
+
+
+class CompactTicket(Document):
+    __collection__ = 'tickets'
+    __compact__ = True
+
+    number = fields.IntegerField()
+    status = fields.StringField()
+    price = fields.IntegerField()
+
+
+def make_raws(count):
+    return [{'_id': ObjectId(), 'number': n, 'status': 'paid', 'price': 100}
+            for n in range(count)]
+
+
+def measure(document_class, raws):
+    gc.collect()
+    tracemalloc.start()
+    documents = [from_mongo(document_class, raw) for raw in raws]
+    for document in documents:
+        document.number  # read one field, as in real code
+
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del documents
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=1000000)
+    args = parser.parse_args()
+
+    raws = make_raws(args.count)
+    print("{} documents, memory without raw data:".format(args.count))
+
+    results = {}
+    for document_class in [Ticket, CompactTicket]:
+        size = measure(document_class, raws)
+        results[document_class] = size
+        print("  {:<15} {:>8.1f} MiB  {:>6.1f} bytes/document".format(
+            document_class.__name__,
+            size / 2 ** 20,
+            size / args.count,
+        ))
+
+    print("  ratio: {:.2f}".format(results[Ticket] / results[CompactTicket]))
+
+
+if __name__ == '__main__':
+    main()
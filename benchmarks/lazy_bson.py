@@ -0,0 +1,103 @@
+""" Decoding time of wide documents with full and lazy BSON decoding.
+
+BSON bytes are decoded as pymongo cursor do it, documents are created
+with `__hydrate__` and a few fields are read. Database is not needed.
+
+Lazy documents find fields by scanning of bytes in Python,
+so they win for documents with large nested values
+and lose for flat documents with scalar values only.
+
+    PYTHONPATH=. python benchmarks/lazy_bson.py [--count 10000] [--read 5]
+"""
+import argparse
+from datetime import datetime
+import random
+import timeit
+
+import bson
+from bson import ObjectId
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+
+from yadm import Document, fields
+from yadm.lazy_bson import LAZY_BSON_OPTIONS
+
+FIELDS = 60
+
+
+class Wide(Document):
+    __collection__ = 'wide'
+
+
+for n in range(FIELDS):
+    field_class = [fields.IntegerField, fields.StringField,
+                   fields.DatetimeField, fields.MongoMapField][n % 4]
+    field_class().contribute_to_class(Wide, 'f{}'.format(n))
+
+
+SHAPES = {
+    # scalar values only
+    'flat': [
+        lambda n: n,
+        lambda n: 'string value {}'.format(n),
+        lambda n: datetime(2020, 1, 1),
+        lambda n: {'a': n},
+    ],
+    # every fourth value is a tree of subdocuments
+    'nested': [
+        lambda n: n,
+        lambda n: 'string value {}'.format(n),
+        lambda n: datetime(2020, 1, 1),
+        lambda n: {'items': [{'a': i, 'b': 'value', 'c': datetime(2020, 1, 1)}
+                             for i in range(10)]},
+    ],
+}
+
+
+def make_data(shape, count):
+    values = SHAPES[shape]
+    return [
+        bson.encode(dict(
+            [('_id', ObjectId())] +
+            [('f{}'.format(n), values[n % 4](n)) for n in range(FIELDS)]
+        ))
+        for _ in range(count)
+    ]
+
+
+def run(data, codec_options, names):
+    for item in data:
+        document = Wide.__hydrate__(bson.decode(item, codec_options))
+        for name in names:
+            getattr(document, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--read', type=int, default=5)
+    args = parser.parse_args()
+
+    names = random.sample(['f{}'.format(n) for n in range(FIELDS)], args.read)
+    print("{} documents with {} fields, {} fields are read:".format(
+        args.count, FIELDS, args.read))
+
+    for shape in SHAPES:
+        data = make_data(shape, args.count)
+        results = {}
+
+        for title, codec_options in [('full', DEFAULT_CODEC_OPTIONS),
+                                     ('lazy', LAZY_BSON_OPTIONS)]:
+            seconds = min(timeit.repeat(
+                lambda: run(data, codec_options, names),
+                number=1,
+                repeat=5,
+            ))
+            results[title] = seconds * 1e6 / args.count
+
+        print("  {:<7} full {:>6.1f} us, lazy {:>6.1f} us,"
+              " ratio {:.2f}".format(shape, results['full'], results['lazy'],
+                                     results['full'] / results['lazy']))
+
+
+if __name__ == '__main__':
+    main()
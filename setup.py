@@ -28,6 +28,9 @@ setup(
         'asyncio': [
             'motor>=2.0.0',
         ],
+        'numpy': [
+            'numpy',
+        ],
         'test': [
             'pytest',
             'pytest-asyncio',
@@ -1,4 +1,13 @@
-from yadm.cache import StackCache
+from concurrent.futures import ThreadPoolExecutor
+
+import pymongo
+import pytest
+
+from yadm import fields
+from yadm.cache import StackCache, LRUCache, CachePolicy, CACHE_SIZE
+from yadm.database import Database
+from yadm.documents import Document
+from yadm.lazy_bson import LazyBSONDocument
 
 
 def test_stack_getsetcontains():
@@ -27,3 +36,216 @@ def test_stack_owerflow():
     assert cache == {'b': 2, 'c': 3}
     assert 'a' not in cache
     assert 'c' in cache
+
+
+def test_lru_getsetcontains():
+    cache = LRUCache(2)
+    assert len(cache) == 0
+
+    cache['a'] = 1
+    cache['b'] = 2
+
+    assert len(cache) == 2
+    assert list(cache) == ['a', 'b']
+    assert cache['a'] == 1
+    assert 'a' in cache
+    assert 'c' not in cache
+    assert cache.get('c', 13) == 13
+
+
+def test_lru_owerflow():
+    cache = LRUCache(2)
+
+    cache['a'] = 1
+    cache['b'] = 2
+    cache['a']  # a is recently used
+    cache['c'] = 3
+
+    assert list(cache) == ['a', 'c']
+    assert 'b' not in cache
+    assert cache.evictions == 1
+
+
+def test_lru_delitem():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    del cache['a']
+
+    assert len(cache) == 0
+    assert 'a' not in cache
+
+
+def test_lru_counters():
+    cache = LRUCache(2)
+    cache['a'] = 1
+
+    cache['a']
+    cache.get('a')
+    cache.get('b')
+    assert 'a' in cache
+    assert 'b' not in cache
+
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 0)
+
+
+def test_lru_threads():
+    cache = LRUCache(50, lock=True)
+
+    def work(n):
+        for i in range(1000):
+            cache[(n, i % 100)] = i
+            cache.get((n, (i - 1) % 100))
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(work, range(4)))
+
+    assert len(cache) == 50
+    assert cache.hits + cache.misses == 4000
+    assert cache.evictions == 4000 - 50
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_policy_ttl():
+    clock = Clock()
+    policy = CachePolicy(max_entries=2, ttl=10, clock=clock)
+
+    policy.set('a', 1)
+    assert policy.get('a') == 1
+
+    clock.now = 10
+    assert policy.get('a') is None
+    assert len(policy) == 0
+    assert (policy.hits, policy.misses) == (1, 1)
+
+
+def test_policy_max_entries():
+    policy = CachePolicy(max_entries=2)
+
+    policy.set('a', 1)
+    policy.set('b', 2)
+    policy.get('a')
+    policy.set('c', 3)
+
+    assert policy.get('b') is None
+    assert policy.get('a') == 1
+    assert policy.get('c') == 3
+
+
+def test_policy_refresh_ahead():
+    clock = Clock()
+    policy = CachePolicy(ttl=10, refresh_ahead=8, clock=clock)
+    policy.set('a', 1)
+
+    clock.now = 8
+    assert policy.get('a') is None  # first reader refresh entry
+    assert policy.get('a') == 1  # other readers get cached value
+
+    policy.set('a', 2)
+    clock.now = 15
+    assert policy.get('a') == 2
+
+
+def test_policy_invalidate():
+    policy = CachePolicy()
+    policy.set(('db', 'col', 1), 1)
+    policy.set(('db', 'col', 2), 2)
+    policy.set(('db', 'other', 1), 3)
+
+    policy.invalidate(('db', 'col', 1))
+    assert policy.get(('db', 'col', 1)) is None
+
+    policy.invalidate_prefix(('db', 'col'))
+    assert len(policy) == 1
+
+
+class Currency(Document):
+    __collection__ = 'testdocs_currencies'
+    __cache_policy__ = CachePolicy(max_entries=10, ttl=60)
+    code = fields.StringField()
+
+
+class Price(Document):
+    __collection__ = 'testdocs'
+    currency = fields.ReferenceField(Currency)
+
+
+@pytest.fixture
+def currency_id(db):
+    Currency.__cache_policy__.clear()
+    return db.db.testdocs_currencies.insert_one({'code': 'RUB'}).inserted_id
+
+
+def test_cached_get_document(db, currency_id):
+    first = db.get_document(Currency, currency_id)
+    db.db.testdocs_currencies.update_one({'_id': currency_id},
+                                         {'$set': {'code': 'USD'}})
+    second = db.get_document(Currency, currency_id)
+
+    assert first is not second
+    assert second.code == 'RUB'  # from cache
+    assert db.get_document(Currency, currency_id, projection={'code': 1}
+                           ).code == 'USD'
+
+
+def test_cached_get_document__lazy(db, currency_id):
+    db.get_document(Currency, currency_id)
+
+    assert isinstance(db.get_document(Currency, currency_id).__raw__, dict)
+
+    doc = db.get_document(Currency, currency_id, lazy=True)
+    assert isinstance(doc.__raw__, LazyBSONDocument)
+    assert doc.code == 'RUB'
+
+
+def test_cached_get_document__other_client(db, currency_id, mongo_args):
+    host, port, _ = mongo_args
+    client = pymongo.MongoClient(host, port, tz_aware=True)
+    other_db = Database(client, db.name)
+
+    db.get_document(Currency, currency_id)
+    db.db.testdocs_currencies.update_one({'_id': currency_id},
+                                         {'$set': {'code': 'USD'}})
+
+    try:
+        assert other_db.get_document(Currency, currency_id).code == 'USD'
+        assert db.get_document(Currency, currency_id).code == 'RUB'
+    finally:
+        client.close()
+
+
+def test_cached_reference(db, currency_id):
+    price_id = db.db.testdocs.insert_one({'currency': currency_id}).inserted_id
+    db.get_document(Currency, currency_id)
+    db.db.testdocs_currencies.drop()
+
+    price = db.get_document(Price, price_id)
+    assert price.currency.code == 'RUB'
+
+
+@pytest.mark.parametrize('write', [
+    lambda db, doc: db.save(doc),
+    lambda db, doc: db.update_one(doc, set={'code': 'EUR'}),
+    lambda db, doc: db.delete_one(doc),
+    lambda db, doc: db(Currency).update_many({'$set': {'code': 'EUR'}}),
+])
+def test_cache_invalidation(db, currency_id, write):
+    doc = db.get_document(Currency, currency_id)
+    write(db, doc)
+
+    assert len(Currency.__cache_policy__) == 0
+
+
+def test_cache_invalidation_bulk(db, currency_id):
+    db.get_document(Currency, currency_id)
+
+    with db.bulk_write(Currency) as writer:
+        writer.update_one({'_id': currency_id}, {'$set': {'code': 'EUR'}})
+
+    assert db.get_document(Currency, currency_id).code == 'EUR'
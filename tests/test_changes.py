@@ -0,0 +1,125 @@
+import pytest
+from bson import ObjectId
+
+from yadm import fields
+from yadm.changes import build_changes_update
+from yadm.documents import Document, EmbeddedDocument
+from yadm.log_items import Save, SaveChanges
+from yadm.serialize import from_mongo
+
+
+class EDoc(EmbeddedDocument):
+    i = fields.IntegerField()
+    s = fields.StringField()
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    s = fields.StringField()
+    e = fields.EmbeddedDocumentField(EDoc)
+    li = fields.ListField(fields.IntegerField())
+    le = fields.ListField(fields.EmbeddedDocumentField(EDoc))
+    m = fields.MapField(fields.IntegerField())
+
+
+RAW = {
+    'i': 1,
+    's': 'str',
+    'e': {'i': 2, 's': 'e'},
+    'li': [1, 2],
+    'le': [{'i': 1}, {'i': 2}],
+    'm': {'a': 1},
+}
+
+
+@pytest.fixture
+def doc():
+    return from_mongo(Doc, {'_id': ObjectId(), **RAW})
+
+
+def test_not_changed(doc):
+    assert build_changes_update(doc) == ({}, [])
+
+
+def test_new_document():
+    assert build_changes_update(Doc(i=1)) == (None, None)
+
+
+@pytest.mark.parametrize('change, update', [
+    (lambda d: setattr(d, 'i', 13), {'$set': {'i': 13}}),
+    (lambda d: delattr(d, 's'), {'$unset': {'s': True}}),
+    (lambda d: setattr(d.e, 'i', 13), {'$set': {'e.i': 13}}),
+    (lambda d: setattr(d.le[1], 's', 'x'), {'$set': {'le.1.s': 'x'}}),
+    (lambda d: d.li.append(3), {'$push': {'li': {'$each': [3]}}}),
+    (lambda d: d.li.remove(1), {'$set': {'li': [2]}}),
+    (lambda d: d.m.__setitem__('b', 2), {'$set': {'m': {'a': 1, 'b': 2}}}),
+])
+def test_update(doc, change, update):
+    change(doc)
+    assert build_changes_update(doc)[0] == update
+
+
+def test_update__merge_nested(doc):
+    doc.e.i = 13
+    doc.e = EDoc(i=26)
+    doc.le[0].i = 13
+    doc.le.append(EDoc(i=3))
+
+    assert build_changes_update(doc)[0] == {
+        '$set': {
+            'e': {'i': 26},
+            'le': [{'i': 13}, {'i': 2}, {'i': 3}],
+        },
+    }
+
+
+def test_update__after_sync(doc):
+    doc.i = 13
+    doc.__log__.append(Save(id=doc.id))
+    doc.s = 'new'
+
+    assert build_changes_update(doc)[0] == {'$set': {'s': 'new'}}
+
+
+def test_save_changes(db):
+    _id = db.db.testdocs.insert_one(dict(RAW)).inserted_id
+    doc = db.get_document(Doc, _id)
+
+    doc.i = 13
+    doc.e.s = 'new'
+    doc.li.append(3)
+    del doc.s
+
+    db.save_changes(doc)
+
+    raw = {'_id': _id, **RAW, 'i': 13, 'e': {'i': 2, 's': 'new'},
+           'li': [1, 2, 3]}
+    del raw['s']
+
+    assert db.db.testdocs.find_one(_id) == raw
+    assert doc.__raw__ == raw
+    assert isinstance(doc.__log__[-1], SaveChanges)
+
+    db.save_changes(doc)
+    assert doc.__log__[-1] == SaveChanges(update_data={})
+
+
+def test_save_changes__new_document(db):
+    doc = Doc(i=1)
+    db.save_changes(doc)
+
+    assert db.db.testdocs.find_one(doc.id)['i'] == 1
+    assert isinstance(doc.__log__[-1], Save)
+
+
+def test_save_changes__lazy(db):
+    _id = db.db.testdocs.insert_one(dict(RAW)).inserted_id
+    doc = db.get_document(Doc, _id, lazy=True)
+
+    doc.i = 13
+    db.save_changes(doc)
+
+    assert isinstance(doc.__raw__, dict)
+    assert doc.__raw__['i'] == 13
+    assert db.db.testdocs.find_one(_id)['i'] == 13
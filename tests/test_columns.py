@@ -0,0 +1,109 @@
+from array import array
+from datetime import datetime
+from decimal import Decimal
+import math
+
+import pytest
+from bson import ObjectId, Decimal128
+
+from yadm import fields
+from yadm import columns as columns_module
+from yadm.documents import Document, EmbeddedDocument
+
+
+class EDoc(EmbeddedDocument):
+    i = fields.IntegerField()
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    b = fields.BooleanField()
+    i = fields.IntegerField()
+    f = fields.FloatField()
+    s = fields.StringField()
+    dt = fields.DatetimeField()
+    oid = fields.ObjectIdField()
+    d = fields.DecimalField()
+    m = fields.MoneyField()
+    e = fields.EmbeddedDocumentField(EDoc)
+
+
+OID = ObjectId()
+
+FIELDS = ['b', 'i', 'f', 's', 'dt', 'oid', 'd', 'm', 'e.i']
+
+
+@pytest.fixture
+def qs(db):
+    db.db['testdocs'].insert_one({
+        'b': True,
+        'i': 13,
+        'f': 1.5,
+        's': 'str',
+        'dt': datetime(2020, 1, 1, 0, 0, 1, 500000),
+        'oid': OID,
+        'd': {'i': 314, 'e': -2},
+        'm': [1050, 643],
+        'e': {'i': 26},
+    })
+    db.db['testdocs'].insert_one({'d': Decimal128('-1.5')})
+    return db(Doc).sort(('_id', 1))
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    monkeypatch.setattr(columns_module, 'numpy', None)
+
+
+def test_numpy(qs):
+    numpy = pytest.importorskip('numpy')
+    columns = qs.to_columns(FIELDS)
+
+    assert list(columns) == [
+        'b', 'i', 'f', 's', 'dt', 'oid', 'd', 'd.exp', 'm', 'm.currency', 'e.i',
+    ]
+    assert columns['b'].tolist() == [True, False]
+    assert columns['i'].dtype == numpy.int64
+    assert columns['i'].tolist() == [13, 0]
+    assert columns['f'][0] == 1.5
+    assert math.isnan(columns['f'][1])
+    assert columns['s'].tolist() == ['str', None]
+    assert columns['dt'][0] == numpy.datetime64('2020-01-01T00:00:01.500')
+    assert numpy.isnat(columns['dt'][1])
+    assert columns['oid'].dtype == numpy.dtype('S12')
+    assert columns['oid'].tobytes() == OID.binary + bytes(12)
+    assert columns['d'].tolist() == [314, -15]
+    assert columns['d.exp'].tolist() == [-2, -1]
+    assert columns['m'].tolist() == [1050, 0]
+    assert columns['m.currency'].tolist() == [643, 0]
+    assert columns['e.i'].tolist() == [26, 0]
+
+
+def test_numpy__growth_and_dtype_map(db):
+    numpy = pytest.importorskip('numpy')
+    db.db['testdocs'].insert_many([{'i': n} for n in range(10)])
+
+    columns = db(Doc).batch_size(3).to_columns(['i'], {'i': 'int32'})
+
+    assert columns['i'].dtype == numpy.int32
+    assert sorted(columns['i'].tolist()) == list(range(10))
+
+
+def test_array(qs, no_numpy):
+    columns = qs.to_columns(FIELDS, dtype_map={'f': 'float32'})
+
+    assert columns['b'] == array('b', [True, False])
+    assert columns['i'] == array('q', [13, 0])
+    assert columns['f'].typecode == 'f'
+    assert columns['s'] == ['str', None]
+    assert columns['dt'] == array('q', [1577836801500, columns_module.NAT])
+    assert columns['oid'] == bytearray(OID.binary + bytes(12))
+    assert columns['d'] == array('q', [314, -15])
+    assert columns['d.exp'] == array('i', [-2, -1])
+    assert columns['m'] == array('q', [1050, 0])
+    assert columns['m.currency'] == array('i', [643, 0])
+
+
+def test_decimal_pair():
+    assert columns_module._decimal_to_pair(Decimal('-0.00')) == (0, -2)
+    assert columns_module._decimal_to_pair(Decimal128('12.5')) == (125, -1)
@@ -6,7 +6,7 @@ from bson import ObjectId
 import pymongo
 
 from yadm.documents import Document
-from yadm.log_items import Save, Insert
+from yadm.log_items import Save, Insert, UpdateOne
 from yadm.queryset import QuerySet
 from yadm.serialize import from_mongo
 from yadm import fields
@@ -216,6 +216,44 @@ def test_update_one__not_found(db, doc):
     assert db.update_one(doc) is None
 
 
+def test_update_one__selective_reload(db, doc):
+    doc.l.append(4)
+    db.db['testdocs'].update_one({'_id': doc.id}, {'$set': {'b': False}})
+
+    result = db.update_one(doc, reload_updated=True,
+                           set={'i': 88}, unset={'b': True})
+
+    assert result is doc
+    assert doc.i == 88
+    assert not hasattr(doc, 'b')
+    assert doc.l == [1, 2, 3, 4]  # not touched fields are not reloaded
+    assert doc.__log__[-1] == UpdateOne(
+        update_data={'$set': {'i': 88}, '$unset': {'b': True}})
+
+
+def test_update_one__not_matched(db, doc):
+    db.db['testdocs'].delete_one({'_id': doc.id})
+    assert db.update_one(doc, reload_updated=True, set={'i': 88}) is None
+    assert db.update_one(doc, reload=False,
+                         set={'i': 88}).matched_count == 0
+
+
+def test_update_one__result(db, doc):
+    db.db['testdocs'].update_one({'_id': doc.id}, {'$set': {'b': False}})
+    result = db.update_one(doc, set={'i': 88})
+
+    assert result.matched_count == result.modified_count == 1
+    assert doc.i == 88
+    assert doc.b is False  # whole document is reloaded
+
+
+def test_update_one__no_reload(db, doc):
+    result = db.update_one(doc, reload=False, set={'i': 88})
+
+    assert result.modified_count == 1
+    assert doc.i == 13
+
+
 def test_delete_one(db):
     col = db.db['testdocs']
     col.insert_one({'i': 13})
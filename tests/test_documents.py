@@ -1,7 +1,7 @@
 import pytest
 from bson import ObjectId
 
-from yadm.documents import Document
+from yadm.documents import Document, EmbeddedDocument
 from yadm.log_items import Save, SetField
 from yadm.markers import AttributeNotSet
 from yadm.exceptions import NotLoadedError
@@ -77,22 +77,22 @@ def test_raw_cache_log(db, doc):
 
     assert doc.__raw__ == {'i': 13, '_id': doc.id}
     assert len(doc.__log__) == 0  # reload with new_instance=True
-    assert doc.__cache__ == {'_id': doc.id}
+    assert doc.__cache__ == {}  # raw values are not copied to cache
 
     doc.b = False
 
     assert doc.__raw__ == {'i': 13, '_id': doc.id}
-    assert doc.__cache__ == {'b': False, '_id': doc.id}
+    assert doc.__cache__ == {'b': False}
 
     assert doc.i == 13  # call descriptor's get
 
     assert doc.__raw__ == {'i': 13, '_id': doc.id}
-    assert doc.__cache__ == {'i': 13, 'b': False, '_id': doc.id}
+    assert doc.__cache__ == {'b': False}
 
     doc.i = 12  # call descriptor's set, for cover
 
     assert doc.__raw__ == {'i': 13, '_id': doc.id}
-    assert doc.__cache__ == {'i': 12, 'b': False, '_id': doc.id}
+    assert doc.__cache__ == {'i': 12, 'b': False}
 
 
 def test_eq():
@@ -162,3 +162,63 @@ def test_inheritance_docs_with_list(db):
     doc = ChildDoc()
     db.save(doc)
     assert doc
+
+
+class CompactEDoc(EmbeddedDocument):
+    __compact__ = True
+
+    s = fields.StringField()
+
+
+class CompactDoc(Document):
+    __collection__ = 'testdocs'
+    __compact__ = True
+
+    i = fields.IntegerField()
+    e = fields.EmbeddedDocumentField(CompactEDoc)
+
+
+def test_compact_layout():
+    doc = CompactDoc(i=13)
+    assert not hasattr(doc, '__dict__')
+
+    with pytest.raises(AttributeError):
+        doc.unknown = 1
+
+    assert doc.i == 13
+    assert doc.__not_loaded__ == frozenset()
+    assert doc.__yadm_lookups__ == {}
+
+
+def test_compact_from_mongo():
+    _id = ObjectId()
+    doc = CompactDoc.__hydrate__({'_id': _id, 'i': 13, 'e': {'s': 'str'}})
+
+    assert doc.id == _id
+    assert doc.i == 13
+    assert doc.e.s == 'str'
+    assert doc.e.__parent__ is doc
+    assert not hasattr(doc.e, '__dict__')
+    assert not doc.__log__
+
+
+def test_compact_save(db):
+    doc = CompactDoc(i=13)
+    db.save(doc)
+
+    doc = db.get_document(CompactDoc, doc.id)
+    assert doc.i == 13
+    assert not doc.__log__
+
+
+def test_compact_inheritance():
+    class Child(CompactDoc):
+        k = fields.IntegerField()
+
+    doc = Child(i=1, k=2)
+    assert not hasattr(doc, '__dict__')
+    assert (doc.i, doc.k) == (1, 2)
+
+    with pytest.raises(TypeError):
+        class Bad(Doc):
+            __compact__ = True
@@ -1,7 +1,11 @@
+from decimal import Decimal
+
 import pytest
 from bson import ObjectId
 
 from yadm.documents import Document
+from yadm.fields.decimal import DecimalField
+from yadm.fields.list import ListField
 from yadm.fields.simple import StringField, IntegerField
 
 
@@ -63,3 +67,49 @@ def test_id_set_str():
 
 def test_repr():
     assert '_id' in repr(Doc._id)
+
+
+class TrackDoc(Document):
+    i = IntegerField()
+    li = ListField(IntegerField())
+    d = DecimalField()
+
+
+class CompareDoc(TrackDoc):
+    __compare_on_set__ = True
+
+
+RAW = {'i': 1, 'li': [1, 2], 'd': {'i': 15, 'e': -1}}
+
+
+def test_set_not_decode_old_value():
+    doc = TrackDoc.__hydrate__(dict(RAW))
+
+    doc.i = 1  # raw values of identity fields are compared
+    assert not doc.__log__
+
+    doc.li = [1, 2]
+    doc.d = Decimal('1.5')
+
+    assert [item.name for item in doc.__log__] == ['li', 'd']
+    assert set(doc.__cache__) == {'li', 'd'}
+
+
+def test_set_compare_cached():
+    doc = TrackDoc.__hydrate__(dict(RAW))
+
+    assert doc.d == Decimal('1.5')
+    doc.d = Decimal('1.5')
+    assert not doc.__log__
+
+
+def test_set_compare_on_set():
+    doc = CompareDoc.__hydrate__(dict(RAW))
+
+    doc.i = 1
+    doc.li = [1, 2]
+    doc.d = Decimal('1.5')
+    assert not doc.__log__
+
+    doc.li = [1, 2, 3]
+    assert [item.name for item in doc.__log__] == ['li']
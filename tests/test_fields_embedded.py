@@ -3,6 +3,7 @@ from bson import ObjectId
 
 from yadm import fields
 from yadm.documents import Document, EmbeddedDocument
+from yadm.exceptions import ReadOnlyDocumentError
 from yadm.testing import create_fake
 
 
@@ -126,6 +127,24 @@ def test_get_deeper(db, raw):
             assert not hasattr(doc.e.e, 's')
 
 
+def test_get__read_only(db):
+    _id = db.db.testdoc.insert_one({'e': {'i': 13}}).inserted_id
+    doc = db.get_queryset(DocAuto).read_only().find_one(_id)
+
+    assert doc.e.i == 13
+    assert doc.e.__read_only__
+    assert doc.e.e.s == 'default'
+
+    with pytest.raises(ReadOnlyDocumentError):
+        doc.e.i = 26
+
+    with pytest.raises(ReadOnlyDocumentError):
+        doc.e.e.s = 'str'
+
+    assert doc.e.i == 13
+    assert not doc.__log__
+
+
 def test_set():
     doc = Doc()
     doc.e = EDoc()
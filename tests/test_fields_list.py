@@ -2,6 +2,7 @@ import pytest
 
 from yadm import fields
 from yadm.documents import Document
+from yadm.exceptions import ReadOnlyDocumentError
 
 
 class Doc(Document):
@@ -45,6 +46,19 @@ def test_append(db):
     assert doc.li == [1, 2, 3, 4]
 
 
+def test_append__read_only(db):
+    _id = db.db.testdoc.insert_one({'li': [1, 2, 3]}).inserted_id
+    doc = db.get_queryset(Doc).read_only().find_one(_id)
+
+    with pytest.raises(ReadOnlyDocumentError):
+        doc.li.append(4)
+
+    with pytest.raises(ReadOnlyDocumentError):
+        doc.li[0] = 13
+
+    assert doc.li == [1, 2, 3]
+
+
 def test_append_valueerror():
     doc = Doc()
     with pytest.raises(ValueError):
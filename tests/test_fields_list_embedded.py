@@ -244,3 +244,81 @@ def test_deep_pull(db):
     assert len(data['li'][0]['lie']) == 1
     assert 'i' in data['li'][0]['lie'][0]
     assert data['li'][0]['lie'][0]['i'] == 13
+
+
+class OuterEDoc(EmbeddedDocument):
+    li = fields.ListField(fields.EmbeddedDocumentField(EDoc))
+
+
+class PathDoc(Document):
+    __collection__ = 'docs'
+    e = fields.EmbeddedDocumentField(OuterEDoc)
+
+
+def test_path_cache():
+    doc = PathDoc.__hydrate__({'e': {'li': [{'i': 1}, {'i': 2}]}})
+    item = doc.e.li[1]
+
+    assert item.__document__ is doc
+    assert item.__field_name__ == 'e.li.1'
+    assert item._get_path_cache() is item._get_path_cache()
+
+
+def test_path_cache__move_in_list():
+    doc = PathDoc.__hydrate__({'e': {'li': [{'i': 1}, {'i': 2}]}})
+    first, second = doc.e.li
+    assert second.__field_name__ == 'e.li.1'
+
+    doc.e.li.insert(0, EDoc(i=0))
+    assert first.__field_name__ == 'e.li.1'
+    assert second.__field_name__ == 'e.li.2'
+
+    doc.e.li.remove(first)
+    assert second.__field_name__ == 'e.li.1'
+
+    del doc.e.li[0]
+    assert second.__field_name__ == 'e.li.0'
+
+    second.i = 3
+    assert doc.__log__[-1].path == 'e.li.0'
+
+
+def test_path_cache__reparent():
+    doc = PathDoc.__hydrate__({'e': {'li': [{'i': 1}]}})
+    outer = doc.e
+    item = outer.li[0]
+    assert item.__document__ is doc
+
+    other = PathDoc()
+    other.e = outer
+
+    assert item.__document__ is other
+    assert item.__field_name__ == 'e.li.0'
+
+
+def test_path_cache__move_is_scoped():
+    doc = PathDoc.__hydrate__({'e': {'li': [{'i': 1}, {'i': 2}]}})
+    other = PathDoc.__hydrate__({'e': {'li': [{'i': 1}]}})
+    first, second = doc.e.li
+    other_cache = other.e.li[0]._get_path_cache()
+    first_cache = first._get_path_cache()
+
+    doc.e.li.insert(2, EDoc(i=3))  # items before index are not moved
+    doc.e.li.insert(1, EDoc(i=0))
+
+    assert other.e.li[0]._get_path_cache() is other_cache
+    assert first._get_path_cache() is first_cache
+    assert second.__field_name__ == 'e.li.2'
+
+
+def test_path_cache__ancestor_move_drops_descendants():
+    doc = PathDoc.__hydrate__({'e': {'li': [{'i': 1}]}})
+    outer = doc.e
+    item = outer.li[0]
+    assert item.__field_name__ == 'e.li.0'
+
+    other = PathDoc()
+    other.e = outer
+
+    assert item._yadm_path_cache is None  # dropped eagerly
+    assert item.__document__ is other
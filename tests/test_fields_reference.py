@@ -129,6 +129,22 @@ def test_cache(db):
     assert doc.ref.__qs__.cache is doc.__qs__.cache
 
 
+def test_cache__counters(db):
+    ref_one = DocRef(i=13)
+    db.insert_one(ref_one)
+
+    ref_two = DocRef(i=26)
+    db.insert_one(ref_two)
+
+    db.insert_one(Doc(ref=ref_one))
+    db.insert_one(Doc(ref=ref_one))
+    db.insert_one(Doc(ref=ref_two))
+
+    qs = db.get_queryset(Doc)
+    assert len([d.ref for d in qs]) == 3
+    assert (qs.cache.hits, qs.cache.misses) == (1, 2)
+
+
 def test_copy():
     class InhDoc(Doc):
         pass
@@ -9,7 +9,9 @@ from yadm.fields.references_list import (
     ReferencesList,
     NotResolved,
     AlreadyResolved,
+    resolve_references_lists,
 )
+from yadm.queryset import NotFoundError
 
 
 class RDoc(Document):
@@ -105,6 +107,40 @@ def test_resolve(db, docs):
         assert isinstance(rdoc, RDoc)
 
 
+def test_resolve_references_lists(db, docs):
+    result = db(Doc).sort(('_id', 1)).resolve_references_lists('ref')
+
+    assert [[r.i for r in doc.ref] for doc in result] == [
+        [13, 42], [42], [42, 666]]
+    assert result[0].ref[1] is result[1].ref[0]
+    assert all(doc.ref.__log__[-1].op == 'references_list_resolve'
+               for doc in result)
+
+
+@pytest.mark.parametrize('not_found, result', [
+    ('none', [[13, None], [None], [None, 666]]),
+    ('skip', [[13], [], [666]]),
+])
+def test_resolve_references_lists__not_found(db, docs, not_found, result):
+    db.db.testrdocs.delete_one({'i': 42})
+    docs = list(db(Doc).sort(('_id', 1)))
+
+    resolve_references_lists(docs, 'ref', not_found=not_found, chunk_size=1)
+    assert [[getattr(r, 'i', None) for r in doc.ref] for doc in docs] == result
+
+
+def test_resolve_references_lists__error(db, docs):
+    db.db.testrdocs.delete_one({'i': 42})
+
+    with pytest.raises(NotFoundError):
+        db(Doc).resolve_references_lists('ref', not_found='error')
+
+
+def test_resolve_references_lists__bad_field(db, docs):
+    with pytest.raises(ValueError):
+        resolve_references_lists(docs, '_id')
+
+
 def test_already_resolved(db, docs):
     doc = db.get_document(Doc, docs[0].id)
     doc.ref.resolve()
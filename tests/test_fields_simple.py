@@ -1,7 +1,11 @@
+import enum
+
 import pytest
 
 from yadm import fields
 from yadm.documents import Document
+from yadm.fields.base import IdentityFieldDescriptor
+from yadm.log_items import SetField
 from yadm.testing import create_fake
 
 
@@ -80,3 +84,70 @@ class TestStaticField:
         raw = db.db[self.Doc.__collection__].find_one()
         assert raw['int'] == 13
         assert raw['str'] == 'string'
+
+
+class TestIdentityConversion:
+    class Doc(Document):
+        __collection__ = 'docs'
+
+        b = fields.BooleanField()
+        i = fields.IntegerField()
+        f = fields.FloatField()
+        s = fields.StringField()
+        e = fields.EmailField()
+        en = fields.EnumField(enum.Enum('Color', 'RED GREEN'))
+
+    @pytest.mark.parametrize('name', ['_id', 'b', 'i', 'f', 's', 'e'])
+    def test_descriptor(self, name):
+        descriptor = self.Doc.__dict__[name]
+        assert isinstance(descriptor, IdentityFieldDescriptor)
+
+    def test_descriptor__other_fields(self):
+        descriptor = self.Doc.__dict__['en']
+        assert not isinstance(descriptor, IdentityFieldDescriptor)
+
+    def test_descriptor__overridden_from_mongo(self):
+        class UpperStringField(fields.StringField):
+            def from_mongo(self, document, value):
+                return value.upper()
+
+        class UpperDoc(Document):
+            s = UpperStringField()
+
+        descriptor = UpperDoc.__dict__['s']
+        assert not isinstance(descriptor, IdentityFieldDescriptor)
+        assert not UpperDoc.s.identity_conversion
+
+        doc = UpperDoc.__hydrate__({'s': 'abc'})
+        assert doc.s == 'ABC'
+
+        doc = UpperDoc.__hydrate__({'s': 'abc'})
+        doc.s = 'abc'  # raw value is not equal to python value
+        assert doc.__log__
+
+    def test_get(self):
+        doc = self.Doc.__hydrate__({'b': True, 'i': 13, 'f': 1, 's': None})
+
+        assert doc.b is True
+        assert doc.i == 13
+        assert doc.f == 1.0 and isinstance(doc.f, float)
+        assert doc.s is None
+        assert doc.__cache__ == {}
+
+        with pytest.raises(AttributeError):
+            doc.e
+
+    def test_set(self):
+        doc = self.Doc.__hydrate__({'i': 13})
+
+        doc.i = 13
+        assert not doc.__log__
+
+        doc.i = 26
+        assert doc.i == 26
+        assert doc.__raw__ == {'i': 13}
+        assert doc.__log__[-1] == SetField(name='i', value=26)
+
+        del doc.i
+        with pytest.raises(AttributeError):
+            doc.i
@@ -0,0 +1,122 @@
+import pytest
+
+from yadm.documents import Document
+from yadm.identity_map import IdentityMap, get_identity_map
+from yadm import fields
+
+
+class RefDoc(Document):
+    __collection__ = 'testdocs_ref'
+    i = fields.IntegerField()
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    ref = fields.ReferenceField(RefDoc)
+
+
+@pytest.fixture
+def ref_id(db):
+    return db.db.testdocs_ref.insert_one({'i': 13}).inserted_id
+
+
+@pytest.fixture
+def ids(db, ref_id):
+    return db.db.testdocs.insert_many(
+        [{'i': n, 'ref': ref_id} for n in range(3)]).inserted_ids
+
+
+def test_session(db):
+    assert db.identity_map is None
+
+    with db.session() as session:
+        assert isinstance(session, IdentityMap)
+        assert db.identity_map is session
+        assert get_identity_map(object()) is None
+
+        with db.session() as inner:
+            assert db.identity_map is inner
+
+        assert db.identity_map is session
+
+    assert db.identity_map is None
+
+
+def test_get_document(db, ids):
+    with db.session() as session:
+        doc = db.get_document(Doc, ids[0])
+        db.db.testdocs.drop()
+
+        assert db.get_document(Doc, ids[0]) is doc
+        assert db(Doc).find_one(ids[0]) is doc
+        assert len(session) == 1
+
+    assert db.get_document(Doc, ids[0]) is None
+
+
+def test_queryset(db, ids):
+    with db.session():
+        docs = list(db(Doc).sort(('i', 1)))
+
+        assert list(db(Doc).sort(('i', 1))) == docs
+        assert all(a is b for a, b in zip(db(Doc).sort(('i', 1)), docs))
+        assert db(Doc).find_one({'i': 1}) is docs[1]
+        assert db.get_document(Doc, ids[2]) is docs[2]
+
+
+def test_not_mapped(db, ids):
+    with db.session() as session:
+        doc = db(Doc).fields('i').find_one(ids[0])
+        assert db(Doc).fields('i').find_one(ids[0]) is not doc
+
+        doc = db(Doc).read_only().find_one(ids[0])
+        assert db(Doc).read_only().find_one(ids[0]) is not doc
+
+        assert len(session) == 0
+
+
+def test_references(db, ids, ref_id):
+    with db.session() as session:
+        docs = list(db(Doc))
+        assert docs[0].ref is docs[1].ref
+        assert db(Doc).find_one(ids[2]).ref is docs[0].ref
+        assert (RefDoc, ref_id) in session
+
+
+def test_join(db, ids, ref_id):
+    with db.session():
+        ref = db.get_document(RefDoc, ref_id)
+        db.db.testdocs_ref.drop()
+
+        join = db(Doc).join('ref')
+        assert all(doc.ref is ref for doc in join)
+
+
+def test_prefetch(db, ids, ref_id):
+    with db.session():
+        ref = db.get_document(RefDoc, ref_id)
+        db.db.testdocs_ref.drop()
+
+        assert all(doc.ref is ref for doc in db(Doc).prefetch('ref'))
+
+
+def test_insert_delete(db):
+    with db.session() as session:
+        doc = Doc(i=1)
+        db.insert_one(doc)
+
+        assert db.get_document(Doc, doc.id) is doc
+
+        db.delete_one(doc)
+        assert len(session) == 0
+
+
+def test_reload(db, ids):
+    with db.session():
+        doc = db.get_document(Doc, ids[0])
+        db.db.testdocs.update_one({'_id': ids[0]}, {'$set': {'i': 26}})
+
+        assert db.get_document(Doc, ids[0]).i == 0
+        assert db.reload(doc) is doc
+        assert doc.i == 26
@@ -2,13 +2,17 @@ import pytest
 
 from bson import ObjectId
 
-from yadm.documents import Document
+from yadm.documents import Document, EmbeddedDocument
+from yadm.exceptions import NotLoadedError
 from yadm import fields
+from yadm.join import Join
+from yadm.fields.references_list import ReferencesListField
 
 
 class DocRef(Document):
     __collection__ = 'testdocs_ref'
     i = fields.IntegerField()
+    s = fields.StringField()
 
 
 class Doc(Document):
@@ -19,12 +23,12 @@ class Doc(Document):
 
 @pytest.fixture
 def id_ref_1(db):
-    return db.db.testdocs_ref.insert_one({'i': 1}).inserted_id
+    return db.db.testdocs_ref.insert_one({'i': 1, 's': 'a'}).inserted_id
 
 
 @pytest.fixture
 def id_ref_2(db, id_ref_1):
-    return db.db.testdocs_ref.insert_one({'i': 2}).inserted_id
+    return db.db.testdocs_ref.insert_one({'i': 2, 's': 'b'}).inserted_id
 
 
 @pytest.fixture
@@ -61,6 +65,35 @@ def test_join(join, id_ref_1, id_ref_2):
         assert doc.ref.id == id_ref_1 if doc.i % 2 else id_ref_2
 
 
+def test_join__projections(db, qs):
+    join = qs.join('ref', projections={'ref': {'i': 1}})
+
+    for doc in join:
+        assert isinstance(doc.__cache__['ref'], DocRef)
+        assert doc.ref.i in {1, 2}
+        assert doc.ref.__not_loaded__ == frozenset({'s'})
+
+        with pytest.raises(NotLoadedError):
+            doc.ref.s
+
+
+def test_join__projections_bad_field(db, qs):
+    with pytest.raises(ValueError):
+        qs.join('ref', projections={'i': {'i': 1}})
+
+
+@pytest.mark.parametrize('projections, projection', [
+    ([None, None], None),
+    ([{'i': 1}, {'i': 1}], {'i': 1}),
+    ([{'i': 1}, None], None),
+    ([{'i': 1}, {'s': 1}], {'i': 1, 's': 1}),
+    ([{'i': 0}, {'s': 0}], None),
+    ([{'i': 1}, {'s': 0}], None),
+])
+def test_merge_projections(projections, projection):
+    assert Join._merge_projections(projections) == projection
+
+
 def test_get_queryset(db, qs, id_ref_1, id_ref_2):
     db.db.testdocs_ref.insert_one({'i': 3})
     qs = qs.join().get_queryset('ref')
@@ -76,3 +109,113 @@ def test_get_queryset__bad_field_name(db, qs):
 def test_get_queryset__bad_field_type(db, qs):
     with pytest.raises(ValueError):
         qs.join().get_queryset('i')
+
+
+def test_join_iter(db, qs, id_ref_1, id_ref_2):
+    docs = list(qs.sort(('i', 1)).join_iter('ref', chunk_size=3))
+
+    assert [doc.i for doc in docs] == list(range(10))
+    assert all('ref' in doc.__cache__ for doc in docs)
+    assert [doc.ref.id for doc in docs] == [
+        id_ref_1 if n % 2 else id_ref_2 for n in range(10)]
+    assert docs[0].ref is docs[2].ref
+    assert docs[0].ref is not docs[4].ref  # other chunk
+
+
+def test_join_iter__cache(db, qs):
+    docs = qs.sort(('i', 1)).join_iter('ref', chunk_size=3, cache_size=10)
+    first = [next(docs) for _ in range(3)]
+
+    db.db.testdocs_ref.drop()  # next chunks are joined from cache
+    docs = first + list(docs)
+
+    assert all(isinstance(doc.ref, Document) for doc in docs)
+    assert docs[0].ref is docs[4].ref
+
+
+def test_join_iter__projections(db, qs):
+    docs = qs.join_iter('ref', chunk_size=3, projections={'ref': {'s': 1}})
+
+    for doc in docs:
+        assert doc.ref.s in {'a', 'b'}
+        assert 'i' in doc.ref.__not_loaded__
+
+
+
+class Line(EmbeddedDocument):
+    ref = fields.ReferenceField(DocRef)
+    refs = fields.ListField(fields.ReferenceField(DocRef))
+
+
+class Order(Document):
+    __collection__ = 'testdocs_orders'
+    line = fields.EmbeddedDocumentField(Line)
+    lines = fields.ListField(fields.EmbeddedDocumentField(Line))
+    refs = fields.ListField(fields.ReferenceField(DocRef))
+    rlist = ReferencesListField(DocRef)
+
+
+@pytest.fixture
+def orders(db, id_ref_1, id_ref_2):
+    db.db.testdocs_orders.insert_many([
+        {
+            'line': {'ref': id_ref_1},
+            'lines': [{'ref': id_ref_1}, {'ref': id_ref_2, 'refs': [id_ref_1]}],
+            'refs': [id_ref_2, id_ref_1],
+            'rlist': [id_ref_1, id_ref_2],
+        },
+        {
+            'lines': [],
+        },
+    ])
+    return db(Order)
+
+
+@pytest.mark.parametrize('path', [
+    'line.bad', 'line.ref.i', 'lines', 'line', 'refs.i', 'rlist.i',
+])
+def test_get_queryset__bad_path(orders, path):
+    with pytest.raises(ValueError):
+        orders.join().get_queryset(path)
+
+
+@pytest.mark.parametrize('path, count', [
+    ('line.ref', 1),
+    ('lines.ref', 2),
+    ('lines.refs', 1),
+    ('refs', 2),
+    ('rlist', 2),
+])
+def test_get_queryset__path(orders, path, count, id_ref_1):
+    ids = {d.id for d in orders.join().get_queryset(path)}
+    assert len(ids) == count
+    assert id_ref_1 in ids
+
+
+def test_join__paths(db, orders, id_ref_1, id_ref_2):
+    join = orders.join('line.ref', 'lines.ref', 'lines.refs', 'refs', 'rlist')
+    db.db.testdocs_ref.drop()  # all references are joined
+
+    order, empty = sorted(join, key=lambda d: len(d.lines), reverse=True)
+    ref_1 = order.line.ref
+
+    assert isinstance(ref_1, DocRef)
+    assert ref_1.id == id_ref_1
+    assert [line.ref for line in order.lines] == [ref_1, order.refs[0]]
+    assert order.lines[0].ref is ref_1
+    assert order.lines[1].refs[0] is ref_1
+    assert [d.id for d in order.refs] == [id_ref_2, id_ref_1]
+    assert order.refs[1] is ref_1
+    assert order.refs.__parent__ is order
+    assert order.rlist.resolved
+    assert list(order.rlist) == [ref_1, order.refs[0]]
+    assert empty.lines == []
+
+
+def test_join__paths_not_found(db, orders, id_ref_1, id_ref_2):
+    db.db.testdocs_ref.delete_one({'_id': id_ref_2})
+    join = orders.join('rlist')
+    order = max(join, key=lambda d: len(d.lines))
+
+    assert [d.id for d in order.rlist if d is not None] == [id_ref_1]
+    assert order.rlist[1] is None
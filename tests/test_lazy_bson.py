@@ -0,0 +1,159 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import bson
+from bson import ObjectId, Binary, Regex, Code, Timestamp, Int64, Decimal128
+
+from yadm import fields
+from yadm.documents import Document, EmbeddedDocument
+from yadm.lazy_bson import LazyBSONDocument, LAZY_BSON_OPTIONS
+from yadm.serialize import to_mongo, LOOKUPS_KEY
+
+
+RAW = {
+    '_id': ObjectId(),
+    'float': 1.5,
+    'str': 'string',
+    'doc': {'a': [1, {'b': 2}]},
+    'list': [1, 2],
+    'binary': Binary(b'xx', 128),
+    'bool': True,
+    'datetime': datetime(2020, 1, 1),
+    'null': None,
+    'regex': Regex('a.*b', 'i'),
+    'code': Code('x = 1'),
+    'code_w_scope': Code('x', {'a': 1}),
+    'int': 13,
+    'timestamp': Timestamp(1, 2),
+    'int64': Int64(7),
+    'decimal': Decimal128('1.5'),
+    'last': 'last',
+}
+
+
+class EDoc(EmbeddedDocument):
+    s = fields.StringField()
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    d = fields.DecimalField()
+    e = fields.EmbeddedDocumentField(EDoc)
+
+
+@pytest.fixture
+def lazy():
+    return LazyBSONDocument(bson.encode(RAW), LAZY_BSON_OPTIONS)
+
+
+def test_getitem(lazy):
+    assert lazy['last'] == 'last'
+    assert lazy['str'] == 'string'
+    assert lazy['doc'] == {'a': [1, {'b': 2}]}
+    assert isinstance(lazy['doc'], dict)
+
+    with pytest.raises(KeyError):
+        lazy['unknown']
+
+
+def test_contains(lazy):
+    assert 'int' in lazy
+    assert 'unknown' not in lazy
+
+
+def test_mapping(lazy):
+    assert list(lazy) == list(RAW)
+    assert len(lazy) == len(RAW)
+    assert dict(lazy) == RAW
+    assert lazy == RAW
+    assert lazy
+
+
+def test_decode(lazy):
+    decoded = bson.decode(bson.encode(RAW), LAZY_BSON_OPTIONS)
+    assert isinstance(decoded, LazyBSONDocument)
+    assert decoded == lazy
+
+
+def test_encode(lazy):
+    assert bson.encode(lazy) == lazy.raw
+
+
+def test_hydrate__lookups():
+    raw = {'_id': ObjectId(), LOOKUPS_KEY: {'e': {'s': 'str'}}}
+    doc = Doc.__hydrate__(LazyBSONDocument(bson.encode(raw)))
+
+    assert doc.__yadm_lookups__ == {'e': {'s': 'str'}}
+    assert isinstance(to_mongo(doc), dict)
+
+
+@pytest.fixture
+def _id(db):
+    return db.db.testdocs.insert_one({
+        'i': 13,
+        'd': {'i': 314, 'e': -2},
+        'e': {'s': 'str'},
+        'unknown': 'value',
+    }).inserted_id
+
+
+def test_queryset(db, _id):
+    doc = db(Doc).lazy().find_one(_id)
+
+    assert isinstance(doc.__raw__, LazyBSONDocument)
+    assert doc.i == 13
+    assert doc.d == Decimal('3.14')
+    assert doc.e.s == 'str'
+    assert not doc.__raw__._index.keys() - {'_id', 'i', 'd', 'e'}
+
+
+def test_get_document(db, _id):
+    doc = db.get_document(Doc, _id, lazy=True)
+
+    assert isinstance(doc.__raw__, LazyBSONDocument)
+    assert doc.i == 13
+
+
+def test_to_mongo__not_changed(db, _id):
+    doc = db(Doc).lazy().find_one(_id)
+    assert doc.e.s == 'str'
+    assert to_mongo(doc) is doc.__raw__
+
+
+@pytest.mark.parametrize('change', ['set', 'set_embedded'])
+def test_to_mongo__changed(db, _id, change):
+    doc = db(Doc).lazy().find_one(_id)
+
+    if change == 'set':
+        doc.i = 26
+    else:
+        doc.e.s = 'new'
+
+    raw = to_mongo(doc)
+    assert isinstance(raw, dict)
+    assert 'unknown' not in raw
+
+
+def test_save(db, _id):
+    doc = db(Doc).lazy().find_one(_id)
+    db.save(doc)
+    assert db.db.testdocs.find_one(_id)['unknown'] == 'value'
+
+    doc.i = 26
+    db.save(doc)
+    assert db.db.testdocs.find_one(_id) == {
+        '_id': _id,
+        'i': 26,
+        'd': {'i': 314, 'e': -2},
+        'e': {'s': 'str'},
+    }
+
+
+def test_reload(db, _id):
+    doc = db(Doc).lazy().find_one(_id)
+    db.db.testdocs.update_one({'_id': _id}, {'$set': {'i': 26}})
+
+    db.reload(doc)
+    assert doc.i == 26
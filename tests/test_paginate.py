@@ -0,0 +1,133 @@
+from datetime import datetime
+
+import pytest
+
+from yadm.documents import Document
+from yadm.paginate import Page, get_sort_keys, get_after_criteria
+from yadm import fields
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    date = fields.DatetimeField()
+
+
+@pytest.fixture
+def qs(db):
+    db.db.testdocs.insert_many([
+        {'i': n, 'date': datetime(2020, 1, 1 + n % 4)} for n in range(10)
+    ])
+    return db(Doc)
+
+
+def iter_pages(qs, sort_key, size):
+    token = None
+
+    while True:
+        page = qs.paginate(sort_key, after=token, size=size)
+        yield page
+
+        if not page.has_next:
+            break
+
+        token = page.next_token
+
+
+@pytest.mark.parametrize('sort_key', [
+    ('_id', 1),
+    ('_id', -1),
+    ('i', -1),
+    ('date', 1),
+    [('date', -1), ('i', 1)],
+])
+def test_paginate(qs, sort_key):
+    keys = get_sort_keys(sort_key)
+    expected = list(qs.copy(sort=keys))
+    pages = list(iter_pages(qs, sort_key, 3))
+
+    assert [len(p) for p in pages] == [3, 3, 3, 1]
+    assert all(isinstance(p, Page) for p in pages)
+    assert [d.id for p in pages for d in p] == [d.id for d in expected]
+
+
+@pytest.mark.parametrize('sort_key', [
+    ('i', 1),
+    ('i', -1),
+    [('i', -1), ('date', 1)],
+])
+def test_paginate__missing_values(db, sort_key):
+    db.db.testdocs.insert_many([
+        {'i': n} if n % 3 else {'date': datetime(2020, 1, 1)}
+        for n in range(10)
+    ])
+    db.db.testdocs.insert_one({'i': None})
+    qs = db(Doc)
+
+    expected = list(qs.copy(sort=get_sort_keys(sort_key)))
+    pages = list(iter_pages(qs, sort_key, 2))
+
+    assert [d.id for p in pages for d in p] == [d.id for d in expected]
+    assert len(expected) == 11
+
+
+def test_paginate__exact(qs):
+    pages = list(iter_pages(qs, ('i', 1), 5))
+
+    assert [len(p) for p in pages] == [5, 5]
+    assert pages[-1].next_token is None
+
+
+def test_paginate__criteria(qs):
+    qs = qs.find({'i': {'$gte': 5}})
+    pages = list(iter_pages(qs, ('i', -1), 2))
+
+    assert [[d.i for d in p] for p in pages] == [[9, 8], [7, 6], [5]]
+
+
+@pytest.mark.parametrize('token', ['bad', 'AAAA', ''])
+def test_paginate__bad_token(qs, token):
+    with pytest.raises(ValueError):
+        qs.paginate(('i', 1), after=token)
+
+
+def test_paginate__token_for_other_sort(qs):
+    page = qs.paginate(('i', 1), size=2)
+
+    with pytest.raises(ValueError):
+        qs.paginate(('i', -1), after=page.next_token)
+
+
+@pytest.mark.parametrize('sort_key, keys', [
+    (('i', 1), [('i', 1), ('_id', 1)]),
+    (('i', -1), [('i', -1), ('_id', -1)]),
+    (('_id', -1), [('_id', -1)]),
+    ([('a', 1), ('b', -1)], [('a', 1), ('b', -1), ('_id', -1)]),
+])
+def test_get_sort_keys(sort_key, keys):
+    assert get_sort_keys(sort_key) == keys
+
+
+def test_get_sort_keys__bad_direction():
+    with pytest.raises(ValueError):
+        get_sort_keys(('i', 2))
+
+
+def test_get_after_criteria():
+    keys = [('a', 1), ('b', -1), ('_id', -1)]
+
+    assert get_after_criteria(keys, [1, 2, 3]) == {'$or': [
+        {'a': {'$gt': 1}},
+        {'a': 1, 'b': {'$lt': 2}},
+        {'a': 1, 'b': None},
+        {'a': 1, 'b': 2, '_id': {'$lt': 3}},
+    ]}
+
+
+def test_get_after_criteria__none():
+    keys = [('a', 1), ('b', -1), ('_id', 1)]
+
+    assert get_after_criteria(keys, [None, None, 3]) == {'$or': [
+        {'a': {'$ne': None}},
+        {'a': None, 'b': None, '_id': {'$gt': 3}},
+    ]}
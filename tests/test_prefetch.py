@@ -0,0 +1,105 @@
+import pytest
+
+from yadm.documents import Document
+from yadm.prefetch import Prefetch
+from yadm import fields
+
+
+class User(Document):
+    __collection__ = 'testdocs_users'
+    name = fields.StringField()
+    age = fields.IntegerField()
+
+
+class Post(Document):
+    __collection__ = 'testdocs_posts'
+    title = fields.StringField()
+    user = fields.ReferenceField(User)
+
+
+class Comment(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    user = fields.ReferenceField(User)
+    post = fields.ReferenceField(Post)
+
+
+@pytest.fixture
+def qs(db):
+    users = db.db.testdocs_users.insert_many(
+        [{'name': 'user{}'.format(n), 'age': n} for n in range(3)]
+    ).inserted_ids
+    posts = db.db.testdocs_posts.insert_many(
+        [{'title': 'post{}'.format(n), 'user': users[n]} for n in range(3)]
+    ).inserted_ids
+    db.db.testdocs.insert_many([
+        {'i': n, 'user': users[n % 3], 'post': posts[(n + 1) % 3]}
+        for n in range(10)
+    ])
+    return db(Comment).sort(('i', 1))
+
+
+def test_prefetch_tree():
+    prefetch = Prefetch(Comment, ['user', 'post.user'])
+
+    assert set(prefetch.tree) == {'user', 'post'}
+    assert prefetch.tree['user'][1] == {}
+    assert set(prefetch.tree['post'][1]) == {'user'}
+
+
+def test_prefetch_merge():
+    prefetch = Prefetch(Comment, ['user']).merge(['post'], {User: {'name': 1}})
+
+    assert prefetch.paths == {'user', 'post'}
+    assert prefetch.projections == {User: {'name': 1}}
+
+
+@pytest.mark.parametrize('path', ['i', 'unknown', 'post.title'])
+def test_prefetch_not_reference(db, path):
+    with pytest.raises(ValueError):
+        db(Comment).prefetch(path)
+
+
+def test_prefetch(db, qs):
+    comments = list(qs.prefetch('user', 'post', 'post.user'))
+
+    # all references are in __cache__, database is not needed
+    db.db.testdocs_users.drop()
+    db.db.testdocs_posts.drop()
+
+    assert [c.user.name for c in comments] == [
+        'user{}'.format(n % 3) for n in range(10)]
+    assert [c.post.title for c in comments] == [
+        'post{}'.format((n + 1) % 3) for n in range(10)]
+    assert [c.post.user.name for c in comments] == [
+        'user{}'.format((n + 1) % 3) for n in range(10)]
+
+    assert comments[0].user is comments[5].post.user  # same batch
+
+
+def test_prefetch_batches(db, qs):
+    comments = list(qs.batch_size(3).prefetch('user'))
+
+    assert len(comments) == 10
+    assert all('user' in c.__cache__ for c in comments)
+    assert comments[0].user is not comments[3].user  # other batch
+
+
+def test_prefetch_projection(db, qs):
+    comments = list(qs.prefetch('user', projections={User: {'name': True}}))
+
+    assert comments[0].user.name == 'user0'
+    assert 'age' in comments[0].user.__not_loaded__
+
+
+def test_prefetch_not_found(db, qs):
+    db.db.testdocs_posts.delete_many({'title': 'post1'})
+    comments = list(qs.prefetch('post'))
+
+    assert 'post' not in comments[0].__cache__
+    assert comments[1].post.title == 'post2'
+
+
+def test_prefetch_copy(qs):
+    qs = qs.prefetch('user').find({'i': {'$gt': 5}}).prefetch('post')
+    assert qs._prefetch.paths == {'user', 'post'}
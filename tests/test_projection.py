@@ -0,0 +1,75 @@
+import pytest
+
+from yadm import fields
+from yadm.documents import Document, EmbeddedDocument
+from yadm.exceptions import NotLoadedError
+from yadm.projection import (
+    ProjectionPlan,
+    EMPTY_PLAN,
+    make_plan,
+    compile_projection,
+)
+from yadm.serialize import from_mongo
+
+
+class EDoc(EmbeddedDocument):
+    i = fields.IntegerField()
+    s = fields.StringField()
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    e = fields.EmbeddedDocumentField(EDoc)
+    li = fields.ListField(fields.EmbeddedDocumentField(EDoc))
+
+
+def test_plan():
+    plan = ProjectionPlan(['i', 'e.i', 'e.x.y'])
+
+    assert plan == frozenset({'i', 'e.i', 'e.x.y'})
+    assert 'e' not in plan
+    assert plan.child('e') == {'i', 'x.y'}
+    assert plan.child('e').child('x') == {'y'}
+    assert plan.child('e') is plan.child('e')
+    assert plan.child('i') is EMPTY_PLAN
+
+
+def test_make_plan():
+    plan = ProjectionPlan(['i'])
+
+    assert make_plan(plan) is plan
+    assert make_plan(None) is EMPTY_PLAN
+    assert make_plan([]) is EMPTY_PLAN
+    assert make_plan({'i'}) == plan
+
+
+@pytest.mark.parametrize('projection, result', [
+    (None, set()),
+    ({'i': False, 'e.s': False}, {'i', 'e.s'}),
+    ({'i': True}, {'e', 'li'}),
+    ({'i': True, '_id': False}, {'_id', 'e', 'li'}),
+])
+def test_compile_projection(projection, result):
+    assert compile_projection(Doc, projection) == result
+
+
+def test_embedded_and_list_items():
+    raw = {'e': {'i': 1}, 'li': [{'i': 2}, {'i': 3}]}
+    doc = from_mongo(Doc, raw, not_loaded=['e.s', 'li.s'])
+
+    assert doc.e.__not_loaded__ is doc.__not_loaded__.child('e')
+    assert [item.i for item in doc.li] == [2, 3]
+    assert doc.li[0].__not_loaded__ is doc.__not_loaded__.child('li')
+
+    with pytest.raises(NotLoadedError):
+        doc.li[1].s
+
+
+def test_queryset_plan_is_shared(db):
+    db.db.testdocs.insert_many([{'i': n, 'e': {'i': n}} for n in range(3)])
+    qs = db(Doc).find({}, {'e.s': False})
+
+    docs = list(qs)
+    assert all(doc.__not_loaded__ is qs._projection_plan for doc in docs)
+    assert docs[0].e.__not_loaded__ is docs[1].e.__not_loaded__
@@ -1,4 +1,5 @@
 import random
+from decimal import Decimal
 
 import pytest
 
@@ -6,9 +7,10 @@ import pymongo
 from bson import ObjectId
 
 from yadm import fields
-from yadm.documents import Document
+from yadm.documents import Document, EmbeddedDocument
+from yadm.cache import LRUCache, CACHE_SIZE
 from yadm.queryset import QuerySet, NotFoundError
-from yadm.exceptions import NotLoadedError
+from yadm.exceptions import NotLoadedError, ReadOnlyDocumentError
 
 
 class Doc(Document):
@@ -249,6 +251,15 @@ def test_fields_all(qs):
     assert doc.__raw__['i'] == 3
     assert doc.s == 'str(3)'
     assert doc.i == 3
+    assert not doc.__not_loaded__
+
+
+def test_fields_all__save(db, qs):
+    doc = qs.fields('s').fields_all().find_one({'i': 3})
+    doc.i = 13
+    db.save(doc)
+
+    assert db.db.testdocs.find_one({'_id': doc.id})['i'] == 13
 
 
 @pytest.mark.parametrize('projection', [
@@ -369,6 +380,91 @@ def test_default_projection(db, qs):
         doc.s
 
 
+def test_values(qs):
+    qs = qs.find({'i': {'$gte': 6}}).sort(('i', 1))
+    assert list(qs.values('i')) == [{'i': 6}, {'i': 7}, {'i': 8}, {'i': 9}]
+
+    values = list(qs.values('s', 'unknown'))
+    assert values[0] == {'s': 'str(6)', 'unknown': None}
+
+
+def test_values__all(qs):
+    values = list(qs.find({'i': 3}).values())
+    assert values == [{'_id': values[0]['_id'], 'i': 3, 's': 'str(3)'}]
+    assert isinstance(values[0]['_id'], ObjectId)
+
+
+def test_values__dotted(db):
+    class EDoc(EmbeddedDocument):
+        d = fields.DecimalField()
+
+    class EmbeddedDoc(Document):
+        __collection__ = 'testdocs'
+        e = fields.EmbeddedDocumentField(EDoc)
+
+    db.db['testdocs'].insert_one({'e': {'d': {'i': 314, 'e': -2}}})
+    db.db['testdocs'].insert_one({'e': {}})
+    qs = db.get_queryset(EmbeddedDoc)
+
+    assert list(qs.values_list('e.d', flat=True)) == [
+        {'i': 314, 'e': -2},
+        None,
+    ]
+    assert list(qs.values_list('e.d', flat=True, convert=True)) == [
+        Decimal('3.14'),
+        None,
+    ]
+
+
+def test_values_list(qs):
+    qs = qs.find({'i': {'$lt': 2}}).sort(('i', 1))
+    assert list(qs.values_list('i', 's')) == [(0, 'str(0)'), (1, 'str(1)')]
+    assert list(qs.values_list('i', flat=True)) == [0, 1]
+
+    with pytest.raises(TypeError):
+        list(qs.values_list('i', 's', flat=True))
+
+
+def test_values_list__convert_reference(db, qs):
+    class RefDoc(Document):
+        __collection__ = 'testdocs'
+        ref = fields.ReferenceField(Doc)
+
+    doc = qs.find_one({'i': 1})
+    db.db['testdocs'].insert_one({'ref': doc.id})
+
+    qs = db.get_queryset(RefDoc).find({'ref': {'$exists': True}})
+    assert list(qs.values_list('ref', flat=True, convert=True)) == [doc.id]
+
+
+def test_read_only(qs):
+    doc = qs.read_only().find_one({'i': 3})
+
+    assert doc.i == 3
+    assert doc.__read_only__
+    assert doc.__qs__ is None
+    assert not doc.__log__
+
+    with pytest.raises(ReadOnlyDocumentError):
+        doc.i = 13
+
+    with pytest.raises(ReadOnlyDocumentError):
+        del doc.s
+
+    assert doc.i == 3
+    assert doc.s == 'str(3)'
+
+
+def test_read_only__copy(qs):
+    qs = qs.read_only().find({'i': {'$gte': 6}})
+    assert all(doc.__read_only__ for doc in qs)
+
+    doc = qs.read_only(False).find_one()
+    assert not doc.__read_only__
+    doc.i = 13
+    assert doc.__log__
+
+
 class TestFindIn:
     @pytest.fixture(autouse=True)
     def ids(self, qs):
@@ -411,3 +507,17 @@ class TestFindIn:
                   for doc in qs.find_in(ids)]
 
         assert result == ids
+
+
+def test_cache_size(db):
+    qs = db(Doc)
+    assert isinstance(qs.cache, LRUCache)
+    assert qs.cache.size == CACHE_SIZE
+    assert qs.find({'i': 1}).cache is qs.cache
+
+    qs = db(Doc, cache_size=10)
+    assert qs.cache.size == 10
+    assert qs.copy(cache_size=20).cache.size == 20
+
+    db.cache_size = 30
+    assert db(Doc).cache.size == 30
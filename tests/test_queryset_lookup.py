@@ -1,7 +1,10 @@
+import pytest
 from bson import ObjectId
 
 from yadm.documents import Document
+from yadm.exceptions import NotLoadedError
 from yadm.fields import IntegerField, StringField, ReferenceField
+from yadm.projection import make_plan
 from yadm.serialize import LOOKUPS_KEY
 
 
@@ -46,3 +49,100 @@ def test_lookup(db):
 
     for doc in docs:
         assert doc.ref.s == 'ref-{}'.format(doc.s.split('-')[1])
+
+
+@pytest.fixture
+def qs(db):
+    for n in range(10):
+        if n % 3:
+            ref = db.db['refs'].insert_one({'s': 'ref-{}'.format(n)}).inserted_id
+        else:
+            ref = ObjectId()  # broken reference
+
+        db.db['docs'].insert_one({'i': n, 's': 'doc-{}'.format(n), 'ref': ref})
+
+    return db(Doc).sort(('i', 1))
+
+
+def test_lookup__pipeline(db):
+    qs = db(Doc).find({'i': 1}, {'ref': 1}).sort(('i', -1))
+    qs = qs.lookup('ref', preserve_null=True, projections={'ref': {'s': 1}})
+    pipeline = qs._get_lookup_pipeline(qs._criteria, qs._projection, qs._sort,
+                                       qs._lookup, slice(5, 15))
+
+    assert pipeline == [
+        {'$match': {'i': 1}},
+        {'$sort': {'i': -1}},
+        {'$skip': 5},
+        {'$limit': 10},
+        {'$project': {'ref': 1}},
+        {'$lookup': {'from': 'refs',
+                     'let': {'id': '$ref'},
+                     'pipeline': [
+                         {'$match': {'$expr': {'$eq': ['$_id', '$$id']}}},
+                         {'$project': {'s': 1}},
+                     ],
+                     'as': LOOKUPS_KEY + '.ref'}},
+        {'$unwind': {'path': '$' + LOOKUPS_KEY + '.ref',
+                     'preserveNullAndEmptyArrays': True}},
+    ]
+
+
+def test_lookup__slice(qs):
+    docs = list(qs.lookup('ref')[1:4])
+
+    assert [d.i for d in docs] == [1, 2]  # 3 has broken reference
+    assert [d.ref.s for d in docs] == ['ref-1', 'ref-2']
+
+
+def test_lookup__preserve_null(qs):
+    docs = list(qs.lookup('ref', preserve_null=True)[:4])
+
+    assert [d.i for d in docs] == [0, 1, 2, 3]
+    assert [bool(d.__yadm_lookups__) for d in docs] == [False, True, True, False]
+
+
+def test_lookup__projection(qs):
+    docs = list(qs.lookup('ref', projections={'ref': {'_id': 1}}))
+
+    assert len(docs) == 6
+
+    for doc in docs:
+        assert doc.ref.__not_loaded__ == {'s'}
+
+        with pytest.raises(NotLoadedError):
+            doc.ref.s
+
+
+
+def test_lookup__projection_read_only(qs):
+    qs = qs.read_only().lookup('ref', projections={'ref': {'_id': 1}})
+    docs = list(qs)
+
+    assert len(docs) == 6
+
+    for doc in docs:
+        assert doc.__qs__ is None
+        assert doc.ref.__not_loaded__ == {'s'}
+
+        with pytest.raises(NotLoadedError):
+            doc.ref.s
+
+
+def test_lookup__plans_without_queryset():
+    ref_id = ObjectId()
+    doc = Doc.__hydrate__(
+        {'i': 1, 'ref': ref_id, LOOKUPS_KEY: {'ref': {'_id': ref_id}}},
+        read_only=True,
+        lookup_plans={'ref': make_plan({'s'})},
+    )
+
+    assert doc.ref.id == ref_id
+
+    with pytest.raises(NotLoadedError):
+        doc.ref.s
+
+
+def test_lookup__projection_bad_field(qs):
+    with pytest.raises(ValueError):
+        qs.lookup('ref', projections={'s': {'s': 1}})
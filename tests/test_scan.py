@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import pymongo
+import pytest
+from bson import ObjectId
+
+from yadm.documents import Document
+from yadm.scan import get_boundaries, get_ranges
+from yadm import fields
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+
+
+def sum_i(qs):
+    return sum(doc.i for doc in qs)
+
+
+@pytest.fixture
+def qs(db):
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    db.db.testdocs.insert_many([
+        {'_id': ObjectId.from_datetime(start + timedelta(hours=n)), 'i': n}
+        for n in range(250)
+    ])
+    return db(Doc)
+
+
+def test_get_ranges():
+    assert get_ranges([]) == [{}]
+    assert get_ranges([1, 5]) == [
+        {'_id': {'$lt': 1}},
+        {'_id': {'$gte': 1, '$lt': 5}},
+        {'_id': {'$gte': 5}},
+    ]
+
+
+@pytest.mark.parametrize('method', ['sample', 'timestamp'])
+def test_get_boundaries(qs, method):
+    boundaries = get_boundaries(qs, 4, method)
+
+    assert 1 <= len(boundaries) <= 3
+    assert boundaries == sorted(boundaries)
+
+
+def test_get_boundaries__criteria(qs):
+    boundaries = get_boundaries(qs.find({'i': {'$gte': 200}}), 4, 'sample')
+    first = qs.find_one({'i': 200}).id
+
+    assert boundaries
+    assert all(boundary > first for boundary in boundaries)
+
+
+def test_get_boundaries__empty(db):
+    assert get_boundaries(db(Doc), 4, 'sample') == []
+    assert get_boundaries(db(Doc), 4, 'timestamp') == []
+
+
+def test_get_boundaries__bad_method(qs):
+    with pytest.raises(ValueError):
+        get_boundaries(qs, 4, 'bad')
+
+
+@pytest.mark.parametrize('boundaries', ['sample', 'timestamp'])
+def test_parallel_scan(qs, boundaries):
+    docs = list(qs.parallel_scan(4, boundaries=boundaries))
+
+    assert sorted(doc.i for doc in docs) == list(range(250))
+    assert all(isinstance(doc, Doc) for doc in docs)
+
+
+def test_parallel_scan__criteria(qs):
+    docs = list(qs.find({'i': {'$gte': 200}}).parallel_scan(3))
+    assert sorted(doc.i for doc in docs) == list(range(200, 250))
+
+
+def test_parallel_scan__close(qs):
+    docs = qs.parallel_scan(4)
+    next(docs)
+    docs.close()
+
+
+def test_parallel_scan__func(qs):
+    result = qs.parallel_scan(4, func=sum_i, boundaries='timestamp')
+
+    assert len(result) == 4
+    assert sum(result) == sum(range(250))
+
+
+def test_parallel_scan__process(qs, mongo_args):
+    host, port, _ = mongo_args
+    client_factory = partial(pymongo.MongoClient, host, port, tz_aware=True)
+    result = qs.parallel_scan(2, executor='process', func=sum_i,
+                              client_factory=client_factory)
+    assert sum(result) == sum(range(250))
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'executor': 'bad'},
+    {'executor': 'process'},
+    {'executor': 'process', 'func': sum_i},
+    {'boundaries': 'bad'},
+])
+def test_parallel_scan__bad_arguments(qs, kwargs):
+    with pytest.raises(ValueError):
+        qs.parallel_scan(4, **kwargs)
+
+
+def test_parallel_scan__slice(qs):
+    with pytest.raises(ValueError):
+        qs[:10].parallel_scan(4)
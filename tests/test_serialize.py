@@ -4,7 +4,7 @@ from yadm.documents import Document, EmbeddedDocument
 from yadm import fields
 from yadm.exceptions import NotLoadedError
 from yadm.testing import create_fake
-from yadm.serialize import to_mongo, from_mongo
+from yadm.serialize import to_mongo, from_mongo, LOOKUPS_KEY
 
 
 class EDoc(EmbeddedDocument):
@@ -155,3 +155,81 @@ def test_from__smart_null():
 
     assert doc.s == 'string'
     assert doc.i is None
+
+
+def test_from__smart_null_fields():
+    class Doc(Document):
+        i = fields.IntegerField(smart_null=True)
+        s = fields.StringField()
+
+    class InhDoc(Doc):
+        d = fields.DecimalField(smart_null=True)
+
+    assert Doc.__smart_null_fields__ == ('i',)
+    assert set(InhDoc.__smart_null_fields__) == {'i', 'd'}
+
+
+def test_from__without_defaults():
+    class Doc(Document):
+        i = fields.IntegerField(default=13)
+        s = fields.StringField(default='default')
+
+    doc = from_mongo(Doc, {'s': 'string'})
+
+    assert doc.__cache__ == {}
+    assert doc.__new_document__ is False
+    assert doc.__yadm_lookups__ == {}
+    assert not doc.__log__
+    assert doc.s == 'string'
+
+    with pytest.raises(AttributeError):
+        doc.i
+
+
+def test_from__hydrate_embedded():
+    doc = Doc()
+    edoc = EDoc.__hydrate__({'ii': 1}, ['ss'], doc, 'e')
+
+    assert edoc.__parent__ is doc
+    assert edoc.__name__ == 'e'
+    assert edoc.__document__ is doc
+    assert edoc.__not_loaded__ == frozenset({'ss'})
+    assert edoc.ii == 1
+    assert not edoc.__log__
+
+
+def test_from__lookups():
+    raw = {'i': 1, LOOKUPS_KEY: {'ref': {'_id': 1}}}
+    doc = from_mongo(Doc, raw)
+
+    assert LOOKUPS_KEY not in doc.__raw__
+    assert doc.__yadm_lookups__ == {'ref': {'_id': 1}}
+
+
+def test_from__overridden_init():
+    class InitEDoc(EDoc):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.state = 'edoc'
+
+    class InitDoc(Document):
+        i = fields.IntegerField(default=13)
+        e = fields.EmbeddedDocumentField(InitEDoc)
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.state = 'doc'
+
+    class SubInitDoc(InitDoc):
+        pass
+
+    for doc_class in [InitDoc, SubInitDoc]:
+        doc = from_mongo(doc_class, {'e': {'ii': 1}}, ['s'])
+
+        assert doc.state == 'doc'
+        assert doc.__new_document__ is False
+        assert doc.__not_loaded__ == frozenset({'s'})
+        assert 'i' not in doc.__cache__
+        assert doc.e.state == 'edoc'
+        assert doc.e.__parent__ is doc
+        assert doc.e.ii == 1
@@ -5,7 +5,8 @@ from bson import ObjectId
 
 from yadm import fields
 from yadm.documents import Document
-from yadm.log_items import Save, Insert
+from yadm.lazy_bson import LazyBSONDocument
+from yadm.log_items import Save, SaveChanges, Insert
 from yadm.serialize import from_mongo, to_mongo
 from yadm.testing import create_fake
 
@@ -102,6 +103,24 @@ async def test_save(db):
     assert doc.__db__ is db
 
 
+@pytest.mark.asyncio
+async def test_save_changes(db):
+    doc = Doc(i=13, l=[1])
+    await db.save_changes(doc)  # new document is saved
+
+    doc.i = 14
+    doc.l.append(2)
+    await db.save_changes(doc)
+
+    raw = await db.db['testdocs'].find_one()
+    assert raw == {'_id': doc.id, 'i': 14, 'l': [1, 2]}
+    assert doc.__raw__ == raw
+    assert doc.__log__[-1] == SaveChanges(update_data={
+        '$set': {'i': 14},
+        '$push': {'l': {'$each': [2]}},
+    })
+
+
 @pytest.fixture()
 def doc(event_loop, db):
     async def fixture():
@@ -154,6 +173,42 @@ async def test_update_one__empty_query(db, doc):
     assert (await db.db['testdocs'].find_one(doc.id)) == to_mongo(doc)
 
 
+@pytest.mark.asyncio
+async def test_update_one__selective_reload(db, doc):
+    await db.db['testdocs'].update_one({'_id': doc.id}, {'$set': {'b': False}})
+
+    result = await db.update_one(doc, reload_updated=True, set={'i': 88})
+
+    assert result is doc
+    assert doc.i == 88
+    assert doc.b is True
+
+
+@pytest.mark.asyncio
+async def test_update_one__result(db, doc):
+    result = await db.update_one(doc, set={'i': 88})
+
+    assert result.matched_count == result.modified_count == 1
+    assert doc.i == 88
+
+
+@pytest.mark.asyncio
+async def test_session(db, doc):
+    async with db.session() as session:
+        assert db.identity_map is session
+
+        first = await db(Doc).find_one({'i': 13})
+        assert first is not doc  # loaded before session
+        assert len(session) == 1
+
+        await db.db['testdocs'].drop()
+
+        assert (await db.get_document(Doc, doc.id)) is first
+        assert (await db(Doc).find_one(doc.id)) is first
+
+    assert db.identity_map is None
+
+
 @pytest.mark.asyncio
 async def test_delete_one(db):
     col = db.db['testdocs']
@@ -235,6 +290,14 @@ async def test_get_document__projection(db):
         assert 'i' in doc.__not_loaded__
 
 
+@pytest.mark.asyncio
+async def test_get_document__lazy(db):
+    _id = (await db.db['testdocs'].insert_one({'i': 13})).inserted_id
+    doc = await db.get_document(Doc, _id, lazy=True)
+    assert isinstance(doc.__raw__, LazyBSONDocument)
+    assert doc.i == 13
+
+
 @pytest.mark.asyncio
 async def test_get_document__not_found(db):
     doc = await db.get_document(Doc, ObjectId())
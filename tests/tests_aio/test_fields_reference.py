@@ -1,3 +1,5 @@
+import asyncio
+
 from bson import ObjectId
 
 import pytest
@@ -35,6 +37,24 @@ async def test_get(db):
     assert doc.__qs__.cache[(DocRef, ref.id)] is doc.ref
 
 
+@pytest.mark.asyncio
+async def test_get__force_in_session(db):
+    id_ref = (await db.db.testdocs_ref.insert_one({'i': 13})).inserted_id
+    id = (await db.db.testdocs.insert_one({'ref': id_ref})).inserted_id
+
+    async with db.session():
+        doc = await db(Doc).find_one(id)
+        ref = await doc.ref
+        await db.db.testdocs_ref.update_one({'_id': id_ref},
+                                            {'$set': {'i': 26}})
+
+        reloaded = await doc.ref.get(force=True)
+
+        assert reloaded is not ref
+        assert reloaded.i == 26
+        assert (await db.get_document(DocRef, id_ref)) is reloaded
+
+
 @pytest.mark.asyncio
 async def test_get_reference_from_new_instance(db):
     _id = (await db.db.testdocs_ref.insert_one({'i': 13})).inserted_id
@@ -46,3 +66,86 @@ async def test_get_reference_from_new_instance(db):
     await db.insert_one(doc)
 
     assert (await doc.ref).id == _id
+
+
+@pytest.mark.asyncio
+async def test_get_coalesced(db, monkeypatch):
+    ids_ref = (await db.db.testdocs_ref.insert_many(
+        [{'i': n} for n in range(3)])).inserted_ids
+    await db.db.testdocs.insert_many(
+        [{'ref': ids_ref[n % 3]} for n in range(9)])
+    docs = [doc async for doc in db(Doc)]
+
+    queries = []
+    get_queryset = db.get_queryset
+
+    def counted_get_queryset(document_class, **kwargs):
+        queries.append(document_class)
+        return get_queryset(document_class, **kwargs)
+
+    monkeypatch.setattr(db, 'get_queryset', counted_get_queryset)
+    refs = await asyncio.gather(*[doc.ref.get() for doc in docs])
+
+    assert queries == [DocRef]
+    assert [ref.i for ref in refs] == [n % 3 for n in range(9)]
+    assert refs[0] is not refs[3]
+    assert refs[0].id == refs[3].id
+
+
+@pytest.mark.asyncio
+async def test_get_document_coalesced(db):
+    _id = (await db.db.testdocs_ref.insert_one({'i': 13})).inserted_id
+
+    first, second, not_found = await asyncio.gather(
+        db.get_document(DocRef, _id),
+        db.get_document(DocRef, _id),
+        db.get_document(DocRef, ObjectId()),
+    )
+
+    assert first is not second  # raw data is shared, documents are not
+    assert first.i == second.i == 13
+    assert not_found is None
+
+
+@pytest.mark.asyncio
+async def test_get_document_coalesced__sessions(db):
+    _id = (await db.db.testdocs_ref.insert_one({'i': 13})).inserted_id
+
+    async def get_in_session():
+        async with db.session() as session:
+            document = await db.get_document(DocRef, _id)
+            assert session.get(DocRef, _id) is document
+            return session, document
+
+    (first_session, first), (second_session, second) = await asyncio.gather(
+        get_in_session(), get_in_session())
+
+    assert first is not second
+    assert len(first_session) == len(second_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_document_coalesced__cancelled(db):
+    _id = (await db.db.testdocs_ref.insert_one({'i': 13})).inserted_id
+
+    first = asyncio.ensure_future(db.get_document(DocRef, _id))
+    second = asyncio.ensure_future(db.get_document(DocRef, _id))
+    await asyncio.sleep(0)  # both are waiting for loader
+    first.cancel()
+
+    assert (await second).i == 13
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_get_document__default_projection(db):
+    class ProjectedDocRef(DocRef):
+        __default_projection__ = {'i': False}
+
+    _id = (await db.db.testdocs_ref.insert_one({'i': 13})).inserted_id
+    doc = await db.get_document(ProjectedDocRef, _id)
+
+    assert 'i' not in doc.__raw__
+    assert 'i' in doc.__not_loaded__
@@ -46,3 +46,18 @@ async def test_resolve(db):
     assert len(doc.ref) == 2
     assert len(doc.ref.ids) == 2
     assert len(doc.ref._documents) == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_references_lists(db):
+    ids = (await db.db.testrdocs.insert_many(
+        [{'i': n} for n in range(3)])).inserted_ids
+    await db.db.testdocs.insert_many([
+        {'ref': [ids[0], ids[1]]},
+        {'ref': [ids[2], ids[1]]},
+    ])
+
+    docs = await db(Doc).sort(('_id', 1)).resolve_references_lists('ref')
+
+    assert [[r.i for r in doc.ref] for doc in docs] == [[0, 1], [2, 1]]
+    assert docs[0].ref[1] is docs[1].ref[1]
@@ -0,0 +1,72 @@
+import pytest
+
+from yadm.aio.join import AioJoin
+from yadm.documents import Document
+from yadm import fields
+
+
+class DocRef(Document):
+    __collection__ = 'testdocs_ref'
+    i = fields.IntegerField()
+
+
+class DocOther(Document):
+    __collection__ = 'testdocs_other'
+    i = fields.IntegerField()
+
+
+class Doc(Document):
+    __collection__ = 'testdocs'
+    i = fields.IntegerField()
+    ref = fields.ReferenceField(DocRef)
+    other = fields.ReferenceField(DocOther)
+
+
+@pytest.fixture
+def qs(event_loop, db):
+    async def fixture():
+        ids_ref = (await db.db.testdocs_ref.insert_many(
+            [{'i': 1}, {'i': 2}])).inserted_ids
+        id_other = (await db.db.testdocs_other.insert_one(
+            {'i': 3})).inserted_id
+
+        await db.db.testdocs.insert_many([
+            {'i': n, 'ref': ids_ref[n % 2], 'other': id_other}
+            for n in range(10)
+        ])
+
+    event_loop.run_until_complete(fixture())
+    return db(Doc).sort(('i', 1))
+
+
+@pytest.mark.asyncio
+async def test_join(qs):
+    join = await qs.join('ref', 'other')
+
+    assert isinstance(join, AioJoin)
+    assert len(join) == 10
+
+    for doc in join:
+        assert isinstance(doc.__cache__['ref'], DocRef)
+        assert isinstance(doc.__cache__['other'], DocOther)
+        assert (await doc.ref).i == 1 + doc.i % 2
+        assert doc.other.document.i == 3
+
+    assert join[0].__cache__['ref'] is join[2].__cache__['ref']
+
+
+@pytest.mark.asyncio
+async def test_join__projections(qs):
+    join = await qs.join('ref', projections={'ref': {'_id': 1}})
+
+    for doc in join:
+        assert (await doc.ref).__not_loaded__ == frozenset({'i'})
+
+
+@pytest.mark.asyncio
+async def test_join__manual(qs):
+    join = await qs.join()
+    assert all('ref' not in doc.__cache__ for doc in join)
+
+    await join.join('ref')
+    assert all(isinstance(doc.__cache__['ref'], DocRef) for doc in join)
@@ -7,6 +7,7 @@ from bson import ObjectId
 from yadm import fields
 from yadm.documents import Document
 from yadm.queryset import NotFoundError
+from yadm.exceptions import ReadOnlyDocumentError
 
 
 class Doc(Document):
@@ -294,6 +295,77 @@ async def test_bulk(qs):
     assert {d.i for d in bulk.values()} == {6, 7, 8, 9}
 
 
+@pytest.mark.asyncio
+async def test_values(qs):
+    qs = qs.find({'i': {'$gte': 8}}).sort(('i', 1))
+    values = [v async for v in qs.values('i', 's')]
+    assert values == [{'i': 8, 's': 'str(8)'}, {'i': 9, 's': 'str(9)'}]
+
+
+@pytest.mark.asyncio
+async def test_values_list(qs):
+    qs = qs.find({'i': {'$gte': 8}}).sort(('i', 1))
+    assert [v async for v in qs.values_list('i', 's')] == [
+        (8, 'str(8)'),
+        (9, 'str(9)'),
+    ]
+    assert [v async for v in qs.values_list('i', flat=True)] == [8, 9]
+
+
+@pytest.mark.asyncio
+async def test_to_columns(qs):
+    qs = qs.find({'i': {'$gte': 8}}).sort(('i', 1))
+    columns = await qs.to_columns(['i', 's'])
+    assert list(columns['i']) == [8, 9]
+    assert list(columns['s']) == ['str(8)', 'str(9)']
+
+
+@pytest.mark.asyncio
+async def test_read_only(qs):
+    docs = [doc async for doc in qs.read_only()]
+    assert len(docs) == 10
+
+    for doc in docs:
+        assert doc.__read_only__
+        assert doc.__qs__ is None
+
+        with pytest.raises(ReadOnlyDocumentError):
+            doc.i = 13
+
+
+class RefDoc(Document):
+    __collection__ = 'testdocs_ref'
+    i = fields.IntegerField()
+    ref = fields.ReferenceField(Doc)
+
+
+@pytest.mark.asyncio
+async def test_prefetch(qs, db):
+    ids = [doc.id async for doc in qs.sort(('i', 1))]
+    await db.db['testdocs_ref'].insert_many(
+        [{'i': n, 'ref': ids[n % 3]} for n in range(5)])
+
+    qs = db(RefDoc).batch_size(2).prefetch('ref', projections={Doc: {'i': 1}})
+    docs = [doc async for doc in qs]
+    await db.db['testdocs'].drop()
+
+    assert [doc.ref.document.i for doc in docs] == [0, 1, 2, 0, 1]
+    assert [(await doc.ref).i for doc in docs] == [0, 1, 2, 0, 1]
+    assert 's' in docs[0].ref.document.__not_loaded__
+
+
+@pytest.mark.asyncio
+async def test_paginate(qs):
+    page = await qs.paginate(('i', -1), size=4)
+    result = [[doc.i for doc in page]]
+
+    while page.has_next:
+        page = await qs.paginate(('i', -1), after=page.next_token, size=4)
+        result.append([doc.i for doc in page])
+
+    assert result == [[9, 8, 7, 6], [5, 4, 3, 2], [1, 0]]
+
+
 class TestFindIn:
     @pytest.fixture(autouse=True)
     def ids(self, event_loop, qs):
@@ -50,6 +50,7 @@ class AioBulkWriter:
         col = self._db._get_collection(self._document_class,
                                        self._collection_params)
         result = await col.bulk_write(data, ordered=self._ordered)
+        self._db._invalidate_cache(self._document_class)
         self._result = _union_results(self._result, result)
 
     @property
@@ -1,17 +1,29 @@
 import itertools
+import weakref
 
+import bson
 import pymongo
 from bson import ObjectId
 
-from yadm.log_items import Insert, Save, UpdateOne, DeleteOne, Reload
+from yadm.log_items import (
+    Insert,
+    Save,
+    SaveChanges,
+    UpdateOne,
+    DeleteOne,
+    Reload,
+)
 from yadm.database import BaseDatabase
-from yadm.serialize import to_mongo, from_mongo
+from yadm.lazy_bson import get_lazy_codec_options
+from yadm.serialize import to_mongo
+from yadm.changes import build_changes_update, patch_raw
 from yadm.bulk_writer import BATCH_SIZE as BULK_BATCH_SIZE
 from yadm.common import build_update_query
 
 from .queryset import AioQuerySet
 from .aggregation import AioAggregator
 from .bulk_writer import AioBulkWriter
+from .loader import DocumentLoader, get_loader
 
 RPS = pymongo.read_preferences
 
@@ -19,6 +31,17 @@ RPS = pymongo.read_preferences
 class AioDatabase(BaseDatabase):
     aio = True
 
+    def __init__(self, client, name, **kwargs):
+        super().__init__(client, name, **kwargs)
+        self._loaders = weakref.WeakKeyDictionary()
+
+    @property
+    def loader(self):
+        """ Loader of documents for running event loop
+        (see :py:mod:`yadm.aio.loader`).
+        """
+        return get_loader(self)
+
     async def insert_one(self, document, **collection_params):
         document.__db__ = self
         collection = self._get_collection(document.__class__,
@@ -28,6 +51,7 @@ class AioDatabase(BaseDatabase):
 
         document._id = result.inserted_id
         document.__log__.append(Insert(id=result.inserted_id))
+        self._add_to_identity_map(document)
         return result
 
     async def insert_many(self, documents, *, ordered=True, **collection_params):
@@ -82,35 +106,77 @@ class AioDatabase(BaseDatabase):
         )
         document.__raw__ = raw_new
         document.__log__.append(Save(id=document.id))
+        self._invalidate_cache(document.__class__, document.id)
+        return document
+
+    async def save_changes(self, document, **collection_params):
+        update, patches = build_changes_update(document)
+
+        if update is None:
+            return await self.save(document, **collection_params)
+
+        if update:
+            collection = self._get_collection(document, collection_params)
+            await collection.update_one({'_id': document.id}, update)
+            patch_raw(document, patches)
+            self._invalidate_cache(document.__class__, document.id)
+
+        document.__log__.append(SaveChanges(update_data=update))
         return document
 
     async def update_one(self, document, *, reload=True,
+                         reload_updated=False,
                          set=None, unset=None, inc=None,
                          push=None, pull=None,
                          **collection_params):  # TODO: extend
         update_data = build_update_query(set=set, unset=unset, inc=inc,
                                          push=push, pull=pull)
 
-        if update_data:
-            collection = self._get_collection(document, collection_params)
-            result = await collection.update_one(
+        if not update_data:
+            if reload:
+                await self.reload(document, **collection_params)
+
+            return None
+
+        collection = self._get_collection(document, collection_params)
+
+        if reload_updated:
+            fields = self._get_updated_fields(update_data)
+            raw = await collection.find_one_and_update(
                 {'_id': document.id},
                 update_data,
+                projection=dict.fromkeys(fields, True),
+                return_document=pymongo.collection.ReturnDocument.AFTER,
                 upsert=False,
             )
-            document.__log__.append(UpdateOne(update_data=update_data))
         else:
-            result = None
+            result = await collection.update_one(
+                {'_id': document.id},
+                update_data,
+                upsert=False,
+            )
 
-        if reload:
-            await self.reload(document, **collection_params)
+        document.__log__.append(UpdateOne(update_data=update_data))
+        self._invalidate_cache(document.__class__, document.id)
 
-        return result
+        if not reload_updated:
+            if reload:
+                await self.reload(document, **collection_params)
+
+            return result
+
+        elif raw is not None:
+            self._merge_updated(document, fields, raw)
+            return document
+        else:
+            return None
 
     async def delete_one(self, document, **collection_params):
         collection = self._get_collection(document.__class__, collection_params)
         res = await collection.delete_one({'_id': document._id})
         document.__log__.append(DeleteOne())
+        self._discard_from_identity_map(document)
+        self._invalidate_cache(document.__class__, document._id)
         return res
 
     async def reload(self, document, new_instance=False, *,
@@ -120,7 +186,7 @@ class AioDatabase(BaseDatabase):
         collection_params['read_preference'] = read_preference
         qs = self.get_queryset(document.__class__,
                                projection=projection,
-                               **collection_params)
+                               **collection_params).copy(identity_map=False)
 
         if projection is not None:
             new = await qs.find_one(document.id, projection)
@@ -130,8 +196,12 @@ class AioDatabase(BaseDatabase):
         if new_instance:
             return new
         else:
-            document.__raw__.clear()
-            document.__raw__.update(new.__raw__)
+            if isinstance(document.__raw__, dict):
+                document.__raw__.clear()
+                document.__raw__.update(new.__raw__)
+            else:  # lazy raw data is not mutable
+                document.__raw__ = new.__raw__
+
             document.__cache__.clear()
             document.__log__.append(Reload())
             document.__not_loaded__ = new.__not_loaded__
@@ -141,25 +211,56 @@ class AioDatabase(BaseDatabase):
                            projection=None,
                            exc=None,
                            read_preference=RPS.PrimaryPreferred(),
+                           lazy=False,
                            **collection_params):
-        collection_params['read_preference'] = read_preference
-        col = self.db.get_collection(document_class.__collection__,
-                                     **collection_params)
+        document = self._get_document_from_identity_map(
+            document_class, _id, projection)
+        if document is not None:
+            return document
+
+        policy = self._get_cache_policy(document_class, projection,
+                                        collection_params)
+        if policy is not None:
+            document = self._get_cached_document(document_class, _id, policy,
+                                                 lazy)
+            if document is not None:
+                return document
 
         if projection is None:
             projection = document_class.__default_projection__
 
         if projection is not None:
-            raw = await col.find_one({'_id': _id}, projection)
             not_loaded = [k for k, v in projection.items() if not v]
         else:
-            raw = await col.find_one({'_id': _id})
             not_loaded = []
 
+        if (projection is None and not lazy and not collection_params and
+                read_preference == DocumentLoader.read_preference):
+            data = await self.loader.load(document_class, _id)
+
+            if data is not None:
+                raw = bson.decode(data, codec_options=self.db.codec_options)
+            else:
+                raw = None
+
+        else:
+            collection_params['read_preference'] = read_preference
+
+            if lazy:
+                collection_params['codec_options'] = get_lazy_codec_options(
+                    collection_params.get('codec_options',
+                                          self.db.codec_options))
+
+            col = self.db.get_collection(document_class.__collection__,
+                                         **collection_params)
+            raw = await col.find_one({'_id': _id}, projection)
+
         if raw:
-            doc = from_mongo(document_class, raw, not_loaded=not_loaded)
-            doc.__db__ = self
-            return doc
+            if policy is not None:
+                self._set_cached_document(document_class, raw, policy)
+
+            return self._add_to_identity_map(
+                document_class.__hydrate__(raw, not_loaded, db=self))
 
         elif exc is not None:
             raise exc((document_class, _id, collection_params))
@@ -169,6 +270,7 @@ class AioDatabase(BaseDatabase):
     def get_queryset(self, document_class, *,
                      projection=None,
                      cache=None,
+                     cache_size=None,
                      **collection_params):
         if projection is None:
             projection = document_class.__default_projection__
@@ -176,6 +278,7 @@ class AioDatabase(BaseDatabase):
         return AioQuerySet(self, document_class,
                            projection=projection,
                            cache=cache,
+                           cache_size=cache_size,
                            collection_params=collection_params)
 
     async def estimated_document_count(self, document_class,
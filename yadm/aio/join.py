@@ -0,0 +1,33 @@
+import asyncio
+
+from yadm.join import Join
+
+
+class AioJoin(Join):
+    """ Helper for build client-side joins with asyncio.
+
+    Documents are loaded by :py:meth:`yadm.aio.queryset.AioQuerySet.join`,
+    and queries for different joined document classes
+    are sent concurrently.
+    """
+    def __init__(self, qs, documents, cache=None):
+        super().__init__(qs, documents=documents, cache=cache)
+
+    async def join(self, *field_names, projections=None):
+        """ Do manual join.
+        """
+        self._load_names_types_maps(*field_names, projections=projections)
+        self._load_map_name_ids(*field_names)
+        await self._load_objects_to_indexes(*field_names)
+        self._set_objects(*field_names)
+
+    async def _load_objects_to_indexes(self, *field_names):
+        to_load = self._get_ids_to_load(*field_names)
+
+        results = await asyncio.gather(*[
+            self._get_joined_queryset(joined_document_class, ids).bulk()
+            for joined_document_class, ids in to_load.items()
+        ])
+
+        for joined_document_class, found in zip(to_load, results):
+            self._add_to_index(joined_document_class, found)
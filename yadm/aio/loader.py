@@ -0,0 +1,112 @@
+"""
+Coalescing of concurrent lookups of documents by id.
+
+:py:class:`DocumentLoader` collect ids, which are requested
+in the same tick of event loop, and load them with one `$in` query
+per document class:
+
+.. code-block:: python
+
+    docs = await asyncio.gather(*[doc.ref.get() for doc in docs])
+
+It is used by :py:meth:`yadm.fields.reference.Reference.get`
+and :py:meth:`yadm.aio.database.AioDatabase.get_document`
+(without projection, including `__default_projection__`,
+and collection parameters).
+Repeated ids are loaded once. Loader share only BSON bytes of documents,
+and each caller create own document in own context (and add it
+to own identity map, see :py:mod:`yadm.identity_map`).
+"""
+import asyncio
+
+from bson.raw_bson import RawBSONDocument
+from pymongo import read_preferences
+
+
+class DocumentLoader:
+    """ Batch loader of documents for database and event loop.
+
+    :param db: :py:class:`yadm.aio.database.AioDatabase`
+    :param loop: event loop
+    """
+    read_preference = read_preferences.PrimaryPreferred()
+
+    def __init__(self, db, loop):
+        self._db = db
+        self._loop = loop
+        self._pending = {}
+        self._scheduled = False
+        self._tasks = set()  # loop keeps only weak references to tasks
+
+    def __repr__(self):
+        return '{}({!r}, pending={})'.format(
+            self.__class__.__name__, self._db,
+            sum(len(w) for w in self._pending.values()))
+
+    def load(self, document_class, _id):
+        """ Return future for BSON bytes of document with `_id` or `None`.
+
+        Each call get own future, so cancellation of one caller
+        don't affect others.
+        """
+        waiters = self._pending.setdefault(document_class, {})
+        future = self._loop.create_future()
+        waiters.setdefault(_id, []).append(future)
+
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon(self._dispatch)
+
+        return future
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+
+        for document_class, waiters in pending.items():
+            task = self._loop.create_task(self._load(document_class, waiters))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, document_class, waiters):
+        codec_options = self._db.db.codec_options.with_options(
+            document_class=RawBSONDocument)
+        qs = self._db.get_queryset(document_class,
+                                   read_preference=self.read_preference,
+                                   codec_options=codec_options)
+        qs = qs.find({'_id': {'$in': list(waiters)}}).copy(identity_map=False)
+        found = {}
+
+        try:
+            async for raw in qs._cursor:
+                found[raw['_id']] = raw.raw
+
+        except asyncio.CancelledError:
+            for futures in waiters.values():
+                for future in futures:
+                    future.cancel()
+            raise
+
+        except Exception as exc:
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+
+        else:
+            for _id, futures in waiters.items():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(found.get(_id))
+
+
+def get_loader(db):
+    """ Return loader of database for running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    loader = db._loaders.get(loop)
+
+    if loader is None:
+        loader = db._loaders[loop] = DocumentLoader(db, loop)
+
+    return loader
@@ -1,14 +1,52 @@
 from pymongo import ReturnDocument
 from bson import ObjectId
 
+from yadm import paginate as pagination
 from yadm.queryset import BaseQuerySet, NotFoundBehavior, NotFoundError
 from yadm.serialize import to_mongo
 
+from .join import AioJoin
+
 
 class AioQuerySet(BaseQuerySet):
     async def __aiter__(self):
-        async for raw in self._cursor:
-            yield self._from_mongo_one(raw)
+        if self._prefetch is None:
+            async for raw in self._cursor:
+                yield self._from_mongo_one(raw)
+        else:
+            batch_size = self._get_prefetch_batch_size()
+            batch = []
+
+            async for raw in self._cursor:
+                batch.append(self._from_mongo_one(raw))
+
+                if len(batch) >= batch_size:
+                    await self._prefetch_documents(batch)
+                    for document in batch:
+                        yield document
+                    batch = []
+
+            if batch:
+                await self._prefetch_documents(batch)
+                for document in batch:
+                    yield document
+
+    async def _prefetch_documents(self, documents):
+        prefetch = self._prefetch
+        index = {}
+        items = [(documents, prefetch.tree)]
+
+        while items:
+            wanted, links = prefetch.collect(items)
+
+            for document_class, ids in wanted.items():
+                ids = self._get_prefetch_ids(document_class, ids, index)
+                if ids:
+                    qs = prefetch.get_queryset(self, document_class, ids)
+                    async for document in qs:
+                        index[(document_class, document.id)] = document
+
+            items = prefetch.apply(links, index)
 
     async def _get_one(self, index):
         cursor = self._cursor.skip(index).limit(1)
@@ -22,6 +60,10 @@ class AioQuerySet(BaseQuerySet):
         return self._from_mongo_one(raw)
 
     async def find_one(self, criteria=None, projection=None, *, exc=None):
+        document = self._get_from_identity_map(criteria, projection)
+        if document is not None:
+            return document
+
         if isinstance(criteria, ObjectId):
             criteria = {'_id': criteria}
 
@@ -37,24 +79,32 @@ class AioQuerySet(BaseQuerySet):
         return self._from_mongo_one(data, projection=qs._projection)
 
     async def update_one(self, update, *, upsert=False):
-        return await self._collection.update_one(
+        result = await self._collection.update_one(
             self._criteria,
             update,
             upsert=upsert,
         )
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     async def update_many(self, update, *, upsert=False):
-        return await self._collection.update_many(
+        result = await self._collection.update_many(
             self._criteria,
             update,
             upsert=upsert,
         )
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     async def delete_one(self):
-        return await self._collection.delete_one(self._criteria)
+        result = await self._collection.delete_one(self._criteria)
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     async def delete_many(self):
-        return await self._collection.delete_many(self._criteria)
+        result = await self._collection.delete_many(self._criteria)
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     async def find_one_and_update(self, update, *,
                                   upsert=False,
@@ -69,10 +119,13 @@ class AioQuerySet(BaseQuerySet):
             sort=self._sort,
             return_document=return_document,
         )
+        self._db._invalidate_cache(self._document_class)
+
         if data is None:  # pragma: no cover
             return None
 
-        return self._from_mongo_one(data, projection=self._projection)
+        return self._from_mongo_one(data, projection=self._projection,
+                                    identity=False)
 
     async def find_one_and_replace(self, document, *,
                                    return_document=ReturnDocument.BEFORE):
@@ -85,10 +138,13 @@ class AioQuerySet(BaseQuerySet):
             sort=self._sort,
             return_document=return_document,
         )
+        self._db._invalidate_cache(self._document_class)
+
         if data is None:  # pragma: no cover
             return None
 
-        return self._from_mongo_one(data, projection=self._projection)
+        return self._from_mongo_one(data, projection=self._projection,
+                                    identity=False)
 
     async def find_one_and_delete(self):
         """ Find a single document and delete it.
@@ -98,10 +154,13 @@ class AioQuerySet(BaseQuerySet):
             projection=self._projection,
             sort=self._sort,
         )
+        self._db._invalidate_cache(self._document_class)
+
         if data is None:  # pragma: no cover
             return None
 
-        return self._from_mongo_one(data, projection=self._projection)
+        return self._from_mongo_one(data, projection=self._projection,
+                                    identity=False)
 
     async def count_documents(self) -> int:
         kwargs = {}
@@ -120,13 +179,82 @@ class AioQuerySet(BaseQuerySet):
         async for raw in self.copy(projection={'_id': True})._cursor:
             yield raw['_id']
 
+    async def values(self, *fields, convert=False):
+        fields = fields or tuple(self._document_class.__fields__)
+        getters = list(zip(fields, self._get_values_getters(fields, convert)))
+
+        async for raw in self._get_values_cursor(fields):
+            yield {name: get(raw) for name, get in getters}
+
+    async def values_list(self, *fields, flat=False, convert=False):
+        if flat and len(fields) != 1:
+            raise TypeError("flat is allowed only for one field")
+
+        fields = fields or tuple(self._document_class.__fields__)
+        getters = self._get_values_getters(fields, convert)
+
+        if flat:
+            get = getters[0]
+            async for raw in self._get_values_cursor(fields):
+                yield get(raw)
+        else:
+            async for raw in self._get_values_cursor(fields):
+                yield tuple(get(raw) for get in getters)
+
+    async def to_columns(self, fields, dtype_map=None):
+        fields = list(fields)
+        builder = self._get_columns_builder(fields, dtype_map)
+
+        async for raw in self._get_values_cursor(fields):
+            builder.append(raw)
+
+        return builder.build()
+
     async def bulk(self):
         qs = self.copy()
         qs._sort = None
         return {obj.id: obj async for obj in qs}
 
-    async def join(self, *field_names):  # pragma: no cover
-        raise NotImplementedError
+    async def join(self, *field_names, projections=None):
+        """ Create `yadm.aio.join.AioJoin` object, join `field_names`
+        and return it.
+
+        Queries of joined documents for different classes
+        are sent concurrently.
+
+            join = await qs.join('user', 'post')
+            for comment in join:
+                print((await comment.user).name)
+        """
+        join = AioJoin(self, [doc async for doc in self])
+
+        if field_names:
+            await join.join(*field_names, projections=projections)
+
+        return join
+
+    async def paginate(self, sort_key=('_id', 1), after=None,
+                       size=pagination.PAGE_SIZE):
+        """ Return page of documents with keyset pagination.
+
+        See :py:meth:`yadm.queryset.QuerySet.paginate`.
+        """
+        qs, keys = self._get_page_queryset(sort_key, after, size)
+        return pagination.make_page([doc async for doc in qs], keys, size)
+
+    async def resolve_references_lists(self, *field_names,
+                                       not_found=NotFoundBehavior.SKIP,
+                                       chunk_size=None):
+        from yadm.fields.references_list import (
+            aio_resolve_references_lists,
+            CHUNK_SIZE,
+        )
+
+        return await aio_resolve_references_lists(
+            [doc async for doc in self], *field_names,
+            not_found=not_found,
+            chunk_size=chunk_size or CHUNK_SIZE,
+        )
 
     async def find_in(self, comparable, field='_id', *,
                       not_found=NotFoundBehavior.SKIP):
@@ -63,6 +63,7 @@ class BulkWriter:
         col = self._db._get_collection(self._document_class,
                                        self._collection_params)
         result = col.bulk_write(data, ordered=self._ordered)
+        self._db._invalidate_cache(self._document_class)
         self._result = _union_results(self._result, result)
 
     @property
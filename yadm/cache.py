@@ -1,4 +1,30 @@
+"""
+Caches of querysets.
+
+Querysets keep resolved references in cache `{(document class, id): document}`
+(see :py:attr:`yadm.queryset.BaseQuerySet.cache`).
+By default it is :py:class:`LRUCache` with size from database:
+
+.. code-block:: python
+
+    db = Database(client, 'test', cache_size=1000, cache_lock=True)
+    qs = db(Doc, cache_size=10000)
+
+    for doc in qs:
+        print(doc.ref.name)
+
+    print(qs.cache.hits, qs.cache.misses, qs.cache.evictions)
+
+Documents of rarely changed collections can be cached in process
+by :py:class:`CachePolicy` (see :py:attr:`Document.__cache_policy__`).
+"""
 import abc
+from collections import OrderedDict
+from contextlib import nullcontext
+import threading
+import time
+
+CACHE_SIZE = 100
 
 
 class CacheInterface(metaclass=abc.ABCMeta):
@@ -59,3 +85,181 @@ class StackCache(dict):
     def __delitem__(self, key):
         super().__delitem__(key)
         self._stack.remove(key)
+
+
+@CacheInterface.register
+class LRUCache:
+    """ Least recently used cache with O(1) operations.
+
+    :param int size: max count of items
+    :param bool lock: use lock for share cache between threads
+
+    Counters `hits`, `misses` and `evictions` are updated
+    by lookups (`[]` and `get`) and inserts, `in` don't change them.
+    """
+    def __init__(self, size=CACHE_SIZE, *, lock=False):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock() if lock else nullcontext()
+
+    def __repr__(self):
+        return ('{}(size={}, len={}, hits={}, misses={}, evictions={})'
+                ''.format(self.__class__.__name__, self.size, len(self),
+                          self.hits, self.misses, self.evictions))
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                raise
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            data = self._data
+            data[key] = value
+            data.move_to_end(key)
+
+            if len(data) > self.size:
+                data.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._data))
+
+    def get(self, key, default=None):
+        """ Return value for key or `default`.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        """ Remove all items, counters are not reset.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+class CachePolicy:
+    """ Process wide read-through cache for document class.
+
+    :param int max_entries: max count of cached documents
+    :param float ttl: time to live of entries in seconds
+    :param float refresh_ahead: age of entries in seconds,
+        after which entry is read from database again by one reader
+        while other readers get cached data (should be less than `ttl`)
+
+    .. code-block:: python
+
+        class Currency(Document):
+            __collection__ = 'currencies'
+            __cache_policy__ = CachePolicy(max_entries=500, ttl=300,
+                                           refresh_ahead=240)
+
+    `Database.get_document` and resolving of references
+    look up documents in cache by `_id` before querying.
+    Cache keep BSON bytes of documents for client, database and
+    collection, and each lookup create new document (with lazy decoding
+    only for `get_document(..., lazy=True)`, see :py:mod:`yadm.lazy_bson`).
+    Writes through database (`save`, `save_changes`, `update_one`,
+    `delete_one`, writes of querysets and bulk writers) invalidate
+    cached entries. Changes by other processes are visible after `ttl`.
+    """
+    def __init__(self, max_entries=1000, ttl=60, refresh_ahead=None, *,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key: [expires, refresh, value]
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return ('{}(max_entries={}, ttl={}, refresh_ahead={}, len={})'
+                ''.format(self.__class__.__name__, self.max_entries,
+                          self.ttl, self.refresh_ahead, len(self)))
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """ Return cached value or `None` if it must be read from database.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            now = self.clock()
+
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+
+                self.misses += 1
+                return None
+
+            if entry[1] is not None and entry[1] <= now:
+                entry[1] = None  # only one reader refresh the entry
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, value):
+        """ Put value to cache.
+        """
+        with self._lock:
+            now = self.clock()
+
+            if self.refresh_ahead is not None:
+                refresh = now + self.refresh_ahead
+            else:
+                refresh = None
+
+            self._data[key] = [now + self.ttl, refresh, value]
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        """ Remove entry for key.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_prefix(self, prefix):
+        """ Remove entries, which keys are started with `prefix` tuple.
+        """
+        size = len(prefix)
+
+        with self._lock:
+            for key in [k for k in self._data if k[:size] == prefix]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,273 @@
+"""
+Minimal updates for changed documents.
+
+:py:func:`build_changes_update` make MongoDB update query from log
+of document after last synchronization with database:
+
+- assigned fields (embedded too) are `$set` by dotted paths,
+  or `$unset` if they are deleted;
+- lists with appended items only are `$push`-ed with `$each`;
+- containers with other changes are `$set` entirely.
+
+Changes of nested paths are merged into changes of parent paths.
+It used by :py:meth:`yadm.database.Database.save_changes`.
+"""
+from yadm.markers import AttributeNotSet
+
+# operations of log, after which document is equal to database data
+SYNC_OPS = frozenset(['save', 'insert', 'reload', 'save_changes'])
+
+# operations of containers, which are sent to database directly
+DIRECT_OPS = frozenset([
+    'list_push',
+    'list_pull',
+    'map_set',
+    'map_unset',
+    'set_add_to_set',
+    'set_pull',
+    'container_reload',
+    'references_list_resolve',
+])
+
+
+def get_changes(document):
+    """ Return log items after last synchronization with database
+    or `None` if document is never synchronized.
+    """
+    changes = []
+
+    for log_item in reversed(document.__log__):
+        if log_item.op in SYNC_OPS:
+            break
+        changes.append(log_item)
+    else:
+        if document.__new_document__:
+            return None
+
+    changes.reverse()
+    return changes
+
+
+def _get_changed_paths(changes):
+    """ Return set of changed paths and `{path: count}` of appends.
+    """
+    paths = set()
+    appends = {}
+
+    for log_item in changes:
+        if log_item.op == 'set_field':
+            paths.add(log_item.name)
+
+        elif log_item.op == 'change_child':
+            child_item = log_item.log_item
+
+            if child_item.op == 'set_field':
+                paths.add(log_item.path + '.' + child_item.name)
+            elif child_item.op == 'list_append':
+                appends[log_item.path] = appends.get(log_item.path, 0) + 1
+            elif child_item.op not in DIRECT_OPS:
+                paths.add(log_item.path)
+
+    return paths, appends
+
+
+def _prefixes(path):
+    """ Return dotted prefixes of path: 'a.b.c' -> ['a', 'a.b'].
+    """
+    parts = path.split('.')
+    return ['.'.join(parts[:n]) for n in range(1, len(parts))]
+
+
+def _collapse(paths):
+    """ Remove paths, which parents are in paths too.
+    """
+    result = set()
+
+    for path in sorted(paths, key=lambda p: p.count('.')):
+        if not any(prefix in result for prefix in _prefixes(path)):
+            result.add(path)
+
+    return result
+
+
+def _resolve(document, path):
+    """ Return `(parent document, field name)` for dotted path.
+
+    Raise `LookupError` if path is not resolved.
+    """
+    *names, name = path.split('.')
+    obj = document
+
+    for item in names:
+        if hasattr(obj, '__fields__'):
+            obj = getattr(obj, item)
+        else:
+            obj = obj[int(item)]
+
+    if not hasattr(obj, '__fields__') or name not in obj.__fields__:
+        raise LookupError(path)
+
+    return obj, name
+
+
+def _normalize(document, paths):
+    """ Replace not resolved paths by top level fields and collapse paths.
+    """
+    result = set()
+
+    for path in paths:
+        try:
+            _resolve(document, path)
+        except (LookupError, AttributeError, ValueError, TypeError):
+            path = path.split('.')[0]
+
+        result.add(path)
+
+    return _collapse(result)
+
+
+def _get_raw(document, name):
+    """ Return MongoDB value of field or `AttributeNotSet`.
+    """
+    if name in document.__cache__:
+        value = document.__cache__[name]
+    elif name in document.__raw__ or name in document.__not_loaded__:
+        value = getattr(document, name)  # raise NotLoadedError
+    else:
+        return AttributeNotSet
+
+    if value is AttributeNotSet:
+        return AttributeNotSet
+
+    return document.__fields__[name].to_mongo(document, value)
+
+
+def _get_raw_list(raw, path):
+    """ Return list from raw data by dotted path or `None`.
+    """
+    value = raw
+
+    for item in path.split('.'):
+        if isinstance(value, list):
+            try:
+                value = value[int(item)]
+            except (ValueError, IndexError):
+                return None
+        elif item in value:
+            value = value[item]
+        else:
+            return None
+
+    return value if isinstance(value, list) else None
+
+
+def build_changes_update(document):
+    """ Return `(update, patches)` for changes of document.
+
+    `update` is MongoDB update query (empty if nothing is changed)
+    and `patches` is list of `(op, path, value)` for
+    :py:func:`patch_raw`. Return `(None, None)` if document
+    is never synchronized with database.
+    """
+    changes = get_changes(document)
+
+    if changes is None:
+        return None, None
+
+    paths, appends = _get_changed_paths(changes)
+    raw = document.__raw__
+    pushes = {}
+
+    for path, count in appends.items():
+        raw_list = _get_raw_list(raw, path)
+
+        if (raw_list is None or path in paths or
+                any(prefix in paths for prefix in _prefixes(path)) or
+                any(p.startswith(path + '.') for p in paths)):
+            paths.add(path)
+            continue
+
+        try:
+            parent, name = _resolve(document, path)
+        except (LookupError, AttributeError, ValueError, TypeError):
+            paths.add(path)
+            continue
+
+        value = _get_raw(parent, name)
+
+        if (not isinstance(value, list) or
+                len(value) != len(raw_list) + count):
+            paths.add(path)
+        else:
+            pushes[path] = value[len(raw_list):]
+
+    update = {}
+    patches = []
+
+    for path in sorted(_normalize(document, paths)):
+        value = _get_raw(*_resolve(document, path))
+
+        if value is AttributeNotSet:
+            update.setdefault('$unset', {})[path] = True
+            patches.append(('unset', path, None))
+        else:
+            update.setdefault('$set', {})[path] = value
+            patches.append(('set', path, value))
+
+    changed = set(update.get('$set', ())) | set(update.get('$unset', ()))
+
+    for path, values in sorted(pushes.items()):
+        if path in changed or any(p in changed for p in _prefixes(path)):
+            continue
+
+        update.setdefault('$push', {})[path] = {'$each': values}
+        patches.append(('push', path, values))
+
+    return update, patches
+
+
+def patch_raw(document, patches):
+    """ Apply patches from :py:func:`build_changes_update`
+    to raw data of document.
+
+    Lazy raw data is decoded to `dict`. If path is not found
+    in raw data, top level field is serialized entirely.
+    """
+    raw = document.__raw__
+
+    if not isinstance(raw, dict):
+        raw = document.__raw__ = dict(raw)
+
+    for op, path, value in patches:
+        try:
+            _patch_path(raw, op, path, value)
+        except (LookupError, TypeError, ValueError, AttributeError):
+            name = path.split('.')[0]
+            value = _get_raw(document, name)
+
+            if value is AttributeNotSet:
+                raw.pop(name, None)
+            else:
+                raw[name] = value
+
+
+def _patch_path(raw, op, path, value):
+    *names, name = path.split('.')
+    obj = raw
+
+    for item in names:
+        if isinstance(obj, list):
+            obj = obj[int(item)]
+        else:
+            obj = obj.setdefault(item, {})
+
+    if isinstance(obj, list):
+        name = int(name)
+
+    if op == 'set':
+        obj[name] = value
+    elif op == 'unset':
+        if isinstance(obj, dict):
+            obj.pop(name, None)
+    else:
+        obj[name].extend(value)
@@ -0,0 +1,249 @@
+"""
+Columnar export of query results.
+
+:py:meth:`yadm.queryset.QuerySet.to_columns` stream raw data from cursor
+to typed arrays, one array per field, without documents creation:
+
+    columns = db(Doc).find({'active': True}).to_columns(['count', 'price'])
+    columns['count'].sum()
+
+Arrays are :py:mod:`numpy` arrays if NumPy is installed
+(`pip install yadm[numpy]`), or :py:class:`array.array` and lists otherwise.
+
+Columns by fields:
+
+==================  =========================  ==========================
+Field               NumPy dtype                array typecode
+==================  =========================  ==========================
+IntegerField        int64, missed is 0         'q'
+FloatField          float64, missed is NaN     'd'
+BooleanField        bool, missed is False      'b'
+DatetimeField       datetime64[ms], missed     'q' with milliseconds
+                    is NaT                     since epoch
+ObjectIdField,      S12, missed is zero        :py:class:`bytearray`
+ReferenceField      bytes                      with 12 bytes records
+DecimalField        int64 for coefficient and  'q' and 'i'
+                    int32 for `<name>.exp`
+MoneyField          int64 for cents and int32  'q' and 'i'
+                    for `<name>.currency`
+other fields        object, missed is None     :py:class:`list`
+==================  =========================  ==========================
+"""
+import array
+import calendar
+from collections import OrderedDict
+from decimal import Decimal
+
+from bson import Decimal128
+
+from yadm.fields.datetime import DatetimeField
+from yadm.fields.decimal import DecimalField
+from yadm.fields.money import MoneyField
+from yadm.fields.reference import ReferenceField
+from yadm.fields.simple import (
+    ObjectIdField,
+    BooleanField,
+    IntegerField,
+    FloatField,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+DEFAULT_CAPACITY = 1024
+
+NAT = -2 ** 63  # numpy.datetime64('NaT') as int64
+
+# array typecodes for numpy dtype names in `dtype_map` without numpy
+TYPECODES = {
+    'int8': 'b',
+    'uint8': 'B',
+    'int16': 'h',
+    'uint16': 'H',
+    'int32': 'i',
+    'uint32': 'I',
+    'int64': 'q',
+    'uint64': 'Q',
+    'float32': 'f',
+    'float64': 'd',
+    'bool': 'b',
+}
+
+
+class NumpyColumn:
+    """ Preallocated numpy array, which is doubled when it is full.
+    """
+    __slots__ = ('_data', '_size')
+
+    def __init__(self, dtype, capacity):
+        self._data = numpy.empty(capacity, dtype)
+        self._size = 0
+
+    def append(self, value):
+        data = self._data
+        size = self._size
+
+        if size == len(data):
+            data = numpy.empty(size * 2 or DEFAULT_CAPACITY, data.dtype)
+            data[:size] = self._data
+            self._data = data
+
+        data[size] = value
+        self._size = size + 1
+
+    def build(self):
+        if self._size == len(self._data):
+            return self._data
+        else:
+            return self._data[:self._size].copy()
+
+
+class ArrayColumn:
+    """ Column on :py:class:`array.array` or list for objects.
+    """
+    __slots__ = ('_data', 'append')
+
+    def __init__(self, typecode, capacity):
+        self._data = array.array(typecode) if typecode else []
+        self.append = self._data.append
+
+    def build(self):
+        return self._data
+
+
+class BytesColumn:
+    """ Column of fixed size bytes records on :py:class:`bytearray`.
+    """
+    __slots__ = ('_data', 'append')
+
+    def __init__(self, typecode, capacity):
+        self._data = bytearray()
+        self.append = self._data.extend
+
+    def build(self):
+        return self._data
+
+
+def _datetime_to_ms(value):
+    return (calendar.timegm(value.utctimetuple()) * 1000 +
+            value.microsecond // 1000)
+
+
+def _decimal_to_pair(value):
+    if isinstance(value, dict):
+        return value['i'], value['e']
+
+    if isinstance(value, Decimal128):
+        value = value.to_decimal()
+    elif not isinstance(value, Decimal):  # pragma: no cover
+        raise TypeError(value)
+
+    sign, digits, exp = value.as_tuple()
+    integer = int(''.join(map(str, digits)) or 0)
+    return -integer if sign else integer, exp
+
+
+# (dtype, typecode, missed value) of columns,
+# typecode `None` is list and `bytes` is BytesColumn
+_BOOL_COLUMN = ('bool', 'b', False)
+_INT64_COLUMN = ('int64', 'q', 0)
+_INT32_COLUMN = ('int32', 'i', 0)
+_FLOAT_COLUMN = ('float64', 'd', float('nan'))
+_DATETIME_COLUMN = ('datetime64[ms]', 'q', NAT)
+_OBJECTID_COLUMN = ('S12', bytes, bytes(12))
+_OBJECT_COLUMN = ('object', None, None)
+
+_SCALAR_COLUMNS = [
+    (BooleanField, _BOOL_COLUMN, bool),
+    (IntegerField, _INT64_COLUMN, int),
+    (FloatField, _FLOAT_COLUMN, float),
+    (DatetimeField, _DATETIME_COLUMN, _datetime_to_ms),
+    (ObjectIdField, _OBJECTID_COLUMN, lambda value: value.binary),
+    (ReferenceField, _OBJECTID_COLUMN, lambda value: value.binary),
+]
+# int64 column for value and int32 column for `name.suffix`
+_PAIR_COLUMNS = [
+    (DecimalField, '{}.exp', _decimal_to_pair),
+    (MoneyField, '{}.currency', tuple),  # [cents, currency code]
+]
+
+
+def _get_field_columns(name, field):
+    """ Return list of subcolumns specs and converter for field.
+
+    Converter make tuple of values for subcolumns from raw value.
+    """
+    for field_class, second_name, convert in _PAIR_COLUMNS:
+        if isinstance(field, field_class):
+            return ([(name,) + _INT64_COLUMN,
+                     (second_name.format(name),) + _INT32_COLUMN],
+                    convert)
+
+    for field_class, spec, convert in _SCALAR_COLUMNS:
+        if isinstance(field, field_class):
+            return [(name,) + spec], (lambda value: (convert(value),))
+
+    return [(name,) + _OBJECT_COLUMN], (lambda value: (value,))
+
+
+class ColumnsBuilder:
+    """ Fill columns with values of fields from raw data.
+
+    :param list fields: list of `(name, field, get)`, where `field`
+        is field object or `None` and `get` is function
+        for get value from raw data
+    :param dict dtype_map: `{column name: dtype}` for override
+        default column types; numpy dtypes or array typecodes
+        if numpy is not installed
+    :param int capacity: preallocated size of numpy arrays
+    """
+    def __init__(self, fields, dtype_map=None, capacity=None):
+        dtype_map = dtype_map or {}
+        capacity = capacity or DEFAULT_CAPACITY
+        self._fields = []
+        self._columns = OrderedDict()
+
+        for name, field, get in fields:
+            specs, convert = _get_field_columns(name, field)
+            columns = []
+
+            for column_name, dtype, typecode, missed in specs:
+                column = self._make_column(
+                    dtype_map.get(column_name), dtype, typecode, capacity)
+                self._columns[column_name] = column
+                columns.append((column.append, missed))
+
+            self._fields.append((get, convert, columns))
+
+    @staticmethod
+    def _make_column(custom_dtype, dtype, typecode, capacity):
+        if numpy is not None:
+            return NumpyColumn(custom_dtype or dtype, capacity)
+        elif custom_dtype is not None:
+            return ArrayColumn(TYPECODES.get(custom_dtype, custom_dtype),
+                               capacity)
+        elif typecode is bytes:
+            return BytesColumn(typecode, capacity)
+        else:
+            return ArrayColumn(typecode, capacity)
+
+    def append(self, raw):
+        """ Append values from raw data to columns.
+        """
+        for get, convert, columns in self._fields:
+            value = get(raw)
+
+            if value is None:
+                for append, missed in columns:
+                    append(missed)
+            else:
+                for (append, missed), item in zip(columns, convert(value)):
+                    append(item)
+
+    def build(self):
+        """ Return ordered dict `{column name: array}`.
+        """
+        return OrderedDict(
+            (name, column.build()) for name, column in self._columns.items())
@@ -24,14 +24,26 @@ This module for provide work with MongoDB database.
 import itertools
 import warnings
 
+import bson
 import pymongo
 from bson import ObjectId
 
-from yadm.log_items import Insert, Save, UpdateOne, DeleteOne, Reload
+from yadm.log_items import (
+    Insert,
+    Save,
+    SaveChanges,
+    UpdateOne,
+    DeleteOne,
+    Reload,
+)
 from yadm.aggregation import Aggregator
 from yadm.queryset import QuerySet
+from yadm.cache import CACHE_SIZE
+from yadm.identity_map import IdentityMap, get_identity_map
 from yadm.bulk_writer import BulkWriter, BATCH_SIZE as BULK_BATCH_SIZE
-from yadm.serialize import to_mongo, from_mongo
+from yadm.lazy_bson import LazyBSONDocument, get_lazy_codec_options
+from yadm.serialize import to_mongo
+from yadm.changes import build_changes_update, patch_raw
 from yadm.common import build_update_query
 
 
@@ -40,10 +52,16 @@ RPS = pymongo.read_preferences
 
 class BaseDatabase:  # pragma: no cover
     aio = None
+    cache_size = CACHE_SIZE
+    cache_lock = False
 
-    def __init__(self, client, name, **database_params):
+    def __init__(self, client, name, *,
+                 cache_size=CACHE_SIZE, cache_lock=False,
+                 **database_params):
         self.client = client
         self.name = name
+        self.cache_size = cache_size
+        self.cache_lock = cache_lock
         self.database_params = database_params
         self.db = client.get_database(name, **database_params)
 
@@ -53,12 +71,142 @@ class BaseDatabase:  # pragma: no cover
     def __call__(self, document_class, **params):
         return self.get_queryset(document_class, **params)
 
+    def session(self):
+        """ Return new identity map for use as context manager.
+
+        .. code-block:: python
+
+            with db.session():
+                assert db.get_document(Doc, _id) is db(Doc).find_one(_id)
+
+        See :py:mod:`yadm.identity_map`.
+        """
+        return IdentityMap(self)
+
+    @property
+    def identity_map(self):
+        """ Identity map of current session or `None`.
+        """
+        return get_identity_map(self)
+
+    def _get_document_from_identity_map(self, document_class, _id,
+                                        projection):
+        if projection is None:
+            identity_map = get_identity_map(self)
+
+            if identity_map is not None:
+                return identity_map.get(document_class, _id)
+
+        return None
+
+    def _add_to_identity_map(self, document):
+        identity_map = get_identity_map(self)
+
+        if identity_map is not None:
+            return identity_map.add(document)
+        else:
+            return document
+
+    def _discard_from_identity_map(self, document):
+        identity_map = get_identity_map(self)
+
+        if identity_map is not None:
+            identity_map.discard(document.__class__, document.id)
+
+    def _get_cache_policy(self, document_class, projection=None,
+                          collection_params=None):
+        """ Return `__cache_policy__` of document class, if documents
+        can be read from cache with given parameters, or `None`.
+        """
+        policy = getattr(document_class, '__cache_policy__', None)
+
+        if (policy is None or projection is not None or
+                document_class.__default_projection__ is not None or
+                'codec_options' in (collection_params or {})):
+            return None
+
+        return policy
+
+    def _get_cache_key(self, document_class, *ids):
+        """ Return key of document (or prefix of collection without `ids`)
+        in cache of policy.
+
+        Policy is process wide, so key is bound to client and database.
+        """
+        return (id(self.client), self.name, document_class.__collection__,
+                *ids)
+
+    def _get_cached_document(self, document_class, _id, policy, lazy=False):
+        """ Return document from cache of policy or `None`.
+        """
+        data = policy.get(self._get_cache_key(document_class, _id))
+
+        if data is None:
+            return None
+
+        if lazy:
+            raw = LazyBSONDocument(
+                data, get_lazy_codec_options(self.db.codec_options))
+        else:
+            raw = bson.decode(data, codec_options=self.db.codec_options)
+
+        return self._add_to_identity_map(
+            document_class.__hydrate__(raw, None, db=self))
+
+    def _set_cached_document(self, document_class, raw, policy):
+        """ Put BSON bytes of raw data to cache of policy.
+        """
+        if isinstance(raw, LazyBSONDocument):
+            data = raw.raw
+        else:
+            data = bson.encode(raw, codec_options=self.db.codec_options)
+
+        policy.set(self._get_cache_key(document_class, raw['_id']), data)
+
+    def _invalidate_cache(self, document_class, _id=None):
+        """ Invalidate cached document (or all documents of collection)
+        after write.
+        """
+        policy = getattr(document_class, '__cache_policy__', None)
+
+        if policy is not None:
+            if _id is None:
+                policy.invalidate_prefix(self._get_cache_key(document_class))
+            else:
+                policy.invalidate(self._get_cache_key(document_class, _id))
+
     def _get_collection(self, document_class, params=None):
         """ Return pymongo collection for document class.
         """
         return self.db.get_collection(document_class.__collection__,
                                       **(params or {}))
 
+    @staticmethod
+    def _get_updated_fields(update_data):
+        """ Return top level fields, which are changed by update query.
+        """
+        return {path.split('.')[0]
+                for operator in update_data.values()
+                for path in operator}
+
+    @staticmethod
+    def _merge_updated(document, fields, raw):
+        """ Merge updated fields from `raw` to `__raw__` of document
+        and drop cached values of them.
+        """
+        document_raw = document.__raw__
+
+        if not isinstance(document_raw, dict):  # lazy raw data is not mutable
+            document_raw = document.__raw__ = dict(document_raw)
+
+        for name in fields:
+            if name in raw:
+                document_raw[name] = raw[name]
+            else:
+                document_raw.pop(name, None)
+
+            document.__cache__.pop(name, None)
+
     def insert_one(self, document, **collection_params):
         raise NotImplementedError
 
@@ -68,7 +216,10 @@ class BaseDatabase:  # pragma: no cover
     def save(self, document, full=False, upsert=False, **collection_params):
         raise NotImplementedError
 
-    def update_one(self, document, *, reload=True,
+    def save_changes(self, document, **collection_params):
+        raise NotImplementedError
+
+    def update_one(self, document, *, reload=True, reload_updated=False,
                    set=None, unset=None, inc=None,
                    push=None, pull=None,
                    **collection_params):
@@ -85,6 +236,7 @@ class BaseDatabase:  # pragma: no cover
     def get_queryset(self, document_class, *,
                      projection=None,
                      cache=None,
+                     cache_size=None,
                      **collection_params):
         raise NotImplementedError
 
@@ -127,6 +279,7 @@ class Database(BaseDatabase):
 
         document._id = result.inserted_id
         document.__log__.append(Insert(id=result.inserted_id))
+        self._add_to_identity_map(document)
         return result
 
     def insert_many(self, documents, *, ordered=True, **collection_params):
@@ -187,32 +340,93 @@ class Database(BaseDatabase):
         )
         document.__raw__ = raw_new
         document.__log__.append(Save(id=document.id))
+        self._invalidate_cache(document.__class__, document.id)
         return document
 
-    def update_one(self, document, *, reload=True,
+    def save_changes(self, document, **collection_params):
+        """ Save only changes of document.
+
+        Update query with `$set`, `$unset` and `$push` is built
+        from log of document (see :py:mod:`yadm.changes`)
+        and `__raw__` is patched locally, without reading
+        of document from database. Not saved documents
+        are saved with :py:meth:`save`.
+
+        .. code-block:: python
+
+            doc = db.get_document(Order, _id)
+            doc.status = 'paid'
+            doc.items[0].count = 2
+            db.save_changes(doc)  # {'$set': {'status': 'paid', 'items.0.count': 2}}
+        """
+        update, patches = build_changes_update(document)
+
+        if update is None:
+            return self.save(document, **collection_params)
+
+        if update:
+            collection = self._get_collection(document, collection_params)
+            collection.update_one({'_id': document.id}, update)
+            patch_raw(document, patches)
+            self._invalidate_cache(document.__class__, document.id)
+
+        document.__log__.append(SaveChanges(update_data=update))
+        return document
+
+    def update_one(self, document, *, reload=True, reload_updated=False,
                    set=None, unset=None, inc=None,
                    push=None, pull=None,
                    **collection_params):  # TODO: extend
         """ Update one document.
+
+        Result is :py:class:`pymongo.results.UpdateResult` and document
+        is reloaded after update, if `reload` is set.
+        With `reload_updated` the update is sent with `find_one_and_update`,
+        which return only updated top level fields, and they are merged
+        to `__raw__` (see :py:meth:`_merge_updated`). Result is
+        the document or `None`, if it is not found.
         """
         update_data = build_update_query(set=set, unset=unset, inc=inc,
                                          push=push, pull=pull)
 
-        if update_data:
-            collection = self._get_collection(document, collection_params)
-            result = collection.update_one(
+        if not update_data:
+            if reload:
+                self.reload(document, **collection_params)
+
+            return None
+
+        collection = self._get_collection(document, collection_params)
+
+        if reload_updated:
+            fields = self._get_updated_fields(update_data)
+            raw = collection.find_one_and_update(
                 {'_id': document.id},
                 update_data,
+                projection=dict.fromkeys(fields, True),
+                return_document=pymongo.collection.ReturnDocument.AFTER,
                 upsert=False,
             )
-            document.__log__.append(UpdateOne(update_data=update_data))
         else:
-            result = None
+            result = collection.update_one(
+                {'_id': document.id},
+                update_data,
+                upsert=False,
+            )
 
-        if reload:
-            self.reload(document, **collection_params)
+        document.__log__.append(UpdateOne(update_data=update_data))
+        self._invalidate_cache(document.__class__, document.id)
 
-        return result
+        if not reload_updated:
+            if reload:
+                self.reload(document, **collection_params)
+
+            return result
+
+        elif raw is not None:
+            self._merge_updated(document, fields, raw)
+            return document
+        else:
+            return None
 
     def delete_one(self, document, **collection_params):
         """ Remove a single document from database.
@@ -220,6 +434,8 @@ class Database(BaseDatabase):
         collection = self._get_collection(document.__class__, collection_params)
         res = collection.delete_one({'_id': document._id})
         document.__log__.append(DeleteOne())
+        self._discard_from_identity_map(document)
+        self._invalidate_cache(document.__class__, document._id)
         return res
 
     def reload(self, document, new_instance=False, *,
@@ -231,7 +447,7 @@ class Database(BaseDatabase):
         collection_params['read_preference'] = read_preference
         qs = self.get_queryset(document.__class__,
                                projection=projection,
-                               **collection_params)
+                               **collection_params).copy(identity_map=False)
 
         if projection is not None:
             new = qs.find_one(document.id, projection)
@@ -241,8 +457,12 @@ class Database(BaseDatabase):
         if new_instance:
             return new
         else:
-            document.__raw__.clear()
-            document.__raw__.update(new.__raw__)
+            if isinstance(document.__raw__, dict):
+                document.__raw__.clear()
+                document.__raw__.update(new.__raw__)
+            else:  # lazy raw data is not mutable
+                document.__raw__ = new.__raw__
+
             document.__cache__.clear()
             document.__log__.append(Reload())
             document.__not_loaded__ = new.__not_loaded__
@@ -252,12 +472,33 @@ class Database(BaseDatabase):
                      projection=None,
                      exc=None,
                      read_preference=RPS.PrimaryPreferred(),
+                     lazy=False,
                      **collection_params):
         """ Get document for it _id.
 
         Default ReadPreference is PrimaryPreferred.
+        If `lazy` is `True`, fields of document is decoded
+        on first access (see :py:mod:`yadm.lazy_bson`).
         """
+        document = self._get_document_from_identity_map(
+            document_class, _id, projection)
+        if document is not None:
+            return document
+
+        policy = self._get_cache_policy(document_class, projection,
+                                        collection_params)
+        if policy is not None:
+            document = self._get_cached_document(document_class, _id, policy,
+                                                 lazy)
+            if document is not None:
+                return document
+
         collection_params['read_preference'] = read_preference
+
+        if lazy:
+            collection_params['codec_options'] = get_lazy_codec_options(
+                collection_params.get('codec_options', self.db.codec_options))
+
         col = self.db.get_collection(document_class.__collection__,
                                      **collection_params)
 
@@ -272,9 +513,11 @@ class Database(BaseDatabase):
             not_loaded = []
 
         if raw:
-            doc = from_mongo(document_class, raw, not_loaded=not_loaded)
-            doc.__db__ = self
-            return doc
+            if policy is not None:
+                self._set_cached_document(document_class, raw, policy)
+
+            return self._add_to_identity_map(
+                document_class.__hydrate__(raw, not_loaded, db=self))
 
         elif exc is not None:
             raise exc((document_class, _id, collection_params))
@@ -284,6 +527,7 @@ class Database(BaseDatabase):
     def get_queryset(self, document_class, *,
                      projection=None,
                      cache=None,
+                     cache_size=None,
                      **collection_params):
         """ Return queryset for document class.
 
@@ -296,6 +540,7 @@ class Database(BaseDatabase):
         return QuerySet(self, document_class,
                         projection=projection,
                         cache=cache,
+                        cache_size=cache_size,
                         collection_params=collection_params)
 
     def estimated_document_count(self, document_class,
@@ -1,6 +1,76 @@
+import functools
+
+from yadm.exceptions import ReadOnlyDocumentError
 from yadm.log_items import BaseLog, ChangeChild
 
 
+def writable(method):
+    """ Decorator for methods, which change document items.
+
+    Raise :py:exc:`yadm.exceptions.ReadOnlyDocumentError`
+    if root document is read only.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.__read_only__:
+            raise ReadOnlyDocumentError(self.__document__)
+
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class TreeLink:
+    """ Descriptor for `__parent__` and `__name__` of document items.
+
+    Value is stored in `slot`. Change of value drops cached root
+    and path of item and of its descendants (see :py:func:`drop_path_cache`),
+    so other items of tree keep their caches.
+    """
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return getattr(instance, self.slot, None)
+
+    def __set__(self, instance, value):
+        old = getattr(instance, self.slot, None)
+
+        if old is value or (type(value) in (str, int) and old == value):
+            setattr(instance, self.slot, value)
+            return
+
+        drop_path_cache(instance)
+        setattr(instance, self.slot, value)
+
+
+def drop_path_cache(item):
+    """ Drop cached root and path of item and of its descendants.
+
+    Items register in parent on caching of path, so only cached part
+    of subtree is visited.
+    """
+    if getattr(item, '_yadm_path_cache', None) is None:
+        return
+
+    children = getattr(item.__parent__, '_yadm_path_children', None)
+    if children:
+        children.pop(id(item), None)
+
+    items = [item]
+    while items:
+        item = items.pop()
+        item._yadm_path_cache = None
+        children = getattr(item, '_yadm_path_children', None)
+
+        if children:
+            items.extend(children.values())
+            item._yadm_path_children = None
+
+
 class ItemLog(BaseLog):
     def __init__(self, document_item):
         super().__init__()
@@ -9,12 +79,14 @@ class ItemLog(BaseLog):
     def append(self, log_item):
         self.items.append(log_item)
 
-        root = self.document_item.__document__
+        item = self.document_item
+        root, path = item._get_path_cache()
+
         if root is not None:
-            self.document_item.__document__.__log__.append(
+            root.__log__.append(
                 ChangeChild(
-                    path=self.document_item.__field_name__,
-                    name=self.document_item.__name__,
+                    path=path,
+                    name=item.__name__,
                     log_item=log_item,
                 ),
             )
@@ -24,8 +96,9 @@ class DocumentItemMixin:
     """ Mixin for custom all fields values, such as EmbeddedDocument,
         yadm.fields.containers.Container.
     """
-    __parent__ = None
-    __name__ = None
+    __slots__ = ()
+    __parent__ = TreeLink('_yadm_parent')
+    __name__ = TreeLink('_yadm_name')
     __qs__ = None
     __log__ = None
 
@@ -33,6 +106,39 @@ class DocumentItemMixin:
         self.__log__ = ItemLog(self)
         super().__init__(*args, **kwargs)
 
+    def _get_path_cache(self):
+        """ Return `(root, dotted path)`.
+
+        It is cached until item or any of its ancestors is moved.
+        """
+        cache = getattr(self, '_yadm_path_cache', None)
+        if cache is not None:
+            return cache
+
+        parent = self.__parent__
+
+        if isinstance(parent, DocumentItemMixin):
+            root, path = parent._get_path_cache()
+            if root is None:
+                root = parent
+
+            name = str(self.__name__)
+            path = path + '.' + name if path else name
+
+            children = getattr(parent, '_yadm_path_children', None)
+            if children is None:
+                children = parent._yadm_path_children = {}
+
+            children[id(self)] = self
+
+        elif parent is None:
+            root, path = None, ''
+        else:
+            root, path = parent, str(self.__name__)
+
+        cache = self._yadm_path_cache = (root, path)
+        return cache
+
     @property
     def __document__(self):
         """ Root document.
@@ -41,15 +147,17 @@ class DocumentItemMixin:
 
                 assert doc.f.l[0].__document__ is doc
         """
-        obj = self
-
-        while getattr(obj, '__parent__', None) is not None:
-            obj = obj.__parent__
+        return self._get_path_cache()[0]
 
-        if obj is not self:
-            return obj
+    @property
+    def __read_only__(self):
+        """ Root document is read only.
+        """
+        document = self.__document__
+        if document is not None:
+            return document.__read_only__
         else:
-            return None
+            return False
 
     @property
     def __db__(self):
@@ -108,7 +216,7 @@ class DocumentItemMixin:
 
             assert doc.f.l[0].__field_name__ == 'f.l.0'
         """
-        return '.'.join(reversed([str(i) for i in self.__path_names__]))
+        return self._get_path_cache()[1]
 
     def __get_value__(self, document):
         """ Get value from document with path to self.
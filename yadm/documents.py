@@ -10,25 +10,167 @@ Basic documents classes for build models.
 
 
 All fields placed in :py:mod:`yadm.fields` package.
+
+Documents with compact layout store the state in slots instead `__dict__`.
+Log and lookups are allocated only when they are needed:
+
+    class Ticket(Document):
+        __collection__ = 'tickets'
+        __compact__ = True
+
+        number = fields.IntegerField()
+
+Compact documents can't have attributes, which is not declared in class,
+and can be inherited only from compact documents.
+
+Assignment of field value don't decode old value from MongoDB data,
+so assignment of containers and embedded documents (and other values,
+which is not decoded yet) is marked as change even if value is equal.
+Set `__compare_on_set__ = True` for decode and compare old values
+and skip equal assignments:
+
+    class Order(Document):
+        __collection__ = 'orders'
+        __compare_on_set__ = True
+
+Documents of small and rarely changed collections can be cached
+in process with `__cache_policy__` (see :py:class:`yadm.cache.CachePolicy`):
+
+    class Currency(Document):
+        __collection__ = 'currencies'
+        __cache_policy__ = CachePolicy(max_entries=500, ttl=300)
 """
-from typing import Union, Optional, Any, Generator, Dict
+from types import MappingProxyType
+from typing import Union, Optional, Any, Generator, Dict, Mapping
 
 from bson import ObjectId
 from faker import Faker
 
 from yadm.fields.base import Field
 from yadm.fields.simple import ObjectIdField
-from yadm.document_item import DocumentItemMixin
-from yadm.log_items import BaseLog
+from yadm.document_item import DocumentItemMixin, ItemLog, TreeLink
+from yadm.log_items import BaseLog, ReadOnlyLog
+from yadm.projection import ProjectionPlan, EMPTY_PLAN, make_plan
+
+
+LOOKUPS_KEY = '__yadm_lookups__'
+READ_ONLY_LOG = ReadOnlyLog()
 
 
 class DocumentLog(BaseLog):
     pass
 
 
+def _set_smart_null(document, names):
+    """ Set `None` for smart_null fields, which not exists in raw data.
+    """
+    raw = document.__raw__
+    not_loaded = document.__not_loaded__
+    cache = document.__cache__
+
+    for name in names:
+        if name not in raw and name not in not_loaded:
+            cache[name] = None
+
+
+def _get_new(cls):
+    """ Return function, which create empty document for hydration.
+
+    Document is created without `__init__`, but if class
+    (or user base class) override `__init__`, it is called
+    with `__new_document__=False` for set state of instance.
+    """
+    init_class = next(c for c in cls.__mro__ if '__init__' in vars(c))
+
+    if init_class.__module__ != __name__:
+        return lambda: cls(__new_document__=False)
+
+    new = object.__new__
+
+    def create():
+        document = new(cls)
+        document.__cache__ = {}
+        return document
+
+    return create
+
+
+def _hydrate(document, raw, not_loaded, parent, name, smart_null):
+    """ Set state, which is common for all hydrated documents.
+    """
+    document.__raw__ = raw
+    document.__not_loaded__ = make_plan(not_loaded)
+
+    if smart_null:
+        _set_smart_null(document, smart_null)
+
+    if parent is not None:
+        document.__parent__ = parent
+        document.__name__ = name
+
+
+class CompactAttribute:
+    """ Descriptor for state of documents with compact layout.
+
+    Value is stored in slot. If slot is empty, value is created
+    by `factory` or `default` is returned.
+    """
+    def __init__(self, slot, default=None, factory=None):
+        self.slot = slot
+        self.default = default
+        self.factory = factory
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            if self.factory is None:
+                return self.default
+
+            value = self.factory(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)
+
+
 class MetaDocument(type):
     """ Metaclass for documents.
     """
+    def __new__(mcs, name: str, bases: tuple, cls_dict: dict):  # noqa
+        compact_bases = [b for b in bases if getattr(b, '__compact__', False)]
+        compact = cls_dict.get('__compact__', bool(compact_bases))
+
+        if compact and '__slots__' not in cls_dict:
+            for base in bases:
+                if base.__dictoffset__:
+                    raise TypeError("compact document {} can't be inherited"
+                                    " from {}".format(name, base.__name__))
+
+            if compact_bases:
+                cls_dict['__slots__'] = ()
+            else:
+                layout = {}
+                for base in reversed(bases):
+                    for klass in reversed(base.__mro__):
+                        layout.update(getattr(klass, '__compact_layout__', {}))
+
+                slots = []
+                for attr, descriptor in layout.items():
+                    if descriptor is None:
+                        slots.append(attr)
+                    else:
+                        slots.append(descriptor.slot)
+                        cls_dict[attr] = descriptor
+
+                cls_dict['__slots__'] = tuple(slots)
+
+        return super().__new__(mcs, name, bases, cls_dict)
+
     def __init__(cls, name: str, bases: tuple, cls_dict: dict):  # noqa
         cls.__fields__ = {}
 
@@ -45,18 +187,34 @@ class MetaDocument(type):
 
             if isinstance(field, Field):
                 field.contribute_to_class(cls, attr)
-            else:
+            elif cls.__dict__.get(attr) is not field:
                 setattr(cls, attr, field)
 
         super().__init__(name, bases, cls_dict)
 
+        cls.__smart_null_fields__ = tuple(
+            n for n, f in cls.__fields__.items() if f.smart_null)
+        cls.__hydrate__ = cls.__build_hydrator__()
+
 
 class BaseDocument(metaclass=MetaDocument):
     """ Base class for all documents.
     """
+    __slots__ = ()
+    __compact__: bool = False
+    __compact_layout__ = {
+        '__raw__': None,
+        '__cache__': None,
+        '__not_loaded__': CompactAttribute('_yadm_not_loaded',
+                                           default=EMPTY_PLAN),
+    }
+
     __raw__: dict
     __cache__: dict
-    __not_loaded__: frozenset = frozenset()
+    __not_loaded__: ProjectionPlan = EMPTY_PLAN
+    __read_only__: bool = False
+    __compare_on_set__: bool = False
+    __smart_null_fields__: tuple = ()
 
     def __init__(self,
                  *args,
@@ -87,6 +245,29 @@ class BaseDocument(metaclass=MetaDocument):
             elif __new_document__:  # default values for new objects
                 self.__cache__[key] = field.get_default(self)
 
+    @classmethod
+    def __build_hydrator__(cls):
+        """ Build function for create documents from MongoDB data.
+
+        It called by metaclass once for each class and saved
+        to `__hydrate__` attribute. Result function bypass `__init__`
+        (if it is not overridden), so it not fill default values.
+
+        .. code-block:: python
+
+            doc = Doc.__hydrate__(raw, not_loaded, parent, name)
+        """
+        new = _get_new(cls)
+        smart_null = cls.__smart_null_fields__
+
+        def hydrate(raw, not_loaded=None, parent=None, name=None,
+                    db=None, qs=None, read_only=False):
+            document = new()
+            _hydrate(document, raw, not_loaded, parent, name, smart_null)
+            return document
+
+        return hydrate
+
     def __str__(self) -> str:
         return repr(self)
 
@@ -123,14 +304,30 @@ class BaseDocument(metaclass=MetaDocument):
 class Document(BaseDocument):
     """ Class for build first level documents.
     """
+    __slots__ = ()
+    __compact_layout__ = {
+        '__db__': None,
+        '__new_document__': None,
+        '__qs__': CompactAttribute('_yadm_qs'),
+        '__log__': CompactAttribute('_yadm_log',
+                                    factory=lambda d: DocumentLog()),
+        '__yadm_lookups__': CompactAttribute('_yadm_lookups',
+                                             default=MappingProxyType({})),
+        '__yadm_lookup_plans__': CompactAttribute(
+            '_yadm_lookup_plans', default=MappingProxyType({})),
+        '__read_only__': CompactAttribute('_yadm_read_only', default=False),
+    }
+
     __collection__: str
     __default_projection__: Optional[Dict[str, Any]] = None
+    __cache_policy__: Optional['yadm.cache.CachePolicy'] = None
     __new_document__: bool = True
     __log__: DocumentLog
     __db__: 'yadm.database.BaseDatabase'
     __qs__: 'QuerySet' = None
 
     __yadm_lookups__: dict
+    __yadm_lookup_plans__: Mapping = MappingProxyType({})
 
     _id = ObjectIdField()
 
@@ -145,6 +342,43 @@ class Document(BaseDocument):
         self.__log__ = DocumentLog()
         super().__init__(*args, __new_document__=__new_document__, **kwargs)
 
+    @classmethod
+    def __build_hydrator__(cls):
+        new = _get_new(cls)
+        smart_null = cls.__smart_null_fields__
+        compact = cls.__compact__
+
+        def hydrate(raw, not_loaded=None, parent=None, name=None,
+                    db=None, qs=None, read_only=False, lookup_plans=None):
+            document = new()
+            document.__db__ = db
+            document.__new_document__ = False
+
+            if read_only:
+                document.__read_only__ = True
+                document.__log__ = READ_ONLY_LOG
+            elif not compact:
+                document.__log__ = DocumentLog()
+
+            if LOOKUPS_KEY in raw:
+                if isinstance(raw, dict):
+                    document.__yadm_lookups__ = raw.pop(LOOKUPS_KEY)
+                else:  # lazy raw data is not mutable
+                    document.__yadm_lookups__ = raw[LOOKUPS_KEY]
+            elif not compact:
+                document.__yadm_lookups__ = {}
+
+            if lookup_plans:
+                document.__yadm_lookup_plans__ = lookup_plans
+
+            if qs is not None and not read_only:
+                document.__qs__ = qs
+
+            _hydrate(document, raw, not_loaded, parent, name, smart_null)
+            return document
+
+        return hydrate
+
     def __repr__(self) -> str:
         _id = getattr(self, '_id', '<new>')
         return '{}({})'.format(self.__class__.__name__, _id)
@@ -176,6 +410,15 @@ class Document(BaseDocument):
 class EmbeddedDocument(DocumentItemMixin, BaseDocument):
     """ Class for build embedded documents.
     """
+    __slots__ = ()
+    __compact_layout__ = {
+        '__parent__': TreeLink('_yadm_parent'),
+        '__name__': TreeLink('_yadm_name'),
+        '_yadm_path_cache': None,
+        '_yadm_path_children': None,
+        '__log__': CompactAttribute('_yadm_log', factory=ItemLog),
+    }
+
     def __init__(self,
                  *args,
                  __parent__: Union[BaseDocument, DocumentItemMixin, None] = None,
@@ -185,6 +428,26 @@ class EmbeddedDocument(DocumentItemMixin, BaseDocument):
         self.__name__ = __name__
         super().__init__(*args, **kwargs)
 
+    @classmethod
+    def __build_hydrator__(cls):
+        new = _get_new(cls)
+        smart_null = cls.__smart_null_fields__
+        compact = cls.__compact__
+
+        def hydrate(raw, not_loaded=None, parent=None, name=None,
+                    db=None, qs=None, read_only=False):
+            document = new()
+
+            if read_only or (parent is not None and parent.__read_only__):
+                document.__log__ = READ_ONLY_LOG
+            elif not compact:
+                document.__log__ = ItemLog(document)
+
+            _hydrate(document, raw, not_loaded, parent, name, smart_null)
+            return document
+
+        return hydrate
+
     @property
     def __new_document__(self) -> bool:  # pragma: no cover
         return self.__document__.__new_document__
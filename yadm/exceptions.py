@@ -15,3 +15,20 @@ class NotLoadedError(Exception):
         super().__init__(field, document)
         self.field = field
         self.document = document
+
+
+class ReadOnlyDocumentError(AttributeError):
+    """ Raise if document from read only queryset is changed.
+
+    .. code:: python
+
+        doc = db(Doc).read_only().find_one()
+        try:
+            doc.a = 1
+        except ReadOnlyDocumentError as exc:
+            print("Raised!")
+            assert exc.document is doc
+    """
+    def __init__(self, document):
+        super().__init__("{!r} is read only".format(document), document)
+        self.document = document
@@ -3,7 +3,7 @@ Base classes for build database fields.
 """
 import functools
 
-from yadm.exceptions import NotLoadedError
+from yadm.exceptions import NotLoadedError, ReadOnlyDocumentError
 from yadm.markers import AttributeNotSet
 from yadm.document_item import DocumentItemMixin
 from yadm.log_items import SetField, ChangeChild
@@ -104,54 +104,74 @@ class FieldDescriptor:
 
         1. Call Field.prepare_value for cast value;
         2. Save in Document.__cache__;
+        3. Mark field as changed in log.
+
+        Assignment of value, which is equal to current, is not marked
+        as change. But old value is not decoded from `__raw__` for this
+        check (except fields with identity conversion) and containers
+        and embedded documents are not compared, so assignment of them
+        is always marked as change.
+        Documents with `__compare_on_set__ = True` decode and compare
+        old values of all fields.
+
+        Raise ReadOnlyDocumentError for read only documents.
         """
-        if not isinstance(instance, type):
+        if instance.__read_only__:
+            raise ReadOnlyDocumentError(instance)
+
+        elif not isinstance(instance, type):
             value = self.field.prepare_value(instance, value)
 
-            name = self.name
+            if value is AttributeNotSet or not self._is_equal(instance, value):
+                instance.__cache__[self.name] = value
+                self._log_set(instance, value)
 
-            if value is AttributeNotSet:
-                instance.__cache__[name] = AttributeNotSet
-                set_field_log_item = SetField(name=self.name, value=value)
-                instance.__log__.append(set_field_log_item)
+        else:
+            raise TypeError("can't set field directly")  # pragma: no cover
+
+    def _is_equal(self, instance, value):
+        """ Check, that value is equal to current value.
+        """
+        name = self.name
+        cache = instance.__cache__
+        raw = instance.__raw__
+
+        if instance.__compare_on_set__:
+            if name in cache:
+                return value == cache[name]
+            elif name in raw:
+                return value == getattr(instance, name)
+            else:
+                return False
 
-                if isinstance(instance, DocumentItemMixin):
-                    root = instance.__document__
-                    if root is not None:
-                        root.__log__.append(
-                            ChangeChild(
-                                path=instance.__field_name__,
-                                name=self.name,
-                                log_item=set_field_log_item,
-                            ),
-                        )
+        elif name in cache:
+            value_old = cache[name]
 
+            if isinstance(value_old, DocumentItemMixin):
+                return value is value_old
             else:
-                if name in instance.__cache__:
-                    value_old = instance.__cache__[name]
-                elif name in instance.__raw__:
-                    value_old = getattr(instance, name)
-                else:
-                    value_old = AttributeNotSet
-
-                if value != value_old:
-                    instance.__cache__[name] = value
-                    set_field_log_item = SetField(name=self.name, value=value)
-                    instance.__log__.append(set_field_log_item)
-
-                    if isinstance(instance, DocumentItemMixin):
-                        root = instance.__document__
-                        if root is not None:
-                            root.__log__.append(
-                                ChangeChild(
-                                    path=instance.__field_name__,
-                                    name=self.name,
-                                    log_item=set_field_log_item,
-                                ),
-                            )
+                return value == value_old
+
+        elif self.field.identity_conversion and name in raw:
+            return value == raw[name]
 
         else:
-            raise TypeError("can't set field directly")  # pragma: no cover
+            return False
+
+    def _log_set(self, instance, value):
+        set_field_log_item = SetField(name=self.name, value=value)
+        instance.__log__.append(set_field_log_item)
+
+        if isinstance(instance, DocumentItemMixin):
+            root = instance.__document__
+            if root is not None:
+                root.__log__.append(
+                    ChangeChild(
+                        path=instance.__field_name__,
+                        name=self.name,
+                        log_item=set_field_log_item,
+                    ),
+                )
 
     def __delete__(self, instance):
         """ Mark document's key as not set.
@@ -160,6 +180,51 @@ class FieldDescriptor:
             setattr(instance, self.name, AttributeNotSet)
 
 
+class IdentityFieldDescriptor(FieldDescriptor):
+    """ Descriptor for fields with the same values in MongoDB and python.
+
+    Values are read from `__raw__` without `from_mongo` and
+    without copying to `__cache__`. Values of other types
+    (`int` for :py:class:`FloatField`, for example) are converted
+    with `from_mongo` on each access. Lazy raw data (see
+    :py:mod:`yadm.lazy_bson`) is cached as usual.
+    Setting of values is not changed.
+    """
+    def __init__(self, name, field):
+        super().__init__(name, field)
+        self.type = field.type
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.field
+
+        name = self.name
+        raw = instance.__raw__
+
+        if name not in instance.__cache__ and type(raw) is dict:
+            value = raw.get(name, AttributeNotSet)
+
+            if type(value) is self.type or value is None:
+                return value
+            elif value is not AttributeNotSet:
+                return self.field.from_mongo(instance, value)
+
+        return super().__get__(instance, owner)
+
+
+def _has_identity_conversion(field_class):
+    """ Return `identity_conversion` of field class, if `from_mongo`
+    is not overridden in subclasses of class, which set it.
+    """
+    for klass in field_class.__mro__:
+        if 'identity_conversion' in vars(klass):
+            return klass.identity_conversion
+        elif 'from_mongo' in vars(klass):
+            return False
+
+    return False
+
+
 class Field:
     """ Base field for all database fields.
 
@@ -174,6 +239,13 @@ class Field:
 
         Class of desctiptor for work with field
 
+    .. py:attribute:: identity_conversion
+
+        `from_mongo` not change values of field `type`,
+        so :py:class:`IdentityFieldDescriptor` is used
+        instead :py:class:`FieldDescriptor`;
+        it is ignored for subclasses, which override `from_mongo`
+
     .. py:attribute:: document_class
 
         Class of document.
@@ -185,6 +257,7 @@ class Field:
         Set in :py:meth:`contribute_to_class`.
     """
     descriptor_class = FieldDescriptor
+    identity_conversion = False
     smart_null = False
     document_class = None
     name = None
@@ -205,7 +278,15 @@ class Field:
         self.name = name
         self.document_class = document_class
         self.document_class.__fields__[name] = self
-        setattr(document_class, name, self.descriptor_class(name, self))
+
+        self.identity_conversion = _has_identity_conversion(type(self))
+
+        descriptor_class = self.descriptor_class
+        if (self.identity_conversion and
+                descriptor_class is FieldDescriptor):
+            descriptor_class = IdentityFieldDescriptor
+
+        setattr(document_class, name, descriptor_class(name, self))
 
     def copy(self):  # pragma: no cover
         """ Return copy of field.
@@ -5,8 +5,9 @@ from typing import NamedTuple, Any
 
 from yadm.markers import AttributeNotSet
 from yadm.fields.base import Field
-from yadm.documents import DocumentItemMixin
+from yadm.document_item import DocumentItemMixin, writable
 from yadm.log_items import ChangeChild
+from yadm.projection import EMPTY_PLAN
 
 
 class ContainerSetItem(NamedTuple):
@@ -35,6 +36,13 @@ class Container(DocumentItemMixin):
         self._item_field = field.item_field
         self._data = value
 
+    @property
+    def __not_loaded__(self):
+        """ Projection plan for items.
+        """
+        plan = getattr(self.__parent__, '__not_loaded__', EMPTY_PLAN)
+        return plan.child(self.__name__)
+
     def __iter__(self):
         return iter(self._data)
 
@@ -44,10 +52,12 @@ class Container(DocumentItemMixin):
     def __getitem__(self, item):
         return self._data[item]
 
+    @writable
     def __setitem__(self, item, value):
         self._data[item] = self._prepare_item(item, value)
         self.__log__.append(ContainerSetItem(item=item, value=value))
 
+    @writable
     def __delitem__(self, item):
         del self._data[item]
         self.__log__.append(ContainerDelitem(item=item))
@@ -21,7 +21,8 @@ from yadm.common import EnclosedDocDescriptor
 from yadm.documents import EmbeddedDocument
 from yadm.markers import AttributeNotSet
 from yadm.fields.base import Field, pass_null
-from yadm.serialize import to_mongo, from_mongo
+from yadm.projection import EMPTY_PLAN
+from yadm.serialize import to_mongo
 from yadm.testing import create_fake
 from yadm.aio.testing import aio_create_fake
 
@@ -54,18 +55,14 @@ class BaseEmbeddedDocumentField(Field):
     @pass_null
     def from_mongo(self, document, value):
         ed_class = self.get_embedded_document_class(document, value)
-        not_loaded = set()
+        not_loaded = getattr(document, '__not_loaded__', EMPTY_PLAN)
 
-        if getattr(document, '__not_loaded__', None):
-            _sw = self.name + '.'
-            for field_name in document.__not_loaded__:
-                if field_name.startswith(_sw):
-                    not_loaded.add(field_name[len(_sw):])
+        # item fields of containers have not name
+        # and items use plan of container
+        if not_loaded and self.name is not None:
+            not_loaded = not_loaded.child(self.name)
 
-        return from_mongo(ed_class, value,
-                          not_loaded=not_loaded,
-                          parent=document,
-                          name=self.name)
+        return ed_class.__hydrate__(value, not_loaded, document, self.name)
 
 
 class EmbeddedDocumentField(BaseEmbeddedDocumentField):
@@ -97,7 +94,12 @@ class EmbeddedDocumentField(BaseEmbeddedDocumentField):
         if self.auto_create:
             ed_class = self.get_embedded_document_class(document)
             ed = ed_class(__parent__=document, __name__=self.name)
-            setattr(document, self.name, ed)
+
+            if document.__read_only__:
+                document.__cache__[self.name] = ed
+            else:
+                setattr(document, self.name, ed)
+
             return ed
         else:
             return super().get_if_attribute_not_set(document)
@@ -37,6 +37,7 @@ List of objects.
 from collections import abc
 from typing import NamedTuple, Any
 
+from yadm.document_item import DocumentItemMixin, writable
 from yadm.fields.base import pass_null
 from yadm.fields.containers import (
     Container,
@@ -73,14 +74,31 @@ class ListPull(NamedTuple):
 class List(Container, abc.MutableSequence):
     """ Container for list.
     """
+    def _renumber(self, start=0):
+        """ Update names of items, which are moved in list.
+        """
+        data = self._data
+
+        for index in range(max(start, 0), len(data)):
+            item = data[index]
+            if isinstance(item, DocumentItemMixin) and item.__name__ != index:
+                item.__name__ = index
+
+    def __delitem__(self, item):
+        super().__delitem__(item)
+        self._renumber(item.start or 0 if isinstance(item, slice) else item)
+
+    @writable
     def insert(self, index, item):
         """ Append item to list.
 
         This method does not save object!
         """
         self._data.insert(index, self._prepare_item(index, item))
+        self._renumber(index)
         self.__log__.append(ListInsert(index=index, value=item))
 
+    @writable
     def append(self, item):
         """ Append item to list.
 
@@ -90,14 +108,18 @@ class List(Container, abc.MutableSequence):
         self._data.append(self._prepare_item(index, item))
         self.__log__.append(ListAppend(value=item))
 
+    @writable
     def remove(self, item):
         """ Remove item from list.
 
         This method does not save object!
         """
-        self._data.remove(item)
+        index = self._data.index(item)
+        del self._data[index]
+        self._renumber(index)
         self.__log__.append(ListRemove(index=item))
 
+    @writable
     def push(self, item, reload=True):
         """ Push item directly to database.
 
@@ -115,6 +137,7 @@ class List(Container, abc.MutableSequence):
         if reload:
             self.reload()
 
+    @writable
     def pull(self, query, reload=True):
         """ Pull item from database.
 
@@ -127,6 +150,7 @@ class List(Container, abc.MutableSequence):
         if reload:
             self.reload()
 
+    @writable
     def replace(self, query, item, reload=True):
         """ Replace list elements.
         """
@@ -143,6 +167,7 @@ class List(Container, abc.MutableSequence):
         if reload:
             self.reload()
 
+    @writable
     def update(self, query, values, reload=True):
         """ Update fields in embedded documents.
         """
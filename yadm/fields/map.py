@@ -40,6 +40,7 @@ from collections import abc
 from typing import NamedTuple, Any, Callable
 
 from yadm.markers import AttributeNotSet
+from yadm.document_item import writable
 from yadm.fields.base import Field, pass_null
 from yadm.fields.containers import (
     Container,
@@ -61,6 +62,7 @@ class MapUnset(NamedTuple):
 class Map(Container, abc.MutableMapping):
     """ Map.
     """
+    @writable
     def set(self, key, value, reload=True):
         """ Set key directly in database.
 
@@ -76,6 +78,7 @@ class Map(Container, abc.MutableMapping):
         if reload:
             self.reload()
 
+    @writable
     def unset(self, key, reload=True):
         """ Unset key directly in database.
 
@@ -37,7 +37,6 @@ from yadm.common import EnclosedDocDescriptor
 from yadm.markers import AttributeNotSet
 from yadm.documents import Document, DocumentItemMixin
 from yadm.fields.base import Field, FieldDescriptor, pass_null
-from yadm.serialize import from_mongo
 from yadm.testing import create_fake
 from yadm.aio.testing import aio_create_fake
 
@@ -128,7 +127,8 @@ class ReferenceField(Field):
 
         1. Lookup in querysets cache;
         2. Lookup in __yadm_lookups__[self.name];
-        3. Lookup in database;
+        3. Lookup in database (with `get_document` and cache
+           of `__cache_policy__` if it is set for referenced class);
         4. Raise BrokenReference if not found.
         """
         rdc = self.reference_document_class
@@ -138,16 +138,18 @@ class ReferenceField(Field):
         else:
             cache = {}  # fake cache
 
-        if (rdc, value) in cache:
+        try:
             return cache[(rdc, value)]
+        except KeyError:
+            pass
 
-        elif (isinstance(document, Document) and
+        if (isinstance(document, Document) and
                 self.name in document.__yadm_lookups__):
-            cache[(rdc, value)] = doc = from_mongo(
-                document_class=rdc,
-                raw=document.__yadm_lookups__[self.name],
+            cache[(rdc, value)] = doc = rdc.__hydrate__(
+                document.__yadm_lookups__[self.name],
+                not_loaded=document.__yadm_lookup_plans__.get(self.name),
+                db=document.__db__,
             )
-            doc.__db__ = document.__db__
             return doc
 
         elif document.__db__ is not None:
@@ -158,14 +160,17 @@ class ReferenceField(Field):
                     self.reference_document_class,
                 )
                 return ref
+            elif rdc.__cache_policy__ is not None:
+                doc = document.__db__.get_document(rdc, value,
+                                                   exc=BrokenReference)
             else:
                 qs = document.__db__.get_queryset(rdc, cache=cache)
                 doc = qs.find_one(value)
                 if doc is None:  # pragma: no cover
                     doc = qs.read_primary().find_one(value, exc=BrokenReference)
 
-                cache[(rdc, value)] = doc
-                return doc
+            cache[(rdc, value)] = doc
+            return doc
 
         else:
             raise NotBindingToDatabase((document, self, value))
@@ -203,9 +208,27 @@ class Reference(ObjectId):
         return self.get().__await__()
 
     async def get(self, force: bool = False):
+        """ Return referenced document.
+
+        Concurrent calls are coalesced to one query
+        (see :py:mod:`yadm.aio.loader`), `force` reload document
+        with separate query (bypassing identity map of session,
+        reloaded document replaces the document in it).
+        """
         if self.document is None or force:
-            self.document = await self.db(self.document_class).find_one(self)
-            if self.document is None:  # pragma: no cover
-                self.document = await self.db.get_document(self.document_class, self)
+            if not force:
+                self.document = await self.db.get_document(
+                    self.document_class, self)
+            else:
+                qs = self.db(self.document_class).copy(identity_map=False)
+                document = await qs.find_one(self)
+                if document is None:  # pragma: no cover
+                    document = await qs.read_primary().find_one(self)
+
+                if document is not None:
+                    self.db._discard_from_identity_map(document)
+                    document = self.db._add_to_identity_map(document)
+
+                self.document = document
 
         return self.document
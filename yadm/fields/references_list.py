@@ -19,6 +19,14 @@ doc.ref is a ReferencesList instance, witch subclass MutableSequence.
 But without resolving NotResolved raised for any actions with it
 (except __len__ and __bool__).
 
+Lists of many documents can be resolved together with one `$in` query
+(by chunks) per referenced document class:
+
+    docs = db(Doc).resolve_references_lists('refs', 'other_refs')
+
+    resolve_references_lists(docs, 'refs')  # for iterable of documents
+    await aio_resolve_references_lists(docs, 'refs')
+
 """
 from collections.abc import MutableSequence
 from typing import (
@@ -34,11 +42,14 @@ from typing import (
 from bson import ObjectId
 
 from yadm.documents import MetaDocument, BaseDocument, Document
-from yadm.document_item import DocumentItemMixin
-from yadm.queryset import NotFoundBehavior
+from yadm.document_item import DocumentItemMixin, writable
+from yadm.queryset import NotFoundBehavior, NotFoundError
 from yadm.fields.base import Field
 
 
+CHUNK_SIZE = 1000
+
+
 class NotResolved(Exception):
     pass
 
@@ -117,6 +128,7 @@ class ReferencesList(MutableSequence, DocumentItemMixin):
         self._check_resolved_and_rise()
         return self._documents[idx]
 
+    @writable
     def __setitem__(self, idx: int, document: Document):
         self._check_resolved_and_rise()
         self._ids[idx] = document
@@ -124,6 +136,7 @@ class ReferencesList(MutableSequence, DocumentItemMixin):
         self.__log__.append(ReferencesListSetitem(index=idx,
                                                   document=document))
 
+    @writable
     def __delitem__(self, idx: int):
         self._check_resolved_and_rise()
         del self._ids[idx]
@@ -154,18 +167,21 @@ class ReferencesList(MutableSequence, DocumentItemMixin):
     def ids(self) -> list:
         return self._ids.copy()
 
+    @writable
     def insert(self, idx: int, document: Document):
         self._check_resolved_and_rise()
         self._ids.insert(idx, document.id)
         self._documents.insert(idx, document)
         self.__log__.append(ReferencesListInsert(index=idx, document=document))
 
+    @writable
     def append(self, document: Document):
         self._check_resolved_and_rise()
         self._ids.append(document.id)
         self._documents.append(document)
         self.__log__.append(ReferencesListAppend(document=document))
 
+    @writable
     def pop(self, idx: int=-1) -> Document:
         self._check_resolved_and_rise()
         del self._ids[idx]
@@ -225,7 +241,12 @@ class ReferencesListField(Field):
             field=self,
             parent=document,
         )
-        setattr(document, self.name, rl)
+
+        if document.__read_only__:
+            document.__cache__[self.name] = rl
+        else:
+            setattr(document, self.name, rl)
+
         return rl
 
     def get_default(self, document: Document) -> ReferencesList:
@@ -274,3 +295,111 @@ class ReferencesListField(Field):
                  document: Document,
                  value: ReferencesList) -> List[ObjectId]:
         return value._ids
+
+
+def _collect_lists(documents, field_names):
+    """ Return `(db, {document class: [not resolved lists]})`.
+    """
+    db = None
+    lists = {}
+
+    for document in documents:
+        for name in field_names:
+            field = document.__fields__.get(name)
+
+            if not isinstance(field, ReferencesListField):
+                raise ValueError("field {!r} of {!r} is not a"
+                                 " ReferencesListField".format(name, document))
+
+            rl = getattr(document, name)
+
+            if not rl.resolved:
+                db = db or rl.__db__
+                lists.setdefault(rl._reference_document_class, []).append(rl)
+
+    return db, lists
+
+
+def _get_chunks(lists, chunk_size):
+    """ Return chunks of unique ids of lists.
+    """
+    ids = list({_id: None for rl in lists for _id in rl._ids})
+    return [ids[n:n + chunk_size] for n in range(0, len(ids), chunk_size)]
+
+
+def _set_resolved(lists, index, not_found):
+    """ Set documents from `index` to lists in order of ids.
+    """
+    for rl in lists:
+        documents = []
+
+        for _id in rl._ids:
+            document = index.get(_id)
+
+            if document is not None or not_found is NotFoundBehavior.NONE:
+                documents.append(document)
+
+            elif not_found is NotFoundBehavior.ERROR:
+                raise NotFoundError("Could not find a document with"
+                                    " the field '_id' equal '{}'"
+                                    "".format(_id))
+
+        rl._documents = documents
+        rl._resolved = True
+        rl.__log__.append(ReferencesListResolve())
+
+
+def resolve_references_lists(documents, *field_names,
+                             not_found=NotFoundBehavior.NONE,
+                             chunk_size=CHUNK_SIZE):
+    """ Resolve references lists of documents together.
+
+    :param documents: iterable of documents
+    :param str field_names: names of :py:class:`ReferencesListField`
+    :param not_found: behavior for not found documents,
+        as in :py:meth:`yadm.queryset.QuerySet.find_in`
+    :param int chunk_size: max count of ids in one `$in` query
+    :return: list of documents
+
+    Already resolved lists are skipped.
+    """
+    documents = list(documents)
+    not_found = NotFoundBehavior(not_found)
+    db, lists = _collect_lists(documents, field_names)
+
+    for rdc, rdc_lists in lists.items():
+        index = {}
+        qs = db.get_queryset(rdc)
+
+        for chunk in _get_chunks(rdc_lists, chunk_size):
+            for document in qs.find({'_id': {'$in': chunk}}):
+                index[document.id] = document
+
+        _set_resolved(rdc_lists, index, not_found)
+
+    return documents
+
+
+async def aio_resolve_references_lists(documents, *field_names,
+                                       not_found=NotFoundBehavior.SKIP,
+                                       chunk_size=CHUNK_SIZE):
+    """ Asyncio version of :py:func:`resolve_references_lists`.
+
+    Not found documents are skipped by default, as in
+    :py:meth:`ReferencesList.resolve` with asyncio.
+    """
+    documents = list(documents)
+    not_found = NotFoundBehavior(not_found)
+    db, lists = _collect_lists(documents, field_names)
+
+    for rdc, rdc_lists in lists.items():
+        index = {}
+        qs = db.get_queryset(rdc)
+
+        for chunk in _get_chunks(rdc_lists, chunk_size):
+            async for document in qs.find({'_id': {'$in': chunk}}):
+                index[document.id] = document
+
+        _set_resolved(rdc_lists, index, not_found)
+
+    return documents
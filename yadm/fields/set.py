@@ -6,6 +6,7 @@ Similar as :py:mod:`yadm.fields.list`.
 from collections import abc
 from typing import NamedTuple, Any
 
+from yadm.document_item import writable
 from yadm.fields.containers import Container
 from yadm.fields.list import ListField
 
@@ -56,6 +57,7 @@ class Set(Container, abc.MutableSet):
         else:
             return False
 
+    @writable
     def add(self, item):
         """ Append item to set.
 
@@ -66,6 +68,7 @@ class Set(Container, abc.MutableSet):
             self._data.append(item)
             self.__log__.append(SetAdd(value=item))
 
+    @writable
     def discard(self, item):
         """ Remove item from the set if it is present.
 
@@ -78,6 +81,7 @@ class Set(Container, abc.MutableSet):
         else:
             self.__log__.append(SetDiscard(value=item))
 
+    @writable
     def remove(self, item):
         """ Remove item from set.
 
@@ -90,6 +94,7 @@ class Set(Container, abc.MutableSet):
         else:
             self.__log__.append(SetRemove(value=item))
 
+    @writable
     def add_to_set(self, item, reload=True):
         """ Add item directly to database.
 
@@ -111,6 +116,7 @@ class Set(Container, abc.MutableSet):
         if reload:
             self.reload()
 
+    @writable
     def pull(self, query, reload=True):
         """ Pull item from database.
 
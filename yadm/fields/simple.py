@@ -110,6 +110,7 @@ class ObjectIdField(SimpleField):
     :param bool default_gen: generate default value if not set
     """
     type = ObjectId
+    identity_conversion = True
     default_gen = False
 
     def __init__(self, default_gen=False):
@@ -133,6 +134,7 @@ class BooleanField(SimpleField):
     """ Field for boolean values.
     """
     type = bool
+    identity_conversion = True
 
     def get_fake(self, document, faker, depth):
         return faker.pybool()
@@ -142,6 +144,7 @@ class IntegerField(SimpleField):
     """ Field for integer.
     """
     type = int
+    identity_conversion = True
 
     def get_fake(self, document, faker, depth):  # pragma: no cover
         if self.choices is not None:
@@ -154,6 +157,7 @@ class FloatField(SimpleField):
     """ Field for float.
     """
     type = float
+    identity_conversion = True
 
     def get_fake(self, document, faker, depth):  # pragma: no cover
         if self.choices is not None:
@@ -166,6 +170,7 @@ class StringField(SimpleField):
     """ Field for string.
     """
     type = str
+    identity_conversion = True
 
     def get_fake(self, document, faker, depth):  # pragma: no cover
         if self.choices is not None:
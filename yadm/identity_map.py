@@ -0,0 +1,125 @@
+"""
+Identity map for unit of work.
+
+In session of database documents with the same class and `_id`
+are the same instance:
+
+.. code-block:: python
+
+    with db.session():
+        doc = db.get_document(Doc, _id)
+        assert db(Doc).find_one(_id) is doc  # without query
+        assert db(Doc).find_one({'i': doc.i}) is doc
+
+Or with asyncio:
+
+.. code-block:: python
+
+    async with db.session():
+        ...
+
+`get_document`, `find_one` by id, resolving of references,
+prefetch and joins look up documents in identity map before querying.
+Documents from querysets (and inserted documents) are added to identity map,
+if they are fully loaded (without projection) and not read only.
+Documents in identity map are not reloaded by queries,
+use :py:meth:`yadm.database.Database.reload` for it.
+
+Session is bound to current context (:py:mod:`contextvars`),
+so it is not shared by threads and asyncio tasks created before session.
+"""
+from contextvars import ContextVar
+
+_current = ContextVar('yadm_identity_map', default=None)
+
+
+class IdentityMap:
+    """ Map `(document class, _id)` to document instance.
+
+    :param db: database of session
+    """
+    def __init__(self, db):
+        self.db = db
+        self._documents = {}
+        self._tokens = []
+
+    def __repr__(self):
+        return '{}({!r}, len={})'.format(self.__class__.__name__,
+                                         self.db, len(self))
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, key):
+        return key in self._documents
+
+    def __enter__(self):
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current.reset(self._tokens.pop())
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
+
+    def get(self, document_class, _id):
+        """ Return document from identity map or `None`.
+        """
+        return self._documents.get((document_class, _id))
+
+    def add(self, document):
+        """ Add document to identity map and return instance from map.
+
+        If document with the same class and `_id` is already
+        in identity map, it is returned instead of given document.
+        Partially loaded and read only documents is not added.
+        """
+        if document.__not_loaded__ or document.__read_only__:
+            return document
+
+        _id = getattr(document, '_id', None)
+
+        if _id is None:
+            return document
+
+        return self._documents.setdefault((document.__class__, _id), document)
+
+    def discard(self, document_class, _id):
+        """ Remove document from identity map if it is present.
+        """
+        self._documents.pop((document_class, _id), None)
+
+    def split(self, document_class, ids):
+        """ Return `(found, missing)` for ids, where `found`
+        is `{id: document}` and `missing` is list of ids.
+        """
+        found = {}
+        missing = []
+
+        for _id in ids:
+            document = self._documents.get((document_class, _id))
+
+            if document is not None:
+                found[_id] = document
+            else:
+                missing.append(_id)
+
+        return found, missing
+
+    def clear(self):
+        self._documents.clear()
+
+
+def get_identity_map(db):
+    """ Return identity map of current session of `db` or `None`.
+    """
+    identity_map = _current.get()
+
+    if identity_map is not None and identity_map.db is db:
+        return identity_map
+    else:
+        return None
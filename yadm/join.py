@@ -3,24 +3,37 @@ from collections import defaultdict
 
 from bson import ObjectId
 
-from yadm.documents import Document
-from yadm.fields.reference import ReferenceField
+from yadm.documents import Document, EmbeddedDocument
+from yadm.exceptions import NotLoadedError
+from yadm.identity_map import get_identity_map
+from yadm.fields.embedded import EmbeddedDocumentField
+from yadm.fields.list import ListField
+from yadm.fields.reference import ReferenceField, Reference
 
 
 class Join(abc.Sequence):
     """ Helper for build client-side joins.
+
+    :param qs: queryset of documents
+    :param list documents: documents for join instead of all
+        documents of queryset
+    :param cache: cache `{(document class, id): document}` of joined
+        documents, which is shared by joins (see `QuerySet.join_iter`)
     """
-    def __init__(self, qs):
+    def __init__(self, qs, documents=None, cache=None):
         self._qs = qs
+        self._cache = cache
         self._document_class = qs._document_class
         self._db = qs._db
 
         self._indexes = defaultdict(dict)
+        self._map_name_path = {}
         self._map_name_type = {}
         self._map_type_names = defaultdict(set)
+        self._map_type_projection = {}
         self._map_name_ids = defaultdict(set)
 
-        self._data = list(qs)
+        self._data = list(qs) if documents is None else documents
 
     # abc.Sequence method
 
@@ -47,60 +60,163 @@ class Join(abc.Sequence):
     def get_queryset(self, field_name):
         """ Return queryset for joined objects.
         """
-        field = self._get_field(field_name)
-        qs = self._db(field.reference_document_class)
+        names, kind, reference_document_class = self._get_path(field_name)
+        qs = self._db(reference_document_class)
         ids = self._get_joined_ids(field_name)
         return qs.find({'_id': {'$in': list(ids)}})
 
-    def join(self, *field_names):
+    def join(self, *field_names, projections=None):
         """ Do manual join.
+
+        Field names are dotted paths to `ReferenceField`,
+        `ListField(ReferenceField(...))` or `ReferencesListField`,
+        also through embedded documents and lists of them:
+
+        .. code-block:: python
+
+            qs.join('user', 'log.user', 'items.product', 'tags')
+
+        Ids from all paths are grouped by referenced document class
+        and loaded with one query per class.
+
+        `projections` is `{field name: projection}` for joined documents,
+        which are loaded partially (with `__not_loaded__` fields).
+        Projections of paths with the same referenced document class
+        are merged:
+
+        .. code-block:: python
+
+            qs.join('user', projections={'user': {'name': 1}})
         """
-        self._load_names_types_maps(*field_names)
+        self._load_names_types_maps(*field_names, projections=projections)
         self._load_map_name_ids(*field_names)
         self._load_objects_to_indexes(*field_names)
         self._set_objects(*field_names)
 
-    def _get_field(self, field_name):
-        document_fields = self._document_class.__fields__
-        if field_name not in document_fields:
-            raise ValueError("field not exists: {!r}".format(field_name))
+    def _get_path(self, field_name):
+        """ Return `(names, kind, reference document class)` for path.
+
+        `kind` is one of `'reference'`, `'list'` (for `ListField`
+        of references) or `'references_list'`.
+        Raise `ValueError` for bad path.
+        """
+        from yadm.fields.references_list import ReferencesListField
 
-        field = document_fields[field_name]
+        document_class = self._document_class
+        names = field_name.split('.')
 
-        if not isinstance(field, ReferenceField):
-            raise ValueError("bad field type: {!r}".format(field_name))
+        for n, name in enumerate(names, 1):
+            if name not in document_class.__fields__:
+                raise ValueError("field not exists: {!r}".format(field_name))
 
-        return field
+            field = document_class.__fields__[name]
+            last = n == len(names)
+
+            if isinstance(field, ListField):
+                item_field = field.item_field
+            else:
+                item_field = field
+
+            if last and isinstance(item_field, ReferenceField):
+                kind = 'reference' if item_field is field else 'list'
+                return names, kind, item_field.reference_document_class
+
+            elif last and isinstance(field, ReferencesListField):
+                return (names, 'references_list',
+                        field._reference_document_class)
+
+            elif not last and isinstance(item_field, EmbeddedDocumentField):
+                document_class = item_field.embedded_document_class
+
+            else:
+                raise ValueError("bad field type: {!r}".format(field_name))
+
+    def _iter_raw_ids(self, raw, names):
+        """ Iterate over ids in raw data by names of path.
+        """
+        values = [raw]
+
+        for name in names:
+            values = [item[name]
+                      for value in values
+                      for item in (value if isinstance(value, list)
+                                   else [value])
+                      if isinstance(item, abc.Mapping) and name in item]
+
+        for value in values:
+            for item in (value if isinstance(value, list) else [value]):
+                _id = self._prepare_id(item)
+                if _id:
+                    yield _id
 
     def _get_joined_ids(self, field_name):
+        names, kind, reference_document_class = self._get_path(field_name)
         ids = set()
         for doc in self:
-            value = doc.__raw__[field_name]
-
-            _id = self._prepare_id(value)
-            if _id:
-                ids.add(_id)
+            ids.update(self._iter_raw_ids(doc.__raw__, names))
 
         return ids
 
-    def _load_names_types_maps(self, *field_names):
+    def _load_names_types_maps(self, *field_names, projections=None):
+        projections = projections or {}
+        unknown = set(projections) - set(field_names)
+
+        if unknown:
+            raise ValueError("projections for not joined fields: {!r}"
+                             "".format(sorted(unknown)))
+
+        type_projections = defaultdict(list)
+
         for field_name in field_names:
-            field = self._get_field(field_name)
-            reference_document_class = field.reference_document_class
+            names, kind, reference_document_class = self._get_path(field_name)
+            self._map_name_path[field_name] = (names, kind)
             self._map_name_type[field_name] = reference_document_class
             self._map_type_names[reference_document_class].add(field_name)
+            type_projections[reference_document_class].append(
+                projections.get(field_name))
+
+        for joined_document_class, items in type_projections.items():
+            self._map_type_projection[joined_document_class] = (
+                self._merge_projections(items))
+
+    @staticmethod
+    def _merge_projections(projections):
+        """ Return one projection for list of projections (`None` too).
+
+        Equal projections and inclusive projections are merged,
+        otherwise documents are loaded entirely.
+        """
+        first = projections[0]
+
+        if all(p == first for p in projections):
+            return first
+
+        elif None in projections:
+            return None
+
+        elif all(v for p in projections for k, v in p.items() if k != '_id'):
+            merged = {}
+            for projection in projections:
+                merged.update(projection)
+            return merged
+
+        else:
+            return None
 
     def _load_map_name_ids(self, *field_names):
         for doc in self:
             for field_name in field_names:
-                value = doc.__raw__.get(field_name)
+                names, kind = self._map_name_path[field_name]
+                self._map_name_ids[field_name].update(
+                    self._iter_raw_ids(doc.__raw__, names))
 
-                _id = self._prepare_id(value)
-                if _id:
-                    self._map_name_ids[field_name].add(_id)
+    def _get_ids_to_load(self, *field_names):
+        """ Return `{joined document class: ids}` for queries.
 
-    def _load_objects_to_indexes(self, *field_names):
+        Documents from identity map and cache are added to indexes.
+        """
         field_names = set(field_names)
+        result = {}
 
         for joined_document_class, names in self._map_type_names.items():
             if not (field_names & names):
@@ -110,20 +226,139 @@ class Join(abc.Sequence):
             for field_name in names:
                 ids.update(self._map_name_ids[field_name])
 
-            ids = list(ids - set(self._indexes[joined_document_class]))
-            qs = self._db(joined_document_class).find({'_id': {'$in': ids}})
-            self._indexes[joined_document_class].update(qs.bulk())
+            index = self._indexes[joined_document_class]
+            ids = list(ids - set(index))
+
+            identity_map = get_identity_map(self._db)
+            if identity_map is not None:
+                found, ids = identity_map.split(joined_document_class, ids)
+                index.update(found)
+
+            if self._cache is not None:
+                ids = self._load_from_cache(joined_document_class, ids, index)
+
+            if ids:
+                result[joined_document_class] = ids
+
+        return result
+
+    def _get_joined_queryset(self, joined_document_class, ids):
+        return self._db(joined_document_class).find(
+            {'_id': {'$in': ids}},
+            self._map_type_projection.get(joined_document_class),
+        )
+
+    def _add_to_index(self, joined_document_class, found):
+        self._indexes[joined_document_class].update(found)
+
+        if self._cache is not None:
+            for _id, document in found.items():
+                self._cache[(joined_document_class, _id)] = document
+
+    def _load_objects_to_indexes(self, *field_names):
+        to_load = self._get_ids_to_load(*field_names)
+
+        for joined_document_class, ids in to_load.items():
+            qs = self._get_joined_queryset(joined_document_class, ids)
+            self._add_to_index(joined_document_class, qs.bulk())
+
+    def _load_from_cache(self, document_class, ids, index):
+        """ Move documents from cache to index and return missed ids.
+        """
+        missed = []
+
+        for _id in ids:
+            document = self._cache.get((document_class, _id))
+
+            if document is not None:
+                index[_id] = document
+            else:
+                missed.append(_id)
+
+        return missed
 
     def _set_objects(self, *field_names):
-        for doc in self:
-            for field_name in field_names:
-                value = doc.__raw__.get(field_name)
+        for field_name in field_names:
+            (*names, name), kind = self._map_name_path[field_name]
+            joined_document_class = self._map_name_type[field_name]
+            index = self._indexes[joined_document_class]
+            set_object = getattr(self, '_set_' + kind)
 
-                _id = self._prepare_id(value)
-                if _id:
-                    joined_document_class = self._map_name_type[field_name]
-                    index = self._indexes[joined_document_class]
-                    doc.__cache__[field_name] = index.get(_id, value)
+            for doc in self:
+                for parent in self._get_parents(doc, names):
+                    set_object(parent, name, index)
+
+    def _get_parents(self, document, names):
+        """ Return embedded documents by names of path.
+
+        Not set and not loaded fields are skipped.
+        """
+        parents = [document]
+
+        for name in names:
+            children = []
+
+            for parent in parents:
+                if name not in parent.__cache__ and name not in parent.__raw__:
+                    continue
+
+                try:
+                    value = getattr(parent, name)
+                except (AttributeError, NotLoadedError):
+                    continue
+
+                for item in (value if isinstance(value, abc.Sequence)
+                             else [value]):
+                    if isinstance(item, EmbeddedDocument):
+                        children.append(item)
+
+            parents = children
+
+        return parents
+
+    def _set_reference(self, parent, name, index):
+        value = parent.__raw__.get(name)
+
+        _id = self._prepare_id(value)
+        if _id:
+            parent.__cache__[name] = index.get(_id, value)
+
+    def _set_list(self, parent, name, index):
+        value = parent.__raw__.get(name)
+
+        if name in parent.__cache__ or not isinstance(value, list):
+            return
+
+        field = parent.__fields__[name]
+        item_field = field.item_field
+        container = field.container(field, parent, [])
+
+        for n, item in enumerate(value):
+            document = index.get(self._prepare_id(item))
+
+            if document is None:
+                document = item_field.from_mongo(container, item)
+            elif self._db.aio:
+                reference = Reference(document.id, container,
+                                      item_field.reference_document_class)
+                reference.document = document
+                document = reference
+
+            container._data.append(field._set_parent(container, n, document))
+
+        parent.__cache__[name] = container
+
+    def _set_references_list(self, parent, name, index):
+        from yadm.fields.references_list import _set_resolved
+        from yadm.queryset import NotFoundBehavior
+
+        rl = getattr(parent, name)
+
+        if not rl.resolved:
+            if self._db.aio:
+                _set_resolved([rl], index, NotFoundBehavior.SKIP)
+            else:
+                _set_resolved([rl], index, NotFoundBehavior.NONE)
 
     def _prepare_id(self, value):
         if isinstance(value, ObjectId):
@@ -0,0 +1,205 @@
+"""
+Lazy BSON documents.
+
+:py:class:`LazyBSONDocument` is used as `document_class` in codec options
+of collection. Pymongo don't decode the documents with this option,
+so `__raw__` of documents hold undecoded bytes and only fields,
+which are actually read, are decoded:
+
+    qs = db(Doc).lazy()
+    doc = qs.find_one()
+    assert isinstance(doc.__raw__, LazyBSONDocument)
+
+    doc = db.get_document(Doc, _id, lazy=True)
+
+Nested documents and arrays are decoded to `dict` and `list`
+with first access to field.
+"""
+from collections import abc
+import struct
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+_INT32 = struct.Struct('<i')
+_unpack_int32 = _INT32.unpack_from
+
+# sizes of values by BSON element types:
+# -1 is int32 prefixed string, -2 is int32 sized value,
+# -3 is binary, -4 is regex, -5 is DBPointer, -6 is unknown type
+_VALUE_SIZES = [-6] * 256
+_VALUE_SIZES[0x01] = 8  # double
+_VALUE_SIZES[0x02] = -1  # string
+_VALUE_SIZES[0x03] = -2  # document
+_VALUE_SIZES[0x04] = -2  # array
+_VALUE_SIZES[0x05] = -3  # binary
+_VALUE_SIZES[0x06] = 0  # undefined
+_VALUE_SIZES[0x07] = 12  # ObjectId
+_VALUE_SIZES[0x08] = 1  # boolean
+_VALUE_SIZES[0x09] = 8  # UTC datetime
+_VALUE_SIZES[0x0A] = 0  # null
+_VALUE_SIZES[0x0B] = -4  # regex
+_VALUE_SIZES[0x0C] = -5  # DBPointer
+_VALUE_SIZES[0x0D] = -1  # JavaScript code
+_VALUE_SIZES[0x0E] = -1  # symbol
+_VALUE_SIZES[0x0F] = -2  # JavaScript code with scope
+_VALUE_SIZES[0x10] = 4  # int32
+_VALUE_SIZES[0x11] = 8  # timestamp
+_VALUE_SIZES[0x12] = 8  # int64
+_VALUE_SIZES[0x13] = 16  # decimal128
+_VALUE_SIZES[0x7F] = 0  # max key
+_VALUE_SIZES[0xFF] = 0  # min key
+
+_decode_options_cache = {}
+
+
+def _get_decode_options(codec_options):
+    """ Return codec options for decode elements with `dict` documents.
+
+    Cursors pass the same codec options to all documents,
+    so it is cached by identity.
+    """
+    key = id(codec_options)
+    cached = _decode_options_cache.get(key)
+
+    if cached is None or cached[0] is not codec_options:
+        if len(_decode_options_cache) > 100:  # pragma: no cover
+            _decode_options_cache.clear()
+
+        options = codec_options.with_options(document_class=dict)
+        cached = _decode_options_cache[key] = (codec_options, options)
+
+    return cached[1]
+
+
+def _get_value_size(data, type_, position):
+    """ Return size of element value with variable size.
+    """
+    size = _VALUE_SIZES[type_]
+
+    if size == -1:
+        return 4 + _unpack_int32(data, position)[0]
+    elif size == -2:
+        return _unpack_int32(data, position)[0]
+    elif size == -3:
+        return 5 + _unpack_int32(data, position)[0]
+    elif size == -4:
+        end = data.index(b'\x00', data.index(b'\x00', position) + 1)
+        return end + 1 - position
+    elif size == -5:
+        return 16 + _unpack_int32(data, position)[0]
+    else:
+        raise bson.InvalidBSON(
+            "unknown element type: {:#x}".format(type_))
+
+
+class LazyBSONDocument(abc.Mapping):
+    """ Read only mapping over BSON bytes with decoding on demand.
+
+    Elements are indexed by scanning of bytes while requested key
+    is not found, and only requested element is decoded.
+    It is not cache decoded values, because documents
+    cache it in `__cache__`.
+
+    Pymongo write it as is, like :py:class:`bson.raw_bson.RawBSONDocument`.
+    """
+    __slots__ = ('_raw', '_codec_options', '_index', '_position')
+    _type_marker = RawBSONDocument._type_marker
+
+    def __init__(self, bson_bytes, codec_options=None):
+        self._raw = bson_bytes
+        self._codec_options = codec_options or LAZY_BSON_OPTIONS
+        self._index = {}
+        self._position = 4
+
+    @property
+    def raw(self):
+        """ BSON bytes of document.
+        """
+        return self._raw
+
+    def _scan(self, key=None):
+        """ Index elements until `key` is found or document is ended.
+        """
+        data = self._raw
+        index = self._index
+        position = self._position
+        end = len(data) - 1
+        find = data.index
+        sizes = _VALUE_SIZES
+        unpack_int32 = _unpack_int32
+
+        while position < end:
+            name_end = find(0, position + 1)
+            size = sizes[data[position]]
+
+            if size < 0:
+                if size == -1:  # the most common type is inlined
+                    size = 4 + unpack_int32(data, name_end + 1)[0]
+                else:
+                    size = _get_value_size(data, data[position], name_end + 1)
+
+            name = data[position + 1:name_end].decode()
+            element_end = name_end + 1 + size
+            index[name] = (position, element_end)
+            position = element_end
+
+            if name == key:
+                break
+
+        self._position = position
+
+    def _get_element(self, key):
+        element = self._index.get(key)
+
+        if element is None and self._position < len(self._raw) - 1:
+            # fast check for missed keys without scanning
+            if key.encode() + b'\x00' in self._raw:
+                self._scan(key)
+                element = self._index.get(key)
+
+        return element
+
+    def __getitem__(self, key):
+        element = self._get_element(key)
+
+        if element is None:
+            raise KeyError(key)
+
+        start, end = element
+        data = _INT32.pack(end - start + 5) + self._raw[start:end] + b'\x00'
+        options = _get_decode_options(self._codec_options)
+        return bson.decode(data, options)[key]
+
+    def __contains__(self, key):
+        return self._get_element(key) is not None
+
+    def __iter__(self):
+        self._scan()
+        return iter(self._index)
+
+    def __len__(self):
+        self._scan()
+        return len(self._index)
+
+    def __bool__(self):
+        return len(self._raw) > 5  # empty document is 5 bytes
+
+    def __eq__(self, other):
+        if isinstance(other, LazyBSONDocument):
+            return self._raw == other._raw
+        else:
+            return super().__eq__(other)
+
+    def __repr__(self):  # pragma: no cover
+        return '{}({!r})'.format(self.__class__.__name__, self._raw)
+
+
+LAZY_BSON_OPTIONS = CodecOptions(document_class=LazyBSONDocument)
+
+
+def get_lazy_codec_options(codec_options):
+    """ Return copy of codec options with lazy documents.
+    """
+    return codec_options.with_options(document_class=LazyBSONDocument)
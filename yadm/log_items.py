@@ -32,6 +32,19 @@ class BaseLog:  # pragma: no cover
         self.items.clear()
 
 
+class ReadOnlyLog(BaseLog):
+    """ Log for read only documents, which don't store items.
+    """
+    def __init__(self):
+        self.items = ()
+
+    def append(self, log_item):
+        pass
+
+    def clear(self):
+        pass
+
+
 class Save(NamedTuple):
     op: str = 'save'
     id: Optional[ObjectId] = None
@@ -47,6 +60,11 @@ class UpdateOne(NamedTuple):
     op: str = 'update_one'
 
 
+class SaveChanges(NamedTuple):
+    update_data: Dict[str, Any]
+    op: str = 'save_changes'
+
+
 class DeleteOne(NamedTuple):
     op: str = 'delete_one'
 
@@ -0,0 +1,160 @@
+"""
+Keyset pagination.
+
+Slices of querysets are `skip`/`limit` queries, and server cost
+of `skip` grows with offset. :py:meth:`yadm.queryset.QuerySet.paginate`
+continue from sort values of last document of previous page instead:
+
+.. code-block:: python
+
+    page = qs.paginate(sort_key=('date', -1), size=50)
+
+    for event in page:
+        print(event.date)
+
+    if page.has_next:
+        page = qs.paginate(sort_key=('date', -1), after=page.next_token,
+                           size=50)
+
+Sort can be compound: `sort_key=[('date', -1), ('title', 1)]`.
+`_id` is always added to sort as tiebreaker, so order is stable.
+Token is opaque string with last sort values and it is bound to sort.
+Fields of sort must be loaded (not excluded by projection).
+"""
+import base64
+import binascii
+from collections import abc
+
+import bson
+from bson.errors import BSONError
+
+PAGE_SIZE = 50
+
+
+class Page(abc.Sequence):
+    """ Page of documents.
+
+    :param list documents: documents of page
+    :param str next_token: token for next page or `None` for last page
+    """
+    def __init__(self, documents, next_token=None):
+        self.documents = documents
+        self.next_token = next_token
+
+    def __repr__(self):
+        return '{}(len={}, has_next={})'.format(
+            self.__class__.__name__, len(self), self.has_next)
+
+    def __getitem__(self, idx):
+        return self.documents[idx]
+
+    def __len__(self):
+        return len(self.documents)
+
+    @property
+    def has_next(self):
+        return self.next_token is not None
+
+
+def get_sort_keys(sort_key):
+    """ Return list of `(field, direction)` with `_id` as last key.
+
+    :param sort_key: `(field, direction)` or list of them
+    """
+    if isinstance(sort_key, tuple) and isinstance(sort_key[0], str):
+        keys = [sort_key]
+    else:
+        keys = [tuple(key) for key in sort_key]
+
+    for field_name, direction in keys:
+        if direction not in (1, -1):
+            raise ValueError("bad sort direction for {!r}: {!r}"
+                             "".format(field_name, direction))
+
+    if not any(field_name == '_id' for field_name, _ in keys):
+        keys.append(('_id', keys[-1][1] if keys else 1))
+
+    return keys
+
+
+def encode_token(keys, values):
+    """ Return opaque token for sort keys and values of last document.
+    """
+    data = bson.encode({'k': [list(key) for key in keys], 'v': values})
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_token(keys, token):
+    """ Return sort values from token.
+
+    Raise `ValueError` if token is malformed or made for other sort.
+    """
+    try:
+        data = bson.decode(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (BSONError, binascii.Error, UnicodeError, ValueError):
+        raise ValueError("bad pagination token: {!r}".format(token))
+
+    if data.get('k') != [list(key) for key in keys]:
+        raise ValueError("pagination token is made for other sort")
+
+    return data['v']
+
+
+def get_sort_values(document, keys):
+    """ Return values of sort keys from raw data of document.
+    """
+    values = []
+
+    for field_name, _ in keys:
+        value = document.__raw__
+
+        for name in field_name.split('.'):
+            value = value.get(name) if isinstance(value, abc.Mapping) else None
+
+        values.append(value)
+
+    return values
+
+
+def get_after_criteria(keys, values):
+    """ Return criteria for documents after values in sort order.
+
+    For keys `a, b` it is `(a > va) or (a == va and b > vb)`.
+    Null and missing values are less than others in MongoDB sort,
+    so they are after any value in descending order and nothing
+    is after them in it.
+    """
+    variants = []
+
+    for n, (field_name, direction) in enumerate(keys):
+        prefix = {f: v for (f, _), v in zip(keys[:n], values[:n])}
+        value = values[n]
+
+        if direction == 1:
+            conditions = [{'$ne': None} if value is None else {'$gt': value}]
+        elif value is not None:
+            conditions = [{'$lt': value}]
+
+            if field_name != '_id':  # _id is never missing
+                conditions.append(None)
+        else:
+            conditions = []
+
+        for condition in conditions:
+            criteria = dict(prefix)
+            criteria[field_name] = condition
+            variants.append(criteria)
+
+    return variants[0] if len(variants) == 1 else {'$or': variants}
+
+
+def make_page(documents, keys, size):
+    """ Return page for `size + 1` documents from queryset.
+    """
+    if len(documents) > size:
+        documents = documents[:size]
+        next_token = encode_token(keys, get_sort_values(documents[-1], keys))
+    else:
+        next_token = None
+
+    return Page(documents, next_token)
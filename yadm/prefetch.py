@@ -0,0 +1,146 @@
+"""
+Batched prefetch of references.
+
+Without prefetch every reference is resolved with one `find_one`
+on first access. :py:meth:`yadm.queryset.BaseQuerySet.prefetch` collect
+ids of references from each batch of documents, resolve them with
+one `$in` query per referenced document class and put found documents
+to `__cache__` of documents:
+
+.. code-block:: python
+
+    qs = db(Comment).prefetch('user', 'post', 'post.user')
+
+    for comment in qs:  # 3 queries per batch: comments, users, posts
+        print(comment.user.name, comment.post.user.name)
+
+Dotted paths are prefetched level by level, so users of comments
+and users of posts are loaded with the same query.
+Not found documents are not prefetched and resolved as usual.
+"""
+from bson import ObjectId
+
+from yadm.documents import Document
+from yadm.fields.reference import ReferenceField
+
+BATCH_SIZE = 100
+
+
+class Prefetch:
+    """ Plan of prefetch for document class.
+
+    :param document_class: class of documents in queryset
+    :param paths: dotted paths of references
+    :param dict projections: `{referenced document class: projection}`
+    """
+    def __init__(self, document_class, paths, projections=None):
+        self.document_class = document_class
+        self.paths = frozenset(paths)
+        self.projections = dict(projections or {})
+        self.tree = self._build_tree(document_class, self.paths)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__,
+                               ', '.join(sorted(self.paths)))
+
+    def merge(self, paths, projections=None):
+        """ Return new plan with additional paths and projections.
+        """
+        return self.__class__(self.document_class,
+                              self.paths | set(paths),
+                              {**self.projections, **(projections or {})})
+
+    @staticmethod
+    def _build_tree(document_class, paths):
+        """ Return tree `{name: (field, subtree)}` of paths.
+
+        Raise `ValueError` if path is not a reference.
+        """
+        tree = {}
+
+        for path in sorted(paths):
+            level = tree
+            level_class = document_class
+
+            for name in path.split('.'):
+                field = level_class.__fields__.get(name)
+
+                if not isinstance(field, ReferenceField):
+                    raise ValueError("field {!r} of {!r} is not a"
+                                     " ReferenceField".format(name, level_class))
+
+                level = level.setdefault(name, (field, {}))[1]
+                level_class = field.reference_document_class
+
+        return tree
+
+    def collect(self, items):
+        """ Collect ids of references for level of prefetch.
+
+        :param items: list of `(documents, tree)`
+        :return: `(wanted, links)`, where `wanted` is
+            `{document class: set of ids}` and `links` is list of
+            `(document, name, document class, id, subtree)`
+        """
+        wanted = {}
+        links = []
+
+        for documents, tree in items:
+            for name, (field, subtree) in tree.items():
+                rdc = field.reference_document_class
+
+                for document in documents:
+                    if name in document.__cache__:
+                        value = document.__cache__[name]
+                        if not isinstance(value, Document):
+                            continue
+
+                        # already resolved, prefetch next level only
+                        links.append((document, name, rdc, value.id, subtree))
+                        continue
+
+                    _id = document.__raw__.get(name)
+
+                    if isinstance(_id, ObjectId):
+                        wanted.setdefault(rdc, set()).add(_id)
+                        links.append((document, name, rdc, _id, subtree))
+
+        return wanted, links
+
+    def get_queryset(self, qs, document_class, ids):
+        """ Return queryset for documents of class with `ids`.
+
+        Queryset share cache with `qs`.
+        """
+        return qs._db.get_queryset(document_class, cache=qs.cache).find(
+            {'_id': {'$in': list(ids)}},
+            self.projections.get(document_class),
+        )
+
+    @staticmethod
+    def apply(links, index):
+        """ Put found documents to `__cache__` of documents.
+
+        :param links: from :py:meth:`collect`
+        :param dict index: `{(document class, id): document}`
+        :return: items for next level
+        """
+        items = {}
+
+        for document, name, rdc, _id, subtree in links:
+            found = index.get((rdc, _id))
+
+            if found is None:
+                continue
+
+            if name not in document.__cache__:
+                document.__cache__[name] = found
+
+            if subtree:
+                key = id(subtree)
+                if key not in items:
+                    items[key] = ({}, subtree)
+                items[key][0][id(found)] = found
+
+        return [(list(documents.values()), subtree)
+                for documents, subtree in items.values()]
@@ -0,0 +1,76 @@
+"""
+Projection plans.
+
+`__not_loaded__` of documents is :py:class:`ProjectionPlan`:
+frozenset of not loaded dotted paths, which is prefix tree also.
+Querysets compile plan from projection once and share it
+for all documents from cursor, and embedded documents
+(and items of lists) get their sub-plans without paths scanning:
+
+    plan = compile_projection(Doc, {'e.i': False})
+    assert 'e' not in plan
+    assert plan.child('e') == {'i'}
+"""
+
+
+class ProjectionPlan(frozenset):
+    """ Frozenset of not loaded dotted paths with sub-plans by prefixes.
+
+    Sub-plans are built once with plan.
+    """
+    __slots__ = ('_children',)
+
+    def __new__(cls, paths=()):
+        plan = super().__new__(cls, paths)
+        groups = {}
+
+        for path in plan:
+            first, dot, rest = path.partition('.')
+            if dot:
+                groups.setdefault(first, []).append(rest)
+
+        plan._children = {name: cls(rest) for name, rest in groups.items()}
+        return plan
+
+    def child(self, name):
+        """ Return plan for embedded document or container in field `name`.
+        """
+        return self._children.get(name, EMPTY_PLAN)
+
+
+EMPTY_PLAN = ProjectionPlan()
+
+
+def make_plan(not_loaded):
+    """ Return plan for iterable of not loaded paths.
+
+    Plans and empty values are not copied.
+    """
+    if not not_loaded:
+        return EMPTY_PLAN
+    elif type(not_loaded) is ProjectionPlan:
+        return not_loaded
+    else:
+        return ProjectionPlan(not_loaded)
+
+
+def compile_projection(document_class, projection):
+    """ Return plan of not loaded paths for documents
+    loaded with `projection`.
+    """
+    if not projection:
+        return EMPTY_PLAN
+
+    include = [f for f, v in projection.items() if v]
+    exclude = {f for f, v in projection.items() if not v}
+
+    if include:
+        if exclude and exclude != {'_id'}:  # pragma: no cover
+            raise ValueError("projection cannot have a mix"
+                             " of inclusion and exclusion")
+
+        for field_name in document_class.__fields__:
+            if field_name not in include and field_name != '_id':
+                exclude.add(field_name)
+
+    return make_plan(exclude)
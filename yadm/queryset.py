@@ -1,16 +1,23 @@
 from collections import OrderedDict
 from enum import Enum
-from typing import Union, List, Tuple
+from itertools import islice
+from typing import Union, List, NamedTuple, Optional, Tuple
 import warnings
 
 from pymongo import read_preferences, ReturnDocument
 from bson import ObjectId
 
 from yadm.join import Join
-from yadm.cache import StackCache
-from yadm.serialize import from_mongo, to_mongo, LOOKUPS_KEY
-
-CACHE_SIZE = 100
+from yadm.cache import LRUCache, CACHE_SIZE  # noqa: F401
+from yadm.columns import ColumnsBuilder
+from yadm.identity_map import get_identity_map
+from yadm.fields.reference import ReferenceField
+from yadm.lazy_bson import get_lazy_codec_options
+from yadm import paginate as pagination
+from yadm import scan
+from yadm.prefetch import Prefetch, BATCH_SIZE as PREFETCH_BATCH_SIZE
+from yadm.projection import compile_projection, ProjectionPlan
+from yadm.serialize import to_mongo, LOOKUPS_KEY
 
 _Primary = read_preferences.Primary()
 _PrimaryPreferred = read_preferences.PrimaryPreferred()
@@ -26,26 +33,110 @@ class NotFoundError(Exception):
     pass
 
 
+class Lookup(NamedTuple):
+    """ Server-side join of reference field with `$lookup`.
+    """
+    collection: str
+    field_name: str
+    preserve_null: bool = False
+    projection: Optional[dict] = None
+    not_loaded: Optional[ProjectionPlan] = None
+
+
+def _get_field(document_class, path):
+    """ Return field for dotted path or None if it is not resolved.
+    """
+    field = None
+    fields = document_class.__fields__
+
+    for name in path.split('.'):
+        if field is not None:
+            embedded_document_class = getattr(
+                field, 'embedded_document_class', None)
+
+            if embedded_document_class is None:
+                return None
+
+            fields = embedded_document_class.__fields__
+
+        field = fields.get(name)
+
+        if field is None:
+            return None
+
+    return field
+
+
+def _build_value_getter(document_class, path, convert):
+    """ Build function for get value by dotted path from raw data.
+
+    Value is converted with `from_mongo` of field if `convert` is `True`.
+    References is not resolved and returned as is.
+    """
+    first, *names = path.split('.')
+
+    if not names:
+        def get(raw):
+            return raw.get(first)
+    else:
+        def get(raw):
+            value = raw.get(first)
+            for name in names:
+                if not isinstance(value, dict):
+                    return None
+
+                value = value.get(name)
+
+            return value
+
+    field = _get_field(document_class, path) if convert else None
+
+    if (field is None or isinstance(field, ReferenceField) or
+            isinstance(getattr(field, 'item_field', None), ReferenceField)):
+        return get
+
+    from_mongo = field.from_mongo
+
+    def get_converted(raw):
+        value = get(raw)
+        if value is not None:
+            return from_mongo(None, value)
+        else:
+            return None
+
+    return get_converted
+
+
 class BaseQuerySet:
     """ Query builder.
     """
     def __init__(self, db, document_class, *,
-                 cache=None, criteria=None, projection=None, hint=None, sort=None,
+                 cache=None, cache_size=None, criteria=None,
+                 projection=None, hint=None, sort=None,
                  comment=None, lookup=None, slice=None,
-                 batch_size=None, collection_params=None):
+                 batch_size=None, collection_params=None, read_only=False,
+                 prefetch=None, identity_map=True):
 
         self._db = db
         self._document_class = document_class
         self._cache = cache
+        self._cache_size = cache_size
         self._criteria = criteria or {}
         self._projection = projection
+        self._projection_plan = compile_projection(document_class, projection)
         self._hint = hint
         self._comment = comment
         self._sort = sort
-        self._lookup = lookup or frozenset()
+        self._lookup = lookup or {}
+        self._lookup_plans = {name: lookup.not_loaded
+                              for name, lookup in self._lookup.items()
+                              if lookup.not_loaded}
         self._slice = slice
         self._batch_size = batch_size
         self._collection_params = collection_params or {}
+        self._read_only = read_only
+        self._prefetch = prefetch
+        self._identity_map = identity_map
 
     def __repr__(self):
         return ("{s.__class__.__name__}({s._document_class.__collection__}"
@@ -74,34 +165,51 @@ class BaseQuerySet:
             raise TypeError("Only slice or int accepted, but {}"
                             "".format(item.__class__))
 
-    def _from_mongo_one(self, data, *, projection=None):
+    def _from_mongo_one(self, data, *, projection=None, identity=True):
         """ Create document from raw data.
+
+        Projection plan of queryset is shared by all documents.
+        If `identity` is `True`, document is added to identity map
+        of current session (see :py:mod:`yadm.identity_map`).
         """
         projection = projection or self._projection
 
         if data is None:  # pragma: no cover
             return None
-        elif not projection:
-            not_loaded = frozenset()
+        elif projection is self._projection:
+            not_loaded = self._projection_plan
         else:
-            include = [f for f, v in projection.items() if v]
-            exclude = {f for f, v in projection.items() if not v}
+            not_loaded = compile_projection(self._document_class, projection)
+
+        document = self._document_class.__hydrate__(
+            data, not_loaded,
+            db=self._db,
+            qs=self,
+            read_only=self._read_only,
+            lookup_plans=self._lookup_plans,
+        )
 
-            if include:
-                if exclude and exclude != {'_id'}:  # pragma: no cover
-                    raise ValueError("projection cannot have a mix"
-                                     " of inclusion and exclusion")
+        if identity and self._identity_map:
+            identity_map = get_identity_map(self._db)
+            if identity_map is not None:
+                return identity_map.add(document)
 
-                for field_name in self._document_class.__fields__:
-                    if field_name not in include and field_name != '_id':
-                        exclude.add(field_name)
+        return document
 
-            not_loaded = exclude
+    def _get_from_identity_map(self, criteria, projection):
+        """ Return document for `find_one` from identity map
+        of current session or `None`.
+        """
+        if (not isinstance(criteria, ObjectId) or projection is not None or
+                self._criteria or self._read_only or not self._identity_map):
+            return None
+
+        identity_map = get_identity_map(self._db)
 
-        doc = from_mongo(self._document_class, data, not_loaded)
-        doc.__db__ = self._db
-        doc.__qs__ = self
-        return doc
+        if identity_map is not None:
+            return identity_map.get(self._document_class, criteria)
+        else:
+            return None
 
     @property
     def _collection(self):  # noqa
@@ -126,14 +234,11 @@ class BaseQuerySet:
                 self._batch_size,
             )
         else:
-            if self._hint is not None:  # pragma: no cover
-                raise NotImplementedError(
-                    "hint() is not implemented for lookup queries")
-
             return self._get_cursor_aggregation(
                 self._collection,
                 self._criteria,
                 self._projection or None,
+                self._hint,
                 self._comment,
                 self._sort,
                 self._lookup,
@@ -167,60 +272,114 @@ class BaseQuerySet:
 
         return cursor
 
+    @classmethod
+    def _get_cursor_aggregation(cls, collection, criteria, projection, hint,
+                                comment, sort, lookup, slice, batch_size):
+        kwargs = {}
+        if hint is not None:
+            kwargs['hint'] = hint
+
+        if comment:
+            kwargs['comment'] = comment
+
+        cursor = collection.aggregate(
+            cls._get_lookup_pipeline(criteria, projection,
+                                     sort, lookup, slice),
+            **kwargs)
+
+        if batch_size is not None:
+            cursor = cursor.batch_size(batch_size)
+
+        return cursor
+
     @staticmethod
-    def _get_cursor_aggregation(collection, criteria, projection, comment,
-                                sort, lookup, slice, batch_size):
+    def _get_lookup_pipeline(criteria, projection, sort, lookup, slice):
+        """ Return aggregation pipeline for queryset with lookups.
+
+        Sort and slice are applied before `$lookup` stages,
+        so only documents of page are joined.
+        """
         pipeline = []
 
         if criteria:
             pipeline.append({'$match': criteria})
 
-        if projection:
-            pipeline.append({'$project': projection})
-
-        for collection_name, field_name in lookup:
-            pipeline.extend([
-                {'$lookup': {'from': collection_name,
-                             'localField': field_name,
-                             'foreignField': '_id',
-                             'as': f'{LOOKUPS_KEY}.{field_name}'}},
-                {'$unwind': f'${LOOKUPS_KEY}.{field_name}'},
-            ])
-
         if sort:
             pipeline.append({'$sort': OrderedDict(sort)})
 
-        kwargs = {}
-        if comment:
-            kwargs['comment'] = comment
+        if slice is not None:
+            if slice.start:
+                pipeline.append({'$skip': slice.start})
 
-        cursor = collection.aggregate(pipeline, **kwargs)
+            if slice.stop:
+                pipeline.append({'$limit': slice.stop - (slice.start or 0)})
 
-        if batch_size is not None:
-            cursor = cursor.batch_size(batch_size)
+        if projection:
+            pipeline.append({'$project': projection})
 
-        return cursor
+        for item in lookup.values():
+            path = f'{LOOKUPS_KEY}.{item.field_name}'
+
+            if item.projection is None:
+                pipeline.append({
+                    '$lookup': {'from': item.collection,
+                                'localField': item.field_name,
+                                'foreignField': '_id',
+                                'as': path},
+                })
+            else:
+                pipeline.append({
+                    '$lookup': {'from': item.collection,
+                                'let': {'id': f'${item.field_name}'},
+                                'pipeline': [
+                                    {'$match': {'$expr': {
+                                        '$eq': ['$_id', '$$id']}}},
+                                    {'$project': item.projection},
+                                ],
+                                'as': path},
+                })
+
+            if item.preserve_null:
+                pipeline.append({
+                    '$unwind': {'path': f'${path}',
+                                'preserveNullAndEmptyArrays': True},
+                })
+            else:
+                pipeline.append({'$unwind': f'${path}'})
+
+        return pipeline
 
     @property
     def cache(self):
         """ Queryset cache object.
+
+        :py:class:`yadm.cache.LRUCache` with `cache_size` of queryset
+        or database is created on first access.
         """
         if self._cache is None:
-            self._cache = StackCache(size=CACHE_SIZE)
+            self._cache = LRUCache(self._cache_size or self._db.cache_size,
+                                   lock=self._db.cache_lock)
 
         return self._cache
 
-    def copy(self, *, cache=None, criteria=None, projection=None,
-             hint=None, comment=None, sort=None, lookup=None, slice=None,
-             batch_size=None, collection_params=None):
+    def copy(self, *, cache=None, cache_size=None, criteria=None,
+             projection=None, hint=None, comment=None, sort=None,
+             lookup=None, slice=None,
+             batch_size=None, collection_params=None, read_only=None,
+             prefetch=None, identity_map=None):
         """ Copy queryset with new parameters.
 
         Only keywords arguments is alowed.
         Parameters simply replaced with given arguments.
+        Cache is not shared with copy if `cache_size` is given.
         """
+        if cache is None and cache_size is None:
+            cache = self._cache
+
         return self.__class__(
             self._db, self._document_class,
-            cache=cache or self._cache,
+            cache=cache,
+            cache_size=cache_size or self._cache_size,
             criteria=criteria or self._criteria,
             projection=projection or self._projection,
             hint=hint or self._hint,
@@ -230,6 +389,10 @@ class BaseQuerySet:
             slice=slice or self._slice,
             batch_size=batch_size or self._batch_size,
             collection_params=collection_params or self._collection_params,
+            read_only=self._read_only if read_only is None else read_only,
+            prefetch=prefetch or self._prefetch,
+            identity_map=(self._identity_map if identity_map is None
+                          else identity_map),
         )
 
     def read_preference(self, read_preference):
@@ -259,6 +422,20 @@ class BaseQuerySet:
 
         return self.copy(collection_params=collection_params)
 
+    def lazy(self):
+        """ Return queryset with lazy decoding of documents.
+
+        Raw data of documents is not decoded by pymongo,
+        fields are decoded on first access.
+        See :py:mod:`yadm.lazy_bson`.
+        """
+        collection_params = (self._collection_params or {}).copy()
+        codec_options = collection_params.get('codec_options',
+                                              self._db.db.codec_options)
+        collection_params['codec_options'] = get_lazy_codec_options(
+            codec_options)
+        return self.copy(collection_params=collection_params)
+
     def find(self, criteria=None, projection=None):
         """ Return queryset copy with new criteria and projection.
 
@@ -309,8 +486,84 @@ class BaseQuerySet:
         """
         qs = self.copy()
         qs._projection = None
+        qs._projection_plan = compile_projection(self._document_class, None)
         return qs
 
+    def read_only(self, read_only: bool = True) -> 'BaseQuerySet':
+        """ Return queryset, which create read only documents.
+
+        Read only documents is not tracking changes: it have not log,
+        not binded to queryset and raise
+        :py:exc:`yadm.exceptions.ReadOnlyDocumentError` on changes.
+        References and containers is resolved lazily as usual.
+
+            for doc in qs.read_only():
+                print(doc.name)
+        """
+        return self.copy(read_only=read_only)
+
+    def prefetch(self, *paths, projections=None):
+        """ Return queryset with batched prefetch of references.
+
+        :param str paths: dotted paths of reference fields
+        :param dict projections: `{referenced document class: projection}`
+        :return: new :class:`yadm.queryset.QuerySet`
+
+        Documents are read from cursor by batches (`batch_size`
+        of queryset or 100), references of each batch are resolved
+        with one `$in` query per referenced document class.
+        See :py:mod:`yadm.prefetch`.
+
+        .. code:: python
+
+            qs = qs.prefetch('user', 'post.user',
+                             projections={User: {'name': True}})
+        """
+        if self._prefetch is None:
+            prefetch = Prefetch(self._document_class, paths, projections)
+        else:
+            prefetch = self._prefetch.merge(paths, projections)
+
+        return self.copy(prefetch=prefetch)
+
+    def _get_prefetch_batch_size(self):
+        return self._batch_size or PREFETCH_BATCH_SIZE
+
+    def _get_prefetch_ids(self, document_class, ids, index):
+        """ Return ids for query, which are not in `index`.
+
+        Documents from identity map are added to `index`.
+        """
+        ids = [i for i in ids if (document_class, i) not in index]
+        identity_map = get_identity_map(self._db)
+
+        if identity_map is not None and ids:
+            found, ids = identity_map.split(document_class, ids)
+            for _id, document in found.items():
+                index[(document_class, _id)] = document
+
+        return ids
+
+    def _get_values_cursor(self, fields):
+        """ Cursor with projection for `values` and `values_list`.
+        """
+        projection = dict.fromkeys(fields, True)
+        projection.setdefault('_id', False)
+        return self.copy(projection=projection)._cursor
+
+    def _get_values_getters(self, fields, convert):
+        return [_build_value_getter(self._document_class, field, convert)
+                for field in fields]
+
+    def _get_columns_builder(self, fields, dtype_map):
+        getters = self._get_values_getters(fields, False)
+        return ColumnsBuilder(
+            [(name, _get_field(self._document_class, name), get)
+             for name, get in zip(fields, getters)],
+            dtype_map=dtype_map,
+            capacity=self._batch_size,
+        )
+
     def hint(self, index: Union[str, List[Tuple[str, int]]]) -> 'BaseQuerySet':
         """ Return queryset with hinting.
 
@@ -337,22 +590,69 @@ class BaseQuerySet:
         else:
             return self.copy(sort=self._sort + sort)
 
-    def lookup(self, *fields):
-        items = set()
+    def _get_page_queryset(self, sort_key, after, size):
+        """ Return `(queryset, sort keys)` for page of keyset pagination.
+
+        Queryset is sorted by keys and limited by `size + 1` documents
+        for detection of next page.
+        """
+        if size < 1:
+            raise ValueError("size of page must be positive: {!r}".format(size))
+
+        keys = pagination.get_sort_keys(sort_key)
+        qs = self
+
+        if after is not None:
+            values = pagination.decode_token(keys, after)
+            qs = qs.find(pagination.get_after_criteria(keys, values))
+
+        return qs.copy(sort=keys, slice=slice(None, size + 1)), keys
+
+    def lookup(self, *fields, preserve_null=False, projections=None):
+        """ Join referenced documents on server side with `$lookup`.
+
+        :param str fields: names of reference fields
+        :param bool preserve_null: keep documents without referenced
+            document (by default they are dropped by `$unwind`)
+        :param dict projections: `{field name: projection}`
+            for partially loaded referenced documents
+        :return: new :class:`yadm.queryset.QuerySet`
+
+        Sort and slice of queryset are applied before `$lookup`:
+
+        .. code:: python
+
+            qs.sort(('i', 1)).lookup('user', preserve_null=True,
+                                     projections={'user': {'name': 1}})[:20]
+        """
+        projections = projections or {}
+        unknown = set(projections) - set(fields)
+
+        if unknown:
+            raise ValueError(f"Projections for not joined fields: {sorted(unknown)!r}")
+
+        items = {}
 
         for field_name in fields:
             if field_name in self._document_class.__fields__:
                 field = self._document_class.__fields__[field_name]
                 if hasattr(field, 'reference_document_class'):
-                    col_name = field.reference_document_class.__collection__
-                    items.add((col_name, field_name))
+                    rdc = field.reference_document_class
+                    projection = projections.get(field_name)
+                    items[field_name] = Lookup(
+                        collection=rdc.__collection__,
+                        field_name=field_name,
+                        preserve_null=preserve_null,
+                        projection=projection,
+                        not_loaded=compile_projection(rdc, projection),
+                    )
                 else:  # pragma: no cover
                     raise ValueError(f"Field {field_name!r} is not a ReferenceField")
             else:  # pragma: no cover
                 raise ValueError(f"Field {field_name!r}"
                                  f" not found in {self._document_class!r}")
 
-        return self.copy(lookup=(self._lookup | items))
+        return self.copy(lookup={**self._lookup, **items})
 
     def batch_size(self, batch_size):
         """ Setup batch size to cursor for this queryset.
@@ -412,18 +712,73 @@ class BaseQuerySet:
     def ids(self):
         raise NotImplementedError  # pragma: no cover
 
-    def join(self, *field_names):
+    def values(self, *fields, convert=False):
+        raise NotImplementedError  # pragma: no cover
+
+    def values_list(self, *fields, flat=False, convert=False):
+        raise NotImplementedError  # pragma: no cover
+
+    def to_columns(self, fields, dtype_map=None):
+        raise NotImplementedError  # pragma: no cover
+
+    def join(self, *field_names, projections=None):
+        raise NotImplementedError  # pragma: no cover
+
+    def join_iter(self, *field_names, chunk_size=1000, cache_size=None,
+                  projections=None):
+        raise NotImplementedError  # pragma: no cover
+
+    def resolve_references_lists(self, *field_names, not_found=None,
+                                 chunk_size=None):
         raise NotImplementedError  # pragma: no cover
 
     def find_in(self, comparable, field='_id', *,
                 not_found=NotFoundBehavior.SKIP):
         raise NotImplementedError  # pragma: no cover
 
+    def paginate(self, sort_key=('_id', 1), after=None,
+                 size=pagination.PAGE_SIZE):
+        raise NotImplementedError  # pragma: no cover
+
 
 class QuerySet(BaseQuerySet):
     def __iter__(self):
-        for raw in self._cursor:
-            yield self._from_mongo_one(raw)
+        if self._prefetch is None:
+            for raw in self._cursor:
+                yield self._from_mongo_one(raw)
+        else:
+            yield from self._iter_prefetch()
+
+    def _iter_prefetch(self):
+        documents = (self._from_mongo_one(raw) for raw in self._cursor)
+        batch_size = self._get_prefetch_batch_size()
+
+        while True:
+            batch = list(islice(documents, batch_size))
+            if not batch:
+                break
+
+            self._prefetch_documents(batch)
+            yield from batch
+
+    def _prefetch_documents(self, documents):
+        """ Resolve references of documents by `$in` queries.
+        """
+        prefetch = self._prefetch
+        index = {}
+        items = [(documents, prefetch.tree)]
+
+        while items:
+            wanted, links = prefetch.collect(items)
+
+            for document_class, ids in wanted.items():
+                ids = self._get_prefetch_ids(document_class, ids, index)
+                if ids:
+                    qs = prefetch.get_queryset(self, document_class, ids)
+                    for document in qs:
+                        index[(document_class, document.id)] = document
+
+            items = prefetch.apply(links, index)
 
     def __len__(self):
         return self.count_documents()
@@ -450,6 +805,10 @@ class QuerySet(BaseQuerySet):
 
             qs({'field': {'$gt': 3}}, {'field': True})
         """
+        document = self._get_from_identity_map(criteria, projection)
+        if document is not None:
+            return document
+
         if isinstance(criteria, ObjectId):
             criteria = {'_id': criteria}
 
@@ -467,30 +826,38 @@ class QuerySet(BaseQuerySet):
     def update_one(self, update, *, upsert=False):
         """ Update a single document in queryset.
         """
-        return self._collection.update_one(
+        result = self._collection.update_one(
             self._criteria,
             update,
             upsert=upsert,
         )
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     def update_many(self, update, *, upsert=False):
         """ Update one or more documents in queryset.
         """
-        return self._collection.update_many(
+        result = self._collection.update_many(
             self._criteria,
             update,
             upsert=upsert,
         )
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     def delete_one(self):
         """ Remove a single document in queryset.
         """
-        return self._collection.delete_one(self._criteria)
+        result = self._collection.delete_one(self._criteria)
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     def delete_many(self):
         """ Remove a single document in queryset.
         """
-        return self._collection.delete_many(self._criteria)
+        result = self._collection.delete_many(self._criteria)
+        self._db._invalidate_cache(self._document_class)
+        return result
 
     def find_one_and_update(self, update, *,
                             upsert=False,
@@ -505,10 +872,13 @@ class QuerySet(BaseQuerySet):
             sort=self._sort,
             return_document=return_document,
         )
+        self._db._invalidate_cache(self._document_class)
+
         if data is None:  # pragma: no cover
             return None
 
-        return self._from_mongo_one(data, projection=self._projection)
+        return self._from_mongo_one(data, projection=self._projection,
+                                    identity=False)
 
     def find_one_and_replace(self, document, *,
                              return_document=ReturnDocument.BEFORE):
@@ -521,10 +891,13 @@ class QuerySet(BaseQuerySet):
             sort=self._sort,
             return_document=return_document,
         )
+        self._db._invalidate_cache(self._document_class)
+
         if data is None:  # pragma: no cover
             return None
 
-        return self._from_mongo_one(data, projection=self._projection)
+        return self._from_mongo_one(data, projection=self._projection,
+                                    identity=False)
 
     def find_one_and_delete(self):
         """ Find a single document and delete it.
@@ -534,10 +907,13 @@ class QuerySet(BaseQuerySet):
             projection=self._projection,
             sort=self._sort,
         )
+        self._db._invalidate_cache(self._document_class)
+
         if data is None:  # pragma: no cover
             return None
 
-        return self._from_mongo_one(data, projection=self._projection)
+        return self._from_mongo_one(data, projection=self._projection,
+                                    identity=False)
 
     def count_documents(self) -> int:
         """ Count documents in queryset.
@@ -562,6 +938,85 @@ class QuerySet(BaseQuerySet):
         for raw in self.copy(projection={'_id': True})._cursor:
             yield raw['_id']
 
+    def values(self, *fields, convert=False):
+        """ Return dicts with values of fields without documents creation.
+
+        :param str fields: fields names, dotted names is allowed;
+            all document fields if not given
+        :param bool convert: convert values with `from_mongo` of fields
+        :return: generator of **dict**
+
+        Not existed values is `None`. References is not resolved.
+
+        .. code:: python
+
+            for row in qs.values('name', 'address.city'):
+                print(row['name'], row['address.city'])
+        """
+        fields = fields or tuple(self._document_class.__fields__)
+        getters = list(zip(fields, self._get_values_getters(fields, convert)))
+
+        for raw in self._get_values_cursor(fields):
+            yield {name: get(raw) for name, get in getters}
+
+    def values_list(self, *fields, flat=False, convert=False):
+        """ Return tuples with values of fields without documents creation.
+
+        :param str fields: fields names, dotted names is allowed;
+            all document fields if not given
+        :param bool flat: return single values instead tuples,
+            only one field is allowed
+        :param bool convert: convert values with `from_mongo` of fields
+        :return: generator of **tuple**
+
+        .. code:: python
+
+            for name, city in qs.values_list('name', 'address.city'):
+                print(name, city)
+
+            names = list(qs.values_list('name', flat=True))
+        """
+        if flat and len(fields) != 1:
+            raise TypeError("flat is allowed only for one field")
+
+        fields = fields or tuple(self._document_class.__fields__)
+        getters = self._get_values_getters(fields, convert)
+
+        if flat:
+            get = getters[0]
+            for raw in self._get_values_cursor(fields):
+                yield get(raw)
+        else:
+            for raw in self._get_values_cursor(fields):
+                yield tuple(get(raw) for get in getters)
+
+    def to_columns(self, fields, dtype_map=None):
+        """ Return typed arrays with values of fields, one per field.
+
+        :param list fields: fields names, dotted names is allowed
+        :param dict dtype_map: `{column name: dtype}` for override
+            default types of columns
+        :return: :py:class:`collections.OrderedDict` `{name: array}`
+
+        Data is streamed from cursor with projection to preallocated
+        numpy arrays (or :py:class:`array.array` if numpy is not installed)
+        without documents creation. Decimal and money fields have
+        additional `<name>.exp` and `<name>.currency` columns.
+        See :py:mod:`yadm.columns` for types of columns.
+
+        .. code:: python
+
+            columns = qs.to_columns(['count', 'price'])
+            total = (columns['count'] * columns['price']).sum()
+        """
+        fields = list(fields)
+        builder = self._get_columns_builder(fields, dtype_map)
+
+        for raw in self._get_values_cursor(fields):
+            builder.append(raw)
+
+        return builder.build()
+
     def bulk(self):
         """ Return map {id: object}.
 
@@ -571,10 +1026,12 @@ class QuerySet(BaseQuerySet):
         qs._sort = None
         return {obj.id: obj for obj in qs}
 
-    def join(self, *field_names):
+    def join(self, *field_names, projections=None):
         """ Create `yadm.Join` object, join `field_names` and return it.
 
         :param str fields_names: fields for join
+        :param dict projections: `{field name: projection}`
+            for partially loaded joined documents
         :return: new :class:`yadm.join.Join`
 
         Next algorithm for join:
@@ -588,10 +1045,122 @@ class QuerySet(BaseQuerySet):
         join = Join(self)
 
         if field_names:
-            join.join(*field_names)
+            join.join(*field_names, projections=projections)
 
         return join
 
+    def join_iter(self, *field_names, chunk_size=1000, cache_size=None,
+                  projections=None):
+        """ Iterate documents with joined `field_names` by chunks.
+
+        :param str fields_names: fields for join
+        :param int chunk_size: count of documents in chunk
+        :param int cache_size: size of LRU cache of joined documents,
+            which is shared by chunks (not used by default)
+        :param dict projections: `{field name: projection}`
+            for partially loaded joined documents
+        :return: generator of documents
+
+        Unlike :py:meth:`join` only one chunk of documents
+        and its joined documents are kept in memory:
+        each chunk is read from cursor, joined with `$in` queries
+        and yielded, then indexes of join are dropped.
+
+        .. code:: python
+
+            for order in qs.join_iter('user', chunk_size=500,
+                                      cache_size=10000):
+                print(order.user.name)
+        """
+        cache = LRUCache(cache_size) if cache_size else None
+        documents = iter(self)
+
+        while True:
+            chunk = list(islice(documents, chunk_size))
+            if not chunk:
+                break
+
+            join = Join(self, documents=chunk, cache=cache)
+            join.join(*field_names, projections=projections)
+            del join
+
+            yield from chunk
+
+    def paginate(self, sort_key=('_id', 1), after=None,
+                 size=pagination.PAGE_SIZE):
+        """ Return page of documents with keyset pagination.
+
+        :param sort_key: `(field, direction)` or list of them,
+            `_id` is added as tiebreaker
+        :param str after: `next_token` of previous page
+        :param int size: count of documents in page
+        :return: :py:class:`yadm.paginate.Page`
+
+        Unlike slices, pages are not skipped on server, so cost
+        of deep pages does not grow (see :py:mod:`yadm.paginate`):
+
+        .. code:: python
+
+            page = qs.paginate(('date', -1), after=token, size=50)
+            token = page.next_token
+        """
+        qs, keys = self._get_page_queryset(sort_key, after, size)
+        return pagination.make_page(list(qs), keys, size)
+
+    def parallel_scan(self, partitions=scan.PARTITIONS, executor='thread',
+                      func=None, *, boundaries='sample', client_factory=None):
+        """ Scan queryset by ranges of `_id` in parallel.
+
+        :param int partitions: count of ranges (and workers)
+        :param str executor: `'thread'` or `'process'`
+        :param func: function, which is called with queryset
+            of each partition (required for processes)
+        :param str boundaries: `'sample'` for boundaries from `$sample`
+            of ids or `'timestamp'` for split of ObjectId timestamps
+        :param client_factory: picklable function, which create
+            `MongoClient` in worker process (required for processes)
+        :return: generator of documents (not ordered)
+            or list of results of `func` for partitions
+
+        .. code:: python
+
+            for doc in qs.parallel_scan(partitions=8):
+                print(doc.id)
+
+        See :py:mod:`yadm.scan`.
+        """
+        return scan.parallel_scan(self, partitions, executor, func,
+                                  boundaries=boundaries,
+                                  client_factory=client_factory)
+
+    def resolve_references_lists(self, *field_names,
+                                 not_found=NotFoundBehavior.NONE,
+                                 chunk_size=None):
+        """ Return list of documents with resolved references lists.
+
+        :param str field_names: names of
+            :py:class:`yadm.fields.references_list.ReferencesListField`
+        :param not_found: behavior for not found documents (as in `find_in`)
+        :param int chunk_size: max count of ids in one `$in` query
+        :return: **list** of documents
+
+        References lists of all documents are resolved with one `$in`
+        query (by chunks) per referenced document class.
+
+        .. code:: python
+
+            for doc in qs.resolve_references_lists('refs'):
+                print([ref.name for ref in doc.refs])
+        """
+        from yadm.fields.references_list import (
+            resolve_references_lists,
+            CHUNK_SIZE,
+        )
+
+        return resolve_references_lists(self, *field_names,
+                                        not_found=not_found,
+                                        chunk_size=chunk_size or CHUNK_SIZE)
+
     def find_in(self, comparable, field='_id', *,
                 not_found=NotFoundBehavior.SKIP):
         """ Build ordered $in-query.
@@ -0,0 +1,269 @@
+"""
+Parallel partitioned scan of collection.
+
+:py:meth:`yadm.queryset.QuerySet.parallel_scan` split `_id` space
+into ranges and read each range with own cursor:
+
+.. code-block:: python
+
+    for doc in db(Doc).parallel_scan(partitions=8):
+        index(doc)
+
+Or run function with queryset of each partition in threads
+or in processes, and get list of results:
+
+.. code-block:: python
+
+    def count_total(qs):
+        return sum(doc.total for doc in qs)
+
+    totals = db(Doc).parallel_scan(partitions=8, executor='process',
+                                   func=count_total,
+                                   client_factory=make_client)
+
+Boundaries of ranges are taken from `$sample` of ids (`'sample'`)
+or from timestamps of min and max ObjectId (`'timestamp'`),
+all `_id` values must be the same type.
+
+In process mode `func`, `client_factory` and document class must be
+picklable (defined on module level). Each worker creates new client
+with `client_factory()` (pymongo don't expose arguments of client,
+so they can't be copied) and database of the same class.
+Documents are not ordered and are not sent between processes.
+"""
+from concurrent import futures
+import queue
+import threading
+
+from bson import ObjectId
+
+PARTITIONS = 4
+SAMPLE_SIZE = 100  # sampled ids per partition
+BATCH_SIZE = 100  # documents in batch from thread
+QUEUE_SIZE = 16  # batches in queue
+
+EXECUTORS = frozenset(['thread', 'process'])
+BOUNDARIES = frozenset(['sample', 'timestamp'])
+
+
+def get_boundaries(qs, partitions, method='sample'):
+    """ Return sorted ids, which split queryset to partitions.
+
+    Less than `partitions - 1` ids are returned for small collections.
+    """
+    if method not in BOUNDARIES:
+        raise ValueError("bad boundaries method: {!r}".format(method))
+
+    if partitions < 2:
+        return []
+
+    collection = qs._collection
+
+    if method == 'sample':
+        cursor = collection.aggregate([
+            {'$match': qs._criteria},
+            {'$sample': {'size': partitions * SAMPLE_SIZE}},
+            {'$project': {'_id': True}},
+        ])
+        ids = sorted({raw['_id'] for raw in cursor})
+
+        if not ids:
+            return []
+
+        boundaries = (ids[len(ids) * n // partitions]
+                      for n in range(1, partitions))
+
+    else:
+        first = collection.find_one(qs._criteria, {'_id': True},
+                                    sort=[('_id', 1)])
+        last = collection.find_one(qs._criteria, {'_id': True},
+                                   sort=[('_id', -1)])
+
+        if first is None:
+            return []
+
+        if not (isinstance(first['_id'], ObjectId) and
+                isinstance(last['_id'], ObjectId)):
+            raise ValueError("timestamp boundaries require ObjectId ids")
+
+        start = first['_id'].generation_time
+        step = (last['_id'].generation_time - start) / partitions
+        boundaries = (ObjectId.from_datetime(start + step * n)
+                      for n in range(1, partitions))
+
+    result = []
+    for boundary in boundaries:
+        if not result or result[-1] < boundary:
+            result.append(boundary)
+
+    return result
+
+
+def get_ranges(boundaries):
+    """ Return criteria of `_id` ranges for boundaries.
+    """
+    bounds = [None, *boundaries, None]
+    ranges = []
+
+    for lower, upper in zip(bounds, bounds[1:]):
+        condition = {}
+
+        if lower is not None:
+            condition['$gte'] = lower
+
+        if upper is not None:
+            condition['$lt'] = upper
+
+        ranges.append({'_id': condition} if condition else {})
+
+    return ranges
+
+
+def get_partition_querysets(qs, partitions, boundaries='sample'):
+    """ Return querysets of partitions.
+
+    Querysets are not sorted and don't share cache.
+    """
+    cache_size = qs._cache_size or qs._db.cache_size
+    querysets = []
+
+    for criteria in get_ranges(get_boundaries(qs, partitions, boundaries)):
+        partition = qs.find(criteria).copy(cache_size=cache_size)
+        partition._sort = None
+        querysets.append(partition)
+
+    return querysets
+
+
+def parallel_scan(qs, partitions=PARTITIONS, executor='thread', func=None, *,
+                  boundaries='sample', client_factory=None):
+    """ Scan queryset by partitions in parallel.
+
+    See :py:meth:`yadm.queryset.QuerySet.parallel_scan`.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError("bad executor: {!r}".format(executor))
+
+    if qs._slice is not None:
+        raise ValueError("parallel scan of sliced queryset")
+
+    querysets = get_partition_querysets(qs, partitions, boundaries)
+
+    if executor == 'thread':
+        if func is None:
+            return _iter_threads(querysets)
+
+        with futures.ThreadPoolExecutor(len(querysets)) as pool:
+            return list(pool.map(func, querysets))
+
+    else:
+        if func is None:
+            raise ValueError("process executor requires func")
+
+        if client_factory is None:
+            raise ValueError("process executor requires client_factory")
+
+        spec = _get_spec(qs, client_factory)
+        params = [_get_queryset_params(partition) for partition in querysets]
+
+        with futures.ProcessPoolExecutor(len(querysets)) as pool:
+            return list(pool.map(_run_partition, [spec] * len(params),
+                                 params, [func] * len(params)))
+
+
+def _iter_threads(querysets):
+    """ Yield documents of querysets, which are read by threads.
+    """
+    items = queue.Queue(QUEUE_SIZE)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            else:
+                return
+
+    def scan(partition):
+        try:
+            batch = []
+
+            for document in partition:
+                batch.append(document)
+
+                if len(batch) >= BATCH_SIZE:
+                    put(('documents', batch))
+                    batch = []
+
+                    if stop.is_set():
+                        return
+
+            put(('documents', batch))
+
+        except Exception as exc:
+            put(('error', exc))
+
+        finally:
+            put(('done', None))
+
+    with futures.ThreadPoolExecutor(len(querysets)) as pool:
+        for partition in querysets:
+            pool.submit(scan, partition)
+
+        try:
+            done = 0
+
+            while done < len(querysets):
+                kind, value = items.get()
+
+                if kind == 'documents':
+                    yield from value
+                elif kind == 'error':
+                    raise value
+                else:
+                    done += 1
+
+        finally:
+            stop.set()
+
+
+def _get_spec(qs, client_factory):
+    """ Return picklable parameters for database in worker process.
+    """
+    db = qs._db
+    return (client_factory, db.__class__, db.name,
+            db.cache_size, db.cache_lock, db.database_params)
+
+
+def _get_queryset_params(qs):
+    return {
+        'document_class': qs._document_class,
+        'criteria': qs._criteria,
+        'projection': qs._projection,
+        'hint': qs._hint,
+        'comment': qs._comment,
+        'lookup': qs._lookup,
+        'batch_size': qs._batch_size,
+        'collection_params': qs._collection_params,
+        'read_only': qs._read_only,
+    }
+
+
+def _run_partition(spec, params, func):
+    """ Create database and queryset in worker process and run `func`.
+    """
+    (client_factory, database_class, name,
+     cache_size, cache_lock, database_params) = spec
+    client = client_factory()
+
+    try:
+        db = database_class(client, name, cache_size=cache_size,
+                            cache_lock=cache_lock, **database_params)
+        params = dict(params)
+        qs = db.get_queryset(params.pop('document_class'))
+        return func(qs.copy(**params))
+
+    finally:
+        client.close()
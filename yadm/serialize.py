@@ -5,16 +5,29 @@ Functions for serialize and deserialize data.
 from collections import defaultdict
 from typing import Any, Union, Optional, Container, Iterable, Dict
 
-from yadm.documents import MetaDocument, BaseDocument
+from yadm.changes import SYNC_OPS
+from yadm.documents import MetaDocument, BaseDocument, LOOKUPS_KEY  # noqa
 from yadm.document_item import DocumentItemMixin
 from yadm.exceptions import NotLoadedError
+from yadm.lazy_bson import LazyBSONDocument
 from yadm.markers import AttributeNotSet
 
 
-LOOKUPS_KEY = '__yadm_lookups__'
+TRaw = Dict[str, Any]
 
+_CHANGE_OPS = frozenset(['set_field', 'change_child'])
 
-TRaw = Dict[str, Any]
+
+def _is_changed(document: BaseDocument) -> bool:
+    """ Document is changed after last synchronization with database.
+    """
+    for log_item in reversed(document.__log__):
+        if log_item.op in _CHANGE_OPS:
+            return True
+        elif log_item.op in SYNC_OPS:
+            return False
+
+    return False
 
 
 def to_mongo(document: BaseDocument,
@@ -29,7 +42,19 @@ def to_mongo(document: BaseDocument,
     4. Lookup in __raw__;
     5. Lookup in __not_loaded__;
     6. Process values with '.' from include;
+
+    Not changed documents with lazy raw data
+    (see :py:mod:`yadm.lazy_bson`) are passed as is,
+    without decoding and encoding.
     """
+    if (isinstance(document.__raw__, LazyBSONDocument) and
+            exclude is None and include is None and
+            not document.__not_loaded__ and
+            not document.__yadm_lookups__ and
+            not document.__smart_null_fields__ and
+            not _is_changed(document)):
+        return document.__raw__
+
     result = {}
 
     not_loaded = set()
@@ -83,21 +108,7 @@ def from_mongo(document_class: MetaDocument, raw: TRaw,
                parent: Union[BaseDocument, DocumentItemMixin, None] = None,
                name: Optional[str] = None) -> BaseDocument:
     """ Deserialize MongoDB raw data to document.
-    """
-    document = document_class(__new_document__=False)
-    document.__raw__ = raw
-    document.__not_loaded__ = frozenset(not_loaded or frozenset())
-
-    for field_name, field in document_class.__fields__.items():
-        if (field_name not in raw and
-                field_name not in document.__not_loaded__ and field.smart_null):
-            document.__cache__[field_name] = None
 
-    if LOOKUPS_KEY in raw:
-        document.__yadm_lookups__ = raw.pop(LOOKUPS_KEY)
-
-    if parent is not None:
-        document.__parent__ = parent
-        document.__name__ = name
-
-    return document
+    See `__hydrate__` attribute of document classes.
+    """
+    return document_class.__hydrate__(raw, not_loaded, parent, name)